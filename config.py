@@ -4,40 +4,163 @@ Loads environment variables and creates OpenAI client singleton.
 """
 
 import os
+import ssl
+import atexit
 import logging
+import functools
 from dotenv import load_dotenv
-from openai import OpenAI
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (once per process tree - child
+# processes inherit the already-populated environment)
+if not os.environ.get("_CONFIG_LOADED"):
+    load_dotenv()
+    os.environ["_CONFIG_LOADED"] = "1"
+
+# Snapshot the environment once; every setting below reads from this plain dict
+_ENV = os.environ.copy()
 
 # Suppress verbose HTTP request logs from OpenAI/httpx (only show warnings/errors)
 logging.getLogger("openai").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # Get OpenAI API key (optional if using local whisper only)
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = _ENV.get("OPENAI_API_KEY")
 
 # Get worker count (default to 4 if not specified)
-WORKERS = int(os.getenv("WORKERS", "4"))
+WORKERS = int(_ENV.get("WORKERS", "4"))
+
+# Without WORKERS or -w, Whisper API concurrency is tuned from measured
+# per-chunk latency so that requests stay within WHISPER_RPM
+AUTO_WORKERS = "WORKERS" not in _ENV
+WHISPER_RPM = int(_ENV.get("WHISPER_RPM", "50"))  # Whisper API requests per minute for your account tier
+# Whisper upload format: "wav" (lossless PCM) or "opus" (16 kb/s Ogg Opus, ~16x fewer bytes per upload)
+UPLOAD_FORMAT = _ENV.get("UPLOAD_FORMAT", "wav").lower()
 
 # Translation worker count (separate from transcription workers)
 # Lower to avoid GPT-4 rate limits
-TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_WORKERS = int(_ENV.get("TRANSLATION_WORKERS", "4"))
 
 # GPT translation settings
-GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o-mini")  # Use gpt-4o for best quality
-ENABLE_CORRECTION = os.getenv("ENABLE_CORRECTION", "false").lower() == "true"
-TRANSLATION_BATCH_MINUTES = int(os.getenv("TRANSLATION_BATCH_MINUTES", "5"))  # Group segments by time window
-MAX_SEGMENTS_PER_BATCH = int(os.getenv("MAX_SEGMENTS_PER_BATCH", "60"))  # Split if batch exceeds this
+GPT_MODEL = _ENV.get("GPT_MODEL", "gpt-4o-mini")  # Use gpt-4o for best quality
+ENABLE_CORRECTION = _ENV.get("ENABLE_CORRECTION", "false").lower() == "true"
+# Skip correction for lines whose OpenAI and Google translations share at least
+# this fraction of words (Jaccard similarity); 1.0 = correct every line
+AGREEMENT_THRESHOLD = float(_ENV.get("AGREEMENT_THRESHOLD", "0.7"))
+TRANSLATION_BATCH_MINUTES = int(_ENV.get("TRANSLATION_BATCH_MINUTES", "5"))  # Group segments by time window
+MAX_SEGMENTS_PER_BATCH = int(_ENV.get("MAX_SEGMENTS_PER_BATCH", "60"))  # Split if batch exceeds this (0 = token budget only)
+# Send OpenAI translation/correction through the Batch API (half price, results may take hours)
+TRANSLATION_BATCH_API = _ENV.get("TRANSLATION_BATCH_API", "false").lower() == "true"
 
 # Translation provider settings
-BULK_TRANSLATOR = os.getenv("BULK_TRANSLATOR", "google")  # "openai" or "google"
-FALLBACK_CHAIN = os.getenv("FALLBACK_CHAIN", "google,openai,untranslated").split(",")  # Fallback order
-GOOGLE_BUNDLE_SIZE = int(os.getenv("GOOGLE_BUNDLE_SIZE", "100"))  # Lines per Google API call
+BULK_TRANSLATOR = _ENV.get("BULK_TRANSLATOR", "google")  # "openai" or "google"
+FALLBACK_CHAIN = _ENV.get("FALLBACK_CHAIN", "google,openai,untranslated").split(",")  # Fallback order
+GOOGLE_BUNDLE_SIZE = int(_ENV.get("GOOGLE_BUNDLE_SIZE", "100"))  # Lines per Google API call
+GOOGLE_WORKERS = int(_ENV.get("GOOGLE_WORKERS", "8"))  # Bundles in flight per batch
+GOOGLE_REQUESTS_PER_SECOND = float(_ENV.get("GOOGLE_REQUESTS_PER_SECOND", "10"))  # Across all threads
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ssl_context() -> ssl.SSLContext:
+    """Create the TLS context once; loading the CA bundle from disk is the slow part."""
+    return ssl.create_default_context()
+
+
+@functools.lru_cache(maxsize=1)
+def _http2_available() -> bool:
+    """httpx only speaks HTTP/2 when the optional h2 package is installed."""
+    import importlib.util
+    return importlib.util.find_spec("h2") is not None
+
+
+# How long idle OpenAI connections stay open (httpx default: 5s)
+KEEPALIVE_SECONDS = 60.0
+
+
+def _http_client_options(pool_size: int = None) -> dict:
+    """
+    Shared httpx client options for the OpenAI clients.
+
+    The pool is sized for the largest worker pool that shares the client
+    (unless pool_size is given), and the timeout matches the OpenAI SDK
+    default (long Whisper uploads). With h2 installed, requests are
+    multiplexed over HTTP/2 so concurrent calls share a few TLS connections.
+    Idle connections are kept for KEEPALIVE_SECONDS, so sporadic calls
+    (fallbacks, correction batches) reuse them instead of reconnecting.
+    """
+    import httpx
+
+    if pool_size is None:
+        pool_size = max(WORKERS, TRANSLATION_WORKERS) * 2
+    return {
+        "http2": _http2_available(),
+        "verify": _get_ssl_context(),
+        "limits": httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                               keepalive_expiry=KEEPALIVE_SECONDS),
+        "timeout": httpx.Timeout(600.0, connect=5.0),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """
+    Get the singleton OpenAI client, creating it on first use.
+
+    The openai package is only imported here so that local-only runs
+    (and --help) don't pay its import cost. All requests share one pooled
+    httpx client, so keep-alive connections are reused across workers.
+
+    Returns:
+        OpenAI client instance, or None if no API key is configured
+    """
+    if not OPENAI_API_KEY:
+        return None
+
+    import httpx
+    from openai import OpenAI
+
+    from utils import logger
+
+    options = _http_client_options()
+    if options["http2"]:
+        logger.debug("OpenAI client: HTTP/2 with a persistent connection pool")
+    else:
+        logger.debug("OpenAI client: HTTP/1.1 keep-alive pool (install h2 for HTTP/2)")
+
+    http_client = httpx.Client(**options)
+    atexit.register(http_client.close)
+    return OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+
+
+def get_async_client(pool_size: int = None):
+    """
+    Create an AsyncOpenAI client sharing the same TLS context.
+
+    An async client is bound to the event loop it is used on, so callers
+    should create one per asyncio.run() and close it when done.
+
+    Args:
+        pool_size: Connection pool size, at least the caller's concurrency
+            (default: sized from WORKERS/TRANSLATION_WORKERS)
+
+    Returns:
+        AsyncOpenAI client instance, or None if no API key is configured
+    """
+    if not OPENAI_API_KEY:
+        return None
+
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(**_http_client_options(pool_size))
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+
+
+def __getattr__(name):
+    # Keep `from config import client` working without creating the client at import time
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create singleton OpenAI client (only if API key is available)
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
 # Audio chunk duration in milliseconds (80 seconds)
 CHUNK_DURATION_MS = 80000
@@ -49,6 +172,10 @@ AUDIO_SETTINGS = {
     "codec": "pcm_s16le"    # PCM 16-bit
 }
 
+# Common ffmpeg prefix: never read stdin (no tty probing), skip the banner and
+# only print errors, so each short-lived process does less work at startup
+FFMPEG_COMMAND = ("ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error")
+
 # Local Whisper settings (faster-whisper)
-LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "medium")  # tiny, base, small, medium, large-v3
-LOCAL_WHISPER_DEVICE = os.getenv("LOCAL_WHISPER_DEVICE", "auto")  # auto, cuda, cpu
+LOCAL_WHISPER_MODEL = _ENV.get("LOCAL_WHISPER_MODEL", "medium")  # tiny, base, small, medium, large-v3
+LOCAL_WHISPER_DEVICE = _ENV.get("LOCAL_WHISPER_DEVICE", "auto")  # auto, cuda, cpu
@@ -6,20 +6,309 @@ Processes video files to generate English subtitle files using OpenAI Whisper AP
 """
 
 import argparse
+import contextlib
+import functools
+import logging
+import os
 import sys
+import tempfile
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any, List, Optional
 
 from utils import (
-    validate_video_path, validate_input_path, find_video_files, has_existing_srt,
-    scan_video_folder, logger, cleanup_files, load_metadata, save_metadata,
-    create_metadata, update_metadata_processed
+    validate_input_path, scan_video_folder, logger, save_metadata, create_metadata,
+    update_metadata_processed, get_scratch_dir, make_work_dir, remove_work_dir,
+    video_fingerprint, audio_fingerprint, checkpoint_key, save_checkpoint, load_checkpoint,
+    format_timestamp_srt, make_cache_dir, CACHE_DIR
 )
-from src.extract_audio import extract_audio
-from src.chunk_audio import chunk_audio, cleanup_chunks
-from src.transcribe import transcribe_audio, transcribe_audio_translate, translate_segments, correct_translations
-from src.merge_srt import save_subtitles, save_japanese_srt, load_japanese_srt
-from config import ENABLE_CORRECTION, BULK_TRANSLATOR, FALLBACK_CHAIN, LOCAL_WHISPER_MODEL, LOCAL_WHISPER_DEVICE, OPENAI_API_KEY
+from src.extract_audio import extract_audio, extract_and_chunk
+from src.chunk_audio import chunk_audio
+from src.merge_srt import save_subtitles, save_japanese_srt, load_japanese_srt, find_japanese_srt
+from config import ENABLE_CORRECTION, TRANSLATION_BATCH_API, BULK_TRANSLATOR, FALLBACK_CHAIN, LOCAL_WHISPER_MODEL, LOCAL_WHISPER_DEVICE, OPENAI_API_KEY, GPT_MODEL
+
+# Log banners, formatted into a single record each (one handler write instead of several)
+_RULE = "=" * 60
+_BANNER = "\n" + _RULE + "\n[{i}/{n}] Processing: {name} ({size_mb:.0f} MB)\n" + _RULE
+
+
+@dataclass
+class VideoContext:
+    """State shared by the pipeline stages while processing one video."""
+    video_path: Path
+    args: Any
+    use_local_whisper: bool
+    whisper_model: str
+    whisper_device: str
+    bulk_translator: str
+    fallback_chain: tuple
+    total_steps: int
+    source_language: Optional[str] = None
+    pre_extracted_audio: Optional[str] = None
+    audio_path: Optional[str] = None
+    work_dir: Optional[str] = None
+    segments: Optional[List[dict]] = None
+    # Content fingerprints the source subtitles are cached under (empty = no cache)
+    cache_keys: List[str] = field(default_factory=list)
+    stack: contextlib.ExitStack = field(default_factory=contextlib.ExitStack)
+
+
+def _stage_checkpoint_key(ctx: VideoContext, stage_name: str, inputs: list) -> str:
+    """Checkpoint key for a segment-to-segment stage: its input plus the settings that shape its output."""
+    from src.transcribe import format_fallback_chain
+
+    # Key on the segments as they round-trip through an SRT file, so fresh
+    # transcription output and the same subtitles loaded from .ja.srt match
+    normalized = sorted(
+        (format_timestamp_srt(seg["start"]), format_timestamp_srt(seg["end"]), seg["text"].strip())
+        for seg in inputs if seg["text"].strip()
+    )
+    return checkpoint_key(stage_name, normalized, ctx.bulk_translator,
+                          format_fallback_chain(ctx.fallback_chain), GPT_MODEL)
+
+
+def checkpoint(stage_name: str):
+    """
+    Decorator: reuse a stage's output segments from an earlier run with the same input.
+
+    The stage's output is saved after it succeeds; on a rerun with the same
+    input segments and settings (e.g. after a later stage failed) the stage
+    is skipped.
+    """
+    def decorator(stage):
+        @functools.wraps(stage)
+        def wrapper(ctx: VideoContext):
+            key = _stage_checkpoint_key(ctx, stage_name, ctx.segments)
+            cached = load_checkpoint(key)
+            if cached is not None:
+                logger.info(f"Reusing {stage_name} checkpoint from an earlier run (skip {stage_name})")
+                ctx.segments = cached
+                return None
+
+            result = stage(ctx)
+            if result is not False and ctx.segments:
+                save_checkpoint(key, ctx.segments)
+            return result
+        return wrapper
+    return decorator
+
+
+def _stage_extract(ctx: VideoContext) -> Optional[str]:
+    """
+    Step 1: extract audio (or reuse the prefetched file).
+
+    Switches to the "cached" pipeline when the audio fingerprint matches
+    subtitles cached from another copy of the same source.
+    """
+    total_steps = ctx.total_steps
+    if ctx.pre_extracted_audio:
+        logger.info(f"\n[1/{total_steps}] Using pre-extracted audio...")
+        ctx.audio_path = ctx.pre_extracted_audio
+        # Pre-extracted audio lives in a work dir owned by the caller
+        ctx.work_dir = os.path.dirname(ctx.audio_path)
+    else:
+        logger.info(f"\n[1/{total_steps}] Extracting audio...")
+        # Audio and chunks go to a temp dir (RAM-backed when possible)
+        # that is removed in one go when the stack closes
+        ctx.work_dir = ctx.stack.enter_context(
+            tempfile.TemporaryDirectory(prefix="subscene-", dir=get_scratch_dir())
+        )
+        ctx.audio_path = extract_audio(ctx.video_path, output_dir=ctx.work_dir)
+
+    if ctx.cache_keys:
+        audio_key = audio_fingerprint(ctx.audio_path)
+        ctx.cache_keys.append(audio_key)
+        if not ctx.args.force_transcribe:
+            ctx.segments = load_japanese_srt(ctx.video_path, [audio_key])
+        if ctx.segments:
+            logger.info("Audio matches cached source subtitles (skip transcription)")
+            ctx.stack.close()
+            return "cached"
+
+
+def _stage_extract_deferred(ctx: VideoContext) -> Optional[str]:
+    """
+    Step 1 (API modes): reuse prefetched audio, otherwise only set up the work dir.
+
+    Without prefetched audio the extraction happens in the chunking stage, in
+    the same ffmpeg pass that writes the chunks (see _chunk_stream).
+    """
+    if ctx.pre_extracted_audio:
+        return _stage_extract(ctx)
+
+    logger.info(f"\n[1/{ctx.total_steps}] Extracting audio (streamed into chunks)...")
+    ctx.work_dir = ctx.stack.enter_context(
+        tempfile.TemporaryDirectory(prefix="subscene-", dir=get_scratch_dir())
+    )
+
+
+def _chunk_stream(ctx: VideoContext):
+    """Chunk generator for the API stages: split the extracted WAV, or extract and split in one pass."""
+    if ctx.audio_path:
+        return chunk_audio(ctx.audio_path, ctx.work_dir)
+    return extract_and_chunk(ctx.video_path, ctx.work_dir)
+
+
+def _has_segments(ctx: VideoContext) -> bool:
+    if not ctx.segments:
+        logger.error("No transcription segments were generated.")
+        return False
+    return True
+
+
+def _stage_transcribe_local(ctx: VideoContext) -> bool:
+    """Step 2: transcribe with local Whisper."""
+    from src.transcribe_local import transcribe_audio_local
+
+    args = ctx.args
+    logger.info(f"\n[2/{ctx.total_steps}] Transcribing with local Whisper ({ctx.whisper_model})...")
+    # Use detected language if provided, otherwise let it auto-detect
+    ctx.segments, _ = transcribe_audio_local(
+        ctx.audio_path,
+        model_size=ctx.whisper_model,
+        device=ctx.whisper_device,
+        language=ctx.source_language or "ja",
+        beam_size=args.beam_size,
+        skip_language_check=True if ctx.source_language else args.skip_language_check,
+        batch_size=args.batch_size
+    )
+    return _has_segments(ctx)
+
+
+def _stage_translate_local(ctx: VideoContext) -> bool:
+    """Step 2 (direct mode): transcribe and translate with local Whisper."""
+    from src.transcribe_local import transcribe_audio_local_translate
+
+    args = ctx.args
+    logger.info(f"\n[2/{ctx.total_steps}] Transcribing and translating with local Whisper ({ctx.whisper_model})...")
+    ctx.segments, _ = transcribe_audio_local_translate(
+        ctx.audio_path,
+        model_size=ctx.whisper_model,
+        device=ctx.whisper_device,
+        beam_size=args.beam_size,
+        skip_language_check=True if ctx.source_language else args.skip_language_check,
+        expected_language=ctx.source_language or "ja",
+        batch_size=args.batch_size
+    )
+    return _has_segments(ctx)
+
+
+def _stage_transcribe_api(ctx: VideoContext) -> bool:
+    """Step 2: chunk the audio and transcribe with the Whisper API."""
+    from src.transcribe import transcribe_audio
+
+    logger.info(f"\n[2/{ctx.total_steps}] Chunking and transcribing audio...")
+    chunks_generator = _chunk_stream(ctx)
+    ctx.segments, _ = transcribe_audio(chunks_generator, workers=ctx.args.workers)
+    return _has_segments(ctx)
+
+
+def _stage_translate_api(ctx: VideoContext) -> bool:
+    """Step 2 (direct mode): chunk the audio and translate with the Whisper API."""
+    from src.transcribe import transcribe_audio
+
+    logger.info(f"\n[2/{ctx.total_steps}] Chunking and translating to English with Whisper API...")
+    chunks_generator = _chunk_stream(ctx)
+    ctx.segments, _ = transcribe_audio(chunks_generator, workers=ctx.args.workers, task="translate")
+    return _has_segments(ctx)
+
+
+def _stage_pipelined_api(ctx: VideoContext) -> bool:
+    """Steps 2-3: transcribe with the Whisper API and translate finished windows as they arrive."""
+    from src.transcribe import run_pipelined, format_fallback_chain
+
+    logger.info(f"\n[2-3/{ctx.total_steps}] Chunking, transcribing and translating to English with {ctx.bulk_translator.upper()}...")
+    logger.info(f"Fallback chain: {format_fallback_chain(ctx.fallback_chain)}")
+    chunks_generator = _chunk_stream(ctx)
+    source_segments, ctx.segments = run_pipelined(
+        chunks_generator,
+        workers=ctx.args.workers,
+        translation_workers=ctx.args.translation_workers,
+        bulk_translator=ctx.bulk_translator,
+        fallback_chain=ctx.fallback_chain
+    )
+    if not source_segments:
+        logger.error("No transcription segments were generated.")
+        return False
+
+    # Save source-language subtitles for future use and release the audio
+    save_japanese_srt(source_segments, ctx.video_path, ctx.cache_keys)
+    ctx.stack.close()
+
+    # Same checkpoint _stage_translate would write, so a rerun from the
+    # cached subtitles doesn't translate again
+    save_checkpoint(_stage_checkpoint_key(ctx, "translate", source_segments), ctx.segments)
+    return True
+
+
+def _stage_save_source(ctx: VideoContext) -> None:
+    """Save source-language subtitles for future use and release the audio."""
+    save_japanese_srt(ctx.segments, ctx.video_path, ctx.cache_keys)
+    # Audio isn't needed for translation - remove the temp dir now
+    ctx.stack.close()
+
+
+@checkpoint("translate")
+def _stage_translate(ctx: VideoContext) -> None:
+    """Step 3: translate to English."""
+    from src.transcribe import translate_segments, format_fallback_chain
+
+    logger.info(f"\n[3/{ctx.total_steps}] Translating to English with {ctx.bulk_translator.upper()}...")
+    logger.info(f"Fallback chain: {format_fallback_chain(ctx.fallback_chain)}")
+    ctx.segments = translate_segments(
+        ctx.segments,
+        workers=ctx.args.translation_workers,
+        bulk_translator=ctx.bulk_translator,
+        fallback_chain=ctx.fallback_chain,
+        use_batch_api=ctx.args.batch_api
+    )
+
+
+def _stage_correct(ctx: VideoContext) -> None:
+    """Step 4 (optional): correct translations."""
+    from src.transcribe import correct_translations, flag_segments_for_correction
+
+    logger.info(f"\n[4/{ctx.total_steps}] Correcting translations with GPT-4...")
+    # OpenAI translations get a free Google cross-check; lines that agree skip correction
+    if ctx.bulk_translator == "openai":
+        try:
+            flag_segments_for_correction(ctx.segments)
+        except Exception as e:
+            logger.warning(f"Translation cross-check failed, correcting every line: {e}")
+    ctx.segments = correct_translations(ctx.segments, use_batch_api=ctx.args.batch_api,
+                                        workers=ctx.args.translation_workers)
+
+
+# Stages per processing mode. A stage returning False aborts the video; a
+# stage returning a mode name continues with that mode's stages instead.
+# Correction and the final save are appended by select_pipeline().
+PIPELINES = {
+    "local": (_stage_extract, _stage_transcribe_local, _stage_save_source, _stage_translate),
+    "api": (_stage_extract_deferred, _stage_pipelined_api),
+    # Transcribe everything, then translate (no stage overlap)
+    "api_sequential": (_stage_extract_deferred, _stage_transcribe_api, _stage_save_source, _stage_translate),
+    "local_direct": (_stage_extract, _stage_translate_local),
+    "api_direct": (_stage_extract_deferred, _stage_translate_api),
+    "cached": (_stage_translate,),
+}
+
+
+def select_pipeline(mode: str, enable_correction: bool) -> tuple:
+    """
+    Build the stage list for a processing mode.
+
+    Args:
+        mode: Key of PIPELINES
+        enable_correction: Whether to add the GPT-4 correction stage
+
+    Returns:
+        Tuple of stage callables
+    """
+    stages = PIPELINES[mode]
+    if enable_correction and not mode.endswith("_direct"):
+        stages += (_stage_correct,)
+    return stages
 
 
 def process_single_video(
@@ -30,7 +319,8 @@ def process_single_video(
     whisper_device: str,
     enable_correction: bool,
     bulk_translator: str,
-    fallback_chain: list,
+    fallback_chain: tuple,
+    total_steps: int,
     source_language: str = None,
     pre_extracted_audio: str = None
 ) -> bool:
@@ -46,109 +336,56 @@ def process_single_video(
         enable_correction: Whether to enable GPT-4 correction
         bulk_translator: Bulk translation method
         fallback_chain: Fallback chain for translation
+        total_steps: Number of pipeline steps for progress banners (fixed per invocation)
         source_language: Detected source language code (e.g., 'ja', 'zh', 'ko'). If None, will auto-detect.
         pre_extracted_audio: Path to pre-extracted audio file (from prefetch). If None, will extract.
 
     Returns:
         True on success, False on failure
     """
+    ctx = VideoContext(
+        video_path=video_path,
+        args=args,
+        use_local_whisper=use_local_whisper,
+        whisper_model=whisper_model,
+        whisper_device=whisper_device,
+        bulk_translator=bulk_translator,
+        fallback_chain=fallback_chain,
+        total_steps=total_steps,
+        source_language=source_language,
+        pre_extracted_audio=pre_extracted_audio
+    )
+
     try:
         logger.info(f"Processing: {video_path}")
 
-        # Determine total steps
-        if args.direct_whisper or (use_local_whisper and args.direct_whisper):
-            total_steps = 2
-        elif use_local_whisper:
-            total_steps = 4 if enable_correction else 3
-        else:
-            total_steps = 4 if enable_correction else 3
-
-        # Check for cached source subtitles
-        segments = None
-        if not args.force_transcribe and not args.direct_whisper:
-            segments = load_japanese_srt(video_path)  # TODO: rename to load_source_srt
+        # Check for cached source subtitles (next to the video, or by content)
+        if not args.direct_whisper:
+            ctx.cache_keys.append(video_fingerprint(video_path))
+            if not args.force_transcribe:
+                ctx.segments = load_japanese_srt(video_path, ctx.cache_keys)  # TODO: rename to load_source_srt
 
-        if segments:
+        if ctx.segments:
             logger.info("Using cached source subtitles (skip transcription)")
+            mode = "cached"
         else:
-            # Step 1: Extract audio (skip if pre-extracted)
-            if pre_extracted_audio:
-                logger.info(f"\n[1/{total_steps}] Using pre-extracted audio...")
-                audio_path = pre_extracted_audio
-            else:
-                logger.info(f"\n[1/{total_steps}] Extracting audio...")
-                audio_path = extract_audio(video_path)
-
-            # Step 2: Transcription/translation
-            if use_local_whisper:
-                from src.transcribe_local import (
-                    transcribe_audio_local,
-                    transcribe_audio_local_translate,
-                    LanguageDetectionError
-                )
-
-                if args.direct_whisper:
-                    logger.info(f"\n[2/{total_steps}] Transcribing and translating with local Whisper ({whisper_model})...")
-                    segments, _ = transcribe_audio_local_translate(
-                        audio_path,
-                        model_size=whisper_model,
-                        device=whisper_device,
-                        beam_size=args.beam_size,
-                        skip_language_check=True if source_language else args.skip_language_check,
-                        expected_language=source_language if source_language else "ja"
-                    )
-                else:
-                    logger.info(f"\n[2/{total_steps}] Transcribing with local Whisper ({whisper_model})...")
-                    # Use detected language if provided, otherwise let it auto-detect
-                    transcribe_lang = source_language if source_language else "ja"
-                    segments, _ = transcribe_audio_local(
-                        audio_path,
-                        model_size=whisper_model,
-                        device=whisper_device,
-                        language=transcribe_lang,
-                        beam_size=args.beam_size,
-                        skip_language_check=True if source_language else args.skip_language_check
-                    )
-                chunks_info = None
-            elif args.direct_whisper:
-                logger.info(f"\n[2/{total_steps}] Chunking and translating to English with Whisper API...")
-                chunks_generator = chunk_audio(audio_path)
-                segments, chunks_info = transcribe_audio_translate(chunks_generator, workers=args.workers)
-            else:
-                logger.info(f"\n[2/{total_steps}] Chunking and transcribing audio...")
-                chunks_generator = chunk_audio(audio_path)
-                segments, chunks_info = transcribe_audio(chunks_generator, workers=args.workers)
-
-            # Clean up chunk files
-            if chunks_info:
-                cleanup_chunks(chunks_info)
-
-            if not segments:
-                logger.error("No transcription segments were generated.")
-                return False
-
-            # Save Japanese subtitles for future use
-            if not args.direct_whisper:
-                save_japanese_srt(segments, video_path)
-
-            # Clean up extracted audio file
-            cleanup_files(audio_path)
-
-        # Step 3: Translate to English
-        if not args.direct_whisper:
-            translator_name = bulk_translator.upper()
-            logger.info(f"\n[3/{total_steps}] Translating to English with {translator_name}...")
-            logger.info(f"Fallback chain: {' → '.join(fallback_chain)}")
-            segments = translate_segments(segments, workers=args.translation_workers, bulk_translator=bulk_translator, fallback_chain=fallback_chain)
-
-        # Step 4 (optional): Correct translations
-        if enable_correction and not args.direct_whisper:
-            logger.info(f"\n[4/{total_steps}] Correcting translations with GPT-4...")
-            segments = correct_translations(segments)
+            mode = ("local" if use_local_whisper else "api") + ("_direct" if args.direct_whisper else "")
+            # The Batch API needs every window up front, so don't overlap translation with transcription
+            if mode == "api" and (args.no_pipeline or (args.batch_api and bulk_translator == "openai")):
+                mode = "api_sequential"
+
+        with ctx.stack:
+            stages = list(select_pipeline(mode, enable_correction))
+            while stages:
+                result = stages.pop(0)(ctx)
+                if result is False:
+                    return False
+                if isinstance(result, str):
+                    stages = list(select_pipeline(result, enable_correction))
 
         # Final step: Save subtitles
         logger.info(f"\n[{total_steps}/{total_steps}] Generating subtitle file...")
-        srt_path = save_subtitles(segments, video_path)
+        srt_path = save_subtitles(ctx.segments, video_path)
 
         logger.info(f"SUCCESS! Subtitle created: {srt_path}")
         return True
@@ -158,90 +395,170 @@ def process_single_video(
         return False
 
 
-def prepare_video(
-    video_path: Path,
+def _error_metadata(video_path: Path, error: Exception) -> dict:
+    """Build the metadata record that marks a video to be skipped on later runs."""
+    return {
+        "version": 1,
+        "video_file": video_path.name,
+        "error": str(error),
+        "error_at": datetime.utcnow().isoformat() + "Z",
+        "skip": True
+    }
+
+
+def detect_missing_languages(
+    video_files: list,
+    metadata_cache: dict,
     whisper_model: str,
     whisper_device: str,
     settings: dict,
-    detect_language_func,
-    get_model_func
-) -> tuple:
+    batch_size: int = 8
+) -> None:
     """
-    Prepare a video for processing (can run in background thread).
+    Detect the language of every video that has no metadata yet, in batches.
 
-    Checks metadata, extracts audio, and detects language.
+    Videos are decoded directly (no ffmpeg extraction needed) and their windows
+    are run through the Whisper encoder batch_size files at a time. Results are
+    saved to disk and written into metadata_cache, so prepare_video_async() only has
+    to extract audio afterwards.
 
     Args:
-        video_path: Path to the video file
+        video_files: List of video file paths
+        metadata_cache: Dict mapping video_path -> metadata dict (updated in place)
         whisper_model: Whisper model size for language detection
         whisper_device: Device for Whisper model
         settings: Settings dict for metadata
-        detect_language_func: Language detection function
-        get_model_func: Model loading function
+        batch_size: Number of files per encoder call
+    """
+    from src.transcribe_local import detect_languages_batch
+
+    missing = [video_path for video_path in video_files if not metadata_cache.get(video_path)]
+    if not missing:
+        return
+
+    logger.info(f"Detecting language for {len(missing)} new video(s) (batches of {batch_size})...")
+    results = detect_languages_batch(missing, model_size=whisper_model, device=whisper_device, batch_size=batch_size)
+
+    for video_path, result in zip(missing, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error preparing {video_path.name}: {result}")
+            # Save error to metadata so we skip this file next time
+            metadata = _error_metadata(video_path, result)
+        else:
+            detected_lang, confidence = result
+            metadata = create_metadata(video_path, detected_lang, confidence, settings)
+        save_metadata(video_path, metadata)
+        metadata_cache[video_path] = metadata
+
+
+def _check_metadata(video_path: Path, metadata_cache: dict, srt_set: set) -> tuple:
+    """
+    Decide from pre-loaded metadata whether a video needs processing.
+
+    Returns:
+        Tuple of (video_path, detected_lang, confidence, None, skip_reason),
+        see prepare_video_async()
+    """
+    metadata = metadata_cache.get(video_path)
+
+    if not metadata:
+        return (video_path, None, 0, None, None)
+
+    # Check if previously failed with error - skip
+    if metadata.get("skip") or metadata.get("error"):
+        return (video_path, None, 0, None, f"skipped: {metadata.get('error', 'marked to skip')}")
+
+    # Check if already English (skip without re-detecting)
+    if metadata.get("detected_language") == "en":
+        return (video_path, "en", metadata.get("language_confidence", 0), None, "english")
+
+    # Check if already processed and SRT exists
+    if metadata.get("processed") and video_path in srt_set:
+        return (video_path, None, 0, None, "processed")
+
+    return (video_path, metadata.get("detected_language"), metadata.get("language_confidence", 0), None, None)
+
+
+def _has_cached_source(video_path: Path) -> bool:
+    """Whether process_single_video() will find cached source subtitles (checked without loading them)."""
+    return find_japanese_srt(video_path, [video_fingerprint(video_path)]) is not None
+
+
+def _prepare_failed(video_path: Path, error: Exception) -> tuple:
+    """Log a preparation error, save it to metadata so the file is skipped next time."""
+    logger.error(f"Error preparing {video_path.name}: {error}")
+    save_metadata(video_path, _error_metadata(video_path, error))
+    return (video_path, None, 0, None, f"error: {error}")
+
+
+async def prepare_video_async(
+    video_path: Path,
+    metadata_cache: dict,
+    srt_set: set,
+    semaphore,
+    ffmpeg_threads: int = None,
+    check_cache: bool = True
+) -> tuple:
+    """
+    Prepare a video for processing on the background event loop.
+
+    Checks metadata and the source subtitle cache, then extracts audio for
+    videos that will be transcribed. Language detection has already been done
+    by detect_missing_languages(), so no Whisper model is used here.
+
+    Args:
+        video_path: Path to the video file
+        metadata_cache: Dict mapping video_path -> metadata dict (from scan_video_folder)
+        srt_set: Set of video paths that have SRT files (from scan_video_folder)
+        semaphore: asyncio.Semaphore bounding concurrent ffmpeg processes
+        ffmpeg_threads: Thread limit passed to each ffmpeg process
+        check_cache: Skip extraction when source subtitles are cached
+            (False with --force-transcribe or --direct-whisper)
 
     Returns:
         Tuple of (video_path, detected_lang, confidence, audio_path, skip_reason)
         - skip_reason is None if video should be processed
         - skip_reason is "english" if video is in English
         - skip_reason is "processed" if already processed
-        - audio_path is None if skipped or if using cached metadata
+        - audio_path is None if skipped or if source subtitles are cached
     """
-    try:
-        # Check existing metadata first
-        metadata = load_metadata(video_path)
-
-        if metadata:
-            # Check if previously failed with error - skip
-            if metadata.get("skip") or metadata.get("error"):
-                return (video_path, None, 0, None, f"skipped: {metadata.get('error', 'marked to skip')}")
-
-            # Check if already English (skip without re-detecting)
-            if metadata.get("detected_language") == "en":
-                return (video_path, "en", metadata.get("language_confidence", 0), None, "english")
+    import asyncio
+    from src.extract_audio import extract_audio_async
 
-            # Check if already processed and SRT exists
-            if metadata.get("processed") and has_existing_srt(video_path):
-                return (video_path, None, 0, None, "processed")
-
-            # Have metadata but not processed - use cached language info
-            detected_lang = metadata.get("detected_language")
-            confidence = metadata.get("language_confidence", 0)
-            return (video_path, detected_lang, confidence, None, None)
-
-        # No metadata - need to detect language
-        # Extract audio for language detection
-        audio_path = extract_audio(video_path)
-
-        # Detect language
-        detected_lang, confidence = detect_language_func(
-            audio_path,
-            model_size=whisper_model,
-            device=whisper_device
-        )
+    try:
+        # Check existing metadata first (pre-loaded by the folder scan, no file I/O)
+        result = _check_metadata(video_path, metadata_cache, srt_set)
+        if result[4]:
+            return result
+
+        # Cached source subtitles skip transcription, so there is no audio to extract
+        if check_cache and await asyncio.to_thread(_has_cached_source, video_path):
+            return result[:3] + (None, None)
+
+        # Extract audio ahead of processing into the video's own work dir;
+        # the caller removes the directory once the video is done
+        work_dir = make_work_dir()
+        try:
+            async with semaphore:
+                audio_path = await extract_audio_async(video_path, threads=ffmpeg_threads,
+                                                        output_dir=work_dir, background=True)
+        except BaseException:
+            remove_work_dir(work_dir)
+            raise
+        return result[:3] + (audio_path, None)
 
-        # Create and save metadata
-        new_metadata = create_metadata(video_path, detected_lang, confidence, settings)
-        save_metadata(video_path, new_metadata)
+    except Exception as e:
+        return _prepare_failed(video_path, e)
 
-        if detected_lang == "en":
-            cleanup_files(audio_path)
-            return (video_path, "en", confidence, None, "english")
 
-        # Return with audio path for processing
-        return (video_path, detected_lang, confidence, audio_path, None)
+async def _cancel_all() -> None:
+    """Cancel every other task on the running loop and wait for them to finish."""
+    import asyncio
 
-    except Exception as e:
-        logger.error(f"Error preparing {video_path.name}: {e}")
-        # Save error to metadata so we skip this file next time
-        error_metadata = {
-            "version": 1,
-            "video_file": video_path.name,
-            "error": str(e),
-            "error_at": datetime.utcnow().isoformat() + "Z",
-            "skip": True
-        }
-        save_metadata(video_path, error_metadata)
-        return (video_path, None, 0, None, f"error: {e}")
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def prescan_videos(video_files: list, metadata_cache: dict, srt_set: set) -> dict:
@@ -300,7 +617,8 @@ def process_folder(
     whisper_device: str,
     enable_correction: bool,
     bulk_translator: str,
-    fallback_chain: list
+    fallback_chain: tuple,
+    total_steps: int
 ) -> None:
     """
     Process all video files in a folder.
@@ -314,8 +632,9 @@ def process_folder(
         enable_correction: Whether to enable GPT-4 correction
         bulk_translator: Bulk translation method
         fallback_chain: Fallback chain for translation
+        total_steps: Number of pipeline steps for progress banners
     """
-    from src.transcribe_local import detect_language, get_model
+    from src.transcribe_local import get_model
 
     # Single scan to find all videos, SRTs, and metadata at once
     # This is much faster on network filesystems than multiple separate calls
@@ -324,6 +643,7 @@ def process_folder(
     video_files = folder_scan['videos']
     srt_set = folder_scan['srt_set']
     metadata_cache = folder_scan['metadata']
+    video_sizes = folder_scan['sizes']
 
     if not video_files:
         logger.warning(f"No video files found in {folder_path}")
@@ -349,23 +669,22 @@ def process_folder(
     scan_result = prescan_videos(video_files, metadata_cache, srt_set)
 
     # Display summary
-    logger.info("")
-    logger.info("File scan summary:")
-    logger.info(f"  To process: {len(scan_result['to_process'])}")
-    logger.info(f"  Skip (previous error): {len(scan_result['skip_error'])}")
-    logger.info(f"  Skip (already English): {len(scan_result['skip_english'])}")
-    logger.info(f"  Skip (already processed): {len(scan_result['skip_processed'])}")
-
-    # List skipped files
-    if scan_result['skip_error'] or scan_result['skip_english'] or scan_result['skip_processed']:
-        logger.info("")
-        logger.info("Skipped files:")
-        for video_path in scan_result['skip_error']:
-            logger.info(f"  [error] {video_path.name}")
-        for video_path in scan_result['skip_english']:
-            logger.info(f"  [english] {video_path.name}")
-        for video_path in scan_result['skip_processed']:
-            logger.info(f"  [processed] {video_path.name}")
+    logger.info(
+        "\nFile scan summary:\n"
+        f"  To process: {len(scan_result['to_process'])}\n"
+        f"  Skip (previous error): {len(scan_result['skip_error'])}\n"
+        f"  Skip (already English): {len(scan_result['skip_english'])}\n"
+        f"  Skip (already processed): {len(scan_result['skip_processed'])}"
+    )
+
+    # List skipped files (can be thousands of lines - only build it if it will be shown)
+    has_skipped = scan_result['skip_error'] or scan_result['skip_english'] or scan_result['skip_processed']
+    if has_skipped and logger.isEnabledFor(logging.INFO):
+        lines = ["", "Skipped files:"]
+        lines.extend(f"  [error] {video_path.name}" for video_path in scan_result['skip_error'])
+        lines.extend(f"  [english] {video_path.name}" for video_path in scan_result['skip_english'])
+        lines.extend(f"  [processed] {video_path.name}" for video_path in scan_result['skip_processed'])
+        logger.info("\n".join(lines))
 
     # Early exit if nothing to process
     if not scan_result['to_process']:
@@ -394,116 +713,101 @@ def process_folder(
 
     total = len(video_files)
 
-    # Pre-load Whisper model for language detection (needed for prefetch threads)
+    # Pre-load Whisper model and detect languages for new videos in batches,
+    # so the prefetch threads below only run ffmpeg
     logger.info("")
     logger.info("Loading Whisper model for language detection...")
     get_model(whisper_model, whisper_device)
+    detect_missing_languages(video_files, metadata_cache, whisper_model, whisper_device, settings)
 
     # Check if prefetch is enabled
     use_prefetch = not getattr(args, 'no_prefetch', False) and total > 1
+    prefetch_depth = max(1, args.prefetch_depth) if use_prefetch else 1
+    extract_concurrency = max(1, args.extract_concurrency) if use_prefetch else 1
 
     if use_prefetch:
-        from concurrent.futures import ThreadPoolExecutor
-        logger.info("Pipeline mode: prefetching next video while processing")
-
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            # Submit first video for preparation
-            pending_future = executor.submit(
-                prepare_video, video_files[0], whisper_model, whisper_device,
-                settings, detect_language, get_model
-            )
-
-            for idx, video_path in enumerate(video_files):
-                logger.info("")
-                logger.info("=" * 60)
-                logger.info(f"[{idx + 1}/{total}] Processing: {video_path.name}")
-                logger.info("=" * 60)
-
-                try:
-                    # Get preparation result for current video
-                    prep_result = pending_future.result()
-                    _, detected_lang, confidence, audio_path, skip_reason = prep_result
-
-                    # Submit NEXT video for preparation (if exists)
-                    if idx + 1 < len(video_files):
-                        pending_future = executor.submit(
-                            prepare_video, video_files[idx + 1], whisper_model, whisper_device,
-                            settings, detect_language, get_model
-                        )
+        logger.info(f"Pipeline mode: preparing up to {prefetch_depth} video(s) ahead while processing")
+
+    import asyncio
+    import threading
+    from concurrent.futures import wait, FIRST_COMPLETED
+
+    # One background event loop drives all ffmpeg extractions as subprocesses;
+    # limit each ffmpeg to one thread when several run at once so they share cores
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    semaphore = asyncio.Semaphore(extract_concurrency)
+    ffmpeg_threads = 1 if extract_concurrency > 1 else None
+
+    # Bind the per-folder arguments once instead of on every call
+    prepare = functools.partial(
+        prepare_video_async,
+        metadata_cache=metadata_cache,
+        srt_set=srt_set,
+        semaphore=semaphore,
+        ffmpeg_threads=ffmpeg_threads,
+        check_cache=not (args.force_transcribe or args.direct_whisper)
+    )
+    process = functools.partial(
+        process_single_video,
+        args=args,
+        use_local_whisper=use_local_whisper,
+        whisper_model=whisper_model,
+        whisper_device=whisper_device,
+        enable_correction=enable_correction,
+        bulk_translator=bulk_translator,
+        fallback_chain=fallback_chain,
+        total_steps=total_steps
+    )
 
-                    # Handle skip reasons
-                    if skip_reason == "english":
-                        logger.info(f"Skipping (already English): {detected_lang} ({confidence:.1%} confidence)")
-                        skipped_language += 1
-                        skipped_files.append((video_path.name, detected_lang, confidence))
-                        continue
-                    elif skip_reason == "processed":
-                        logger.info(f"Skipping (metadata: already processed)")
-                        skipped_metadata += 1
-                        continue
-                    elif skip_reason and skip_reason.startswith("error:"):
-                        logger.error(f"Preparation failed: {skip_reason}")
-                        failed += 1
-                        continue
-                    elif skip_reason and skip_reason.startswith("skipped:"):
-                        logger.info(f"Skipping (previous error): {video_path.name}")
-                        skipped_error += 1
-                        continue
-
-                    logger.info(f"Language: {detected_lang} ({confidence:.1%} confidence) - proceeding with transcription")
-
-                    # Process the video with detected language and pre-extracted audio
-                    success = process_single_video(
-                        video_path,
-                        args,
-                        use_local_whisper,
-                        whisper_model,
-                        whisper_device,
-                        enable_correction,
-                        bulk_translator,
-                        fallback_chain,
-                        source_language=detected_lang,
-                        pre_extracted_audio=audio_path
-                    )
-
-                    if success:
-                        processed += 1
-                        update_metadata_processed(video_path, video_path.with_suffix('.srt').name)
-                    else:
-                        failed += 1
-                        # Clean up audio if processing failed
-                        if audio_path:
-                            cleanup_files(audio_path)
+    def submit_prepare(video_path):
+        return asyncio.run_coroutine_threadsafe(prepare(video_path), loop)
 
-                except KeyboardInterrupt:
-                    logger.info("\n\nProcess interrupted by user")
-                    logger.info(f"Processed {processed} video(s) before interruption")
-                    raise
+    # In-flight preparations, mapped to their position in video_files. Videos are
+    # processed in the order their preparation finishes, so one slow extraction
+    # doesn't hold up videos that are already ready. Without prefetch only the
+    # current video is ever in flight.
+    pending_futures = {}
+    next_to_submit = 0
+    started = 0
 
-                except Exception as e:
-                    logger.error(f"Error processing {video_path}: {e}")
-                    failed += 1
+    def fill_pipeline():
+        nonlocal next_to_submit
+        while len(pending_futures) < prefetch_depth and next_to_submit < total:
+            pending_futures[submit_prepare(video_files[next_to_submit])] = next_to_submit
+            next_to_submit += 1
 
-    else:
-        # Sequential processing (no prefetch)
-        for idx, video_path in enumerate(video_files, 1):
-            logger.info("")
-            logger.info("=" * 60)
-            logger.info(f"[{idx}/{total}] Processing: {video_path.name}")
-            logger.info("=" * 60)
+    try:
+        while True:
+            fill_pipeline()
+            if not pending_futures:
+                break
+
+            # Take the earliest-queued video among those whose preparation is done
+            done, _ = wait(pending_futures, return_when=FIRST_COMPLETED)
+            future = min(done, key=pending_futures.get)
+            video_path = video_files[pending_futures.pop(future)]
+            started += 1
+
+            # Keep the pipeline full while this video is processed
+            if use_prefetch:
+                fill_pipeline()
+
+            # Bind per-video names once (Path attribute access and with_suffix allocate)
+            name = video_path.name
+            srt_name = video_path.stem + '.srt'
+            logger.info(_BANNER.format(i=started, n=total, name=name, size_mb=video_sizes[video_path] / 2**20))
 
             try:
-                # Prepare video (synchronous)
-                _, detected_lang, confidence, audio_path, skip_reason = prepare_video(
-                    video_path, whisper_model, whisper_device,
-                    settings, detect_language, get_model
-                )
+                # Get preparation result for current video
+                _, detected_lang, confidence, audio_path, skip_reason = future.result()
 
                 # Handle skip reasons
                 if skip_reason == "english":
                     logger.info(f"Skipping (already English): {detected_lang} ({confidence:.1%} confidence)")
                     skipped_language += 1
-                    skipped_files.append((video_path.name, detected_lang, confidence))
+                    skipped_files.append((name, detected_lang, confidence))
                     continue
                 elif skip_reason == "processed":
                     logger.info(f"Skipping (metadata: already processed)")
@@ -514,33 +818,25 @@ def process_folder(
                     failed += 1
                     continue
                 elif skip_reason and skip_reason.startswith("skipped:"):
-                    logger.info(f"Skipping (previous error): {video_path.name}")
+                    logger.info(f"Skipping (previous error): {name}")
                     skipped_error += 1
                     continue
 
                 logger.info(f"Language: {detected_lang} ({confidence:.1%} confidence) - proceeding with transcription")
 
-                # Process the video
-                success = process_single_video(
-                    video_path,
-                    args,
-                    use_local_whisper,
-                    whisper_model,
-                    whisper_device,
-                    enable_correction,
-                    bulk_translator,
-                    fallback_chain,
-                    source_language=detected_lang,
-                    pre_extracted_audio=audio_path
-                )
+                # Process the video with detected language and pre-extracted audio;
+                # its work dir (audio + chunks) is removed in one go afterwards
+                try:
+                    success = process(video_path, source_language=detected_lang, pre_extracted_audio=audio_path)
+                finally:
+                    if audio_path:
+                        remove_work_dir(os.path.dirname(audio_path))
 
                 if success:
                     processed += 1
-                    update_metadata_processed(video_path, video_path.with_suffix('.srt').name)
+                    update_metadata_processed(video_path, srt_name)
                 else:
                     failed += 1
-                    if audio_path:
-                        cleanup_files(audio_path)
 
             except KeyboardInterrupt:
                 logger.info("\n\nProcess interrupted by user")
@@ -551,30 +847,273 @@ def process_folder(
                 logger.error(f"Error processing {video_path}: {e}")
                 failed += 1
 
+    finally:
+        # Cancel unfinished preparations on the loop itself, so their cleanup
+        # (killing ffmpeg, removing the work dir) runs before the loop stops
+        asyncio.run_coroutine_threadsafe(_cancel_all(), loop).result()
+        wait(pending_futures)
+        for future in pending_futures:
+            # Drop audio that was prefetched but never processed
+            if not future.cancelled() and future.exception() is None:
+                audio_path = future.result()[3]
+                if audio_path:
+                    remove_work_dir(os.path.dirname(audio_path))
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
     # Print summary
     # Calculate total including pre-scanned skips
     prescanned_skips = len(scan_result['skip_error']) + len(scan_result['skip_english']) + len(scan_result['skip_processed'])
     total_found = total + skipped_existing + prescanned_skips
 
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Folder Processing Complete")
-    logger.info("=" * 60)
-    logger.info(f"Total files found: {total_found}")
-    logger.info(f"  - Processed successfully: {processed}")
-    logger.info(f"  - Skipped (already English): {skipped_language + len(scan_result['skip_english'])}")
-    logger.info(f"  - Skipped (already processed): {skipped_metadata + len(scan_result['skip_processed'])}")
-    logger.info(f"  - Skipped (SRT exists, --skip-existing): {skipped_existing}")
-    logger.info(f"  - Skipped (previous error): {skipped_error + len(scan_result['skip_error'])}")
-    logger.info(f"  - Failed: {failed}")
+    lines = [
+        "",
+        _RULE,
+        "Folder Processing Complete",
+        _RULE,
+        f"Total files found: {total_found}",
+        f"  - Processed successfully: {processed}",
+        f"  - Skipped (already English): {skipped_language + len(scan_result['skip_english'])}",
+        f"  - Skipped (already processed): {skipped_metadata + len(scan_result['skip_processed'])}",
+        f"  - Skipped (SRT exists, --skip-existing): {skipped_existing}",
+        f"  - Skipped (previous error): {skipped_error + len(scan_result['skip_error'])}",
+        f"  - Failed: {failed}",
+    ]
 
     if skipped_files:
-        logger.info("")
-        logger.info("Files skipped due to language:")
-        for name, lang, conf in skipped_files:
-            logger.info(f"  - {name}: {lang} ({conf:.1%})")
+        lines.append("")
+        lines.append("Files skipped due to language:")
+        lines.extend(f"  - {name}: {lang} ({conf:.1%})" for name, lang, conf in skipped_files)
+
+    lines.append(_RULE)
+    logger.info("\n".join(lines))
+
+
+def process_videos(
+    video_paths: List[Path],
+    args,
+    use_local_whisper: bool,
+    whisper_model: str,
+    whisper_device: str,
+    enable_correction: bool,
+    bulk_translator: str,
+    fallback_chain: tuple,
+    total_steps: int
+) -> int:
+    """
+    Process several video files given on the command line in one run.
+
+    The local Whisper model is loaded once and reused for every file, and the
+    next file's audio is extracted on a single background thread while the
+    current one is transcribed/translated (disabled by --no-prefetch).
+
+    Args:
+        video_paths: Validated video file paths, processed in order
+        args: Parsed command line arguments
+        (remaining args as for process_single_video)
+
+    Returns:
+        Number of videos that failed
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if use_local_whisper:
+        from src.transcribe_local import warm
+        logger.info(f"Loading Whisper model once for {len(video_paths)} videos...")
+        # In the background, so the first prefetch extraction overlaps with it
+        warm(whisper_model, whisper_device)
+
+    check_cache = not (args.force_transcribe or args.direct_whisper)
+
+    def prefetch(video_path: Path) -> Optional[str]:
+        # Cached source subtitles skip transcription: no audio to extract
+        if check_cache and _has_cached_source(video_path):
+            return None
+        work_dir = make_work_dir()
+        try:
+            return extract_audio(video_path, output_dir=work_dir, background=True)
+        except BaseException:
+            remove_work_dir(work_dir)
+            raise
+
+    failed = 0
+    total = len(video_paths)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_future = None if args.no_prefetch else executor.submit(prefetch, video_paths[0])
+
+        for i, video_path in enumerate(video_paths, 1):
+            future = next_future
+            next_future = executor.submit(prefetch, video_paths[i]) if future and i < total else None
+
+            logger.info(_BANNER.format(i=i, n=total, name=video_path.name,
+                                       size_mb=video_path.stat().st_size / 2**20))
+
+            audio_path = None
+            try:
+                if future:
+                    audio_path = future.result()
+                success = process_single_video(
+                    video_path,
+                    args,
+                    use_local_whisper,
+                    whisper_model,
+                    whisper_device,
+                    enable_correction,
+                    bulk_translator,
+                    fallback_chain,
+                    total_steps,
+                    pre_extracted_audio=audio_path
+                )
+            except Exception as e:
+                logger.error(f"Failed to process {video_path}: {e}")
+                success = False
+            finally:
+                if audio_path:
+                    remove_work_dir(os.path.dirname(audio_path))
+
+            if not success:
+                failed += 1
+
+    logger.info("\n".join([
+        "",
+        _RULE,
+        f"Processed {total - failed}/{total} videos ({failed} failed)",
+        _RULE,
+    ]))
+    return failed
+
+
+def serve(
+    socket_path: str,
+    keepalive: int,
+    args,
+    use_local_whisper: bool,
+    whisper_model: str,
+    whisper_device: str,
+    enable_correction: bool,
+    bulk_translator: str,
+    fallback_chain: tuple,
+    total_steps: int
+) -> None:
+    """
+    Keep the Whisper model loaded and process paths sent over a UNIX socket.
+
+    Each request is one JSON line {"path": "..."}; the server answers with one
+    JSON line {"path": "...", "success": bool}. Audio is handed around as file
+    paths, never as bytes over the socket.
+
+    Args:
+        socket_path: Path of the UNIX socket to listen on
+        keepalive: Exit after this many idle seconds (0 = run until interrupted)
+        args: Parsed command line arguments (used for every request)
+        use_local_whisper: Whether to use local Whisper model
+        whisper_model: Whisper model size
+        whisper_device: Device for local Whisper
+        enable_correction: Whether to enable GPT-4 correction
+        bulk_translator: Bulk translation method
+        fallback_chain: Fallback chain for translation
+        total_steps: Number of pipeline steps for progress banners
+    """
+    import json
+    import socketserver
+
+    if use_local_whisper:
+        from src.transcribe_local import get_model
+        logger.info("Loading Whisper model (kept in memory while serving)...")
+        get_model(whisper_model, whisper_device)
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                request_path = line.decode(errors="replace").strip()
+                try:
+                    request_path = json.loads(line)["path"]
+                    input_path, is_directory = validate_input_path(request_path)
+                    if is_directory:
+                        # Folder mode always uses local Whisper for language detection
+                        process_folder(
+                            input_path, args, True, whisper_model, whisper_device,
+                            enable_correction, bulk_translator, fallback_chain, total_steps
+                        )
+                        success = True
+                    else:
+                        success = process_single_video(
+                            input_path, args, use_local_whisper, whisper_model, whisper_device,
+                            enable_correction, bulk_translator, fallback_chain, total_steps
+                        )
+                except Exception as e:
+                    logger.error(f"Request failed: {e}")
+                    success = False
+
+                self.wfile.write((json.dumps({"path": str(request_path), "success": success}) + "\n").encode())
+                self.wfile.flush()
+
+    # Remove a stale socket left behind by a previous server
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    if Path(socket_path).parent == CACHE_DIR:
+        make_cache_dir(CACHE_DIR)
+
+    idle = {"timed_out": False}
+
+    class Server(socketserver.UnixStreamServer):
+        def server_bind(self):
+            super().server_bind()
+            # Requests run the whole pipeline on any path: only this user may connect
+            os.chmod(self.server_address, 0o600)
+
+        def handle_timeout(self):
+            idle["timed_out"] = True
+
+    with Server(socket_path, RequestHandler) as server:
+        server.timeout = keepalive if keepalive > 0 else None
+        logger.info(f"Serving on {socket_path}" + (f" (exits after {keepalive}s idle)" if keepalive > 0 else ""))
+        try:
+            while not idle["timed_out"]:
+                server.handle_request()
+        finally:
+            os.unlink(socket_path)
+
+    logger.info(f"No requests for {keepalive}s, shutting down")
+
+
+def default_socket_path() -> str:
+    """
+    UNIX socket path for --serve/--client.
+
+    Returns:
+        subscene.sock in $XDG_RUNTIME_DIR if set, else in CACHE_DIR (both private to the user)
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "subscene.sock")
+    return str(CACHE_DIR / "subscene.sock")
+
+
+def send_to_server(socket_path: str, input_path: str) -> bool:
+    """
+    Send a path to a running --serve instance and wait for the result.
+
+    Args:
+        socket_path: Path of the server's UNIX socket
+        input_path: Video file or folder to process
+
+    Returns:
+        True if the server processed the path successfully
+    """
+    import json
+    import socket
+
+    path = Path(input_path).resolve()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps({"path": str(path)}) + "\n").encode())
+        sock.shutdown(socket.SHUT_WR)
+        response = json.loads(sock.makefile("rb").readline())
 
-    logger.info("=" * 60)
+    logger.info(f"{response['path']}: {'done' if response['success'] else 'failed'}")
+    return response["success"]
 
 
 def main():
@@ -587,23 +1126,27 @@ def main():
         epilog="""
 Examples:
   python main.py test_file.mp4                    # Process single video
+  python main.py a.mp4 b.mp4 c.mkv --local-whisper # Process several videos, loading the model once
   python main.py /path/to/videos/                 # Process all videos in folder
   python main.py /path/to/videos/ --skip-existing # Skip videos with existing .srt
   python main.py "/path/with spaces/video.mp4"
+  python main.py --serve --local-whisper --keepalive 600 # Keep the model loaded
+  python main.py --client test_file.mp4           # Process via the running server
         """
     )
 
     parser.add_argument(
         "input_path",
         type=str,
-        help="Path to a video file or folder containing videos (supports absolute and relative paths)"
+        nargs="*",
+        help="Path(s) to video files or folders containing videos (supports absolute and relative paths)"
     )
 
     parser.add_argument(
         "-w", "--workers",
         type=int,
         default=None,
-        help="Number of parallel workers for transcription only (default: from config or 4). Translation uses TRANSLATION_WORKERS from config."
+        help="Number of concurrent Whisper API requests for transcription (default: WORKERS from config, or tuned from measured latency and WHISPER_RPM). All requests share one event loop, so values of 20-50 are fine within your rate limits. Translation uses TRANSLATION_WORKERS from config."
     )
 
     parser.add_argument(
@@ -625,6 +1168,18 @@ Examples:
         help="Enable GPT-4 correction step (overrides .env setting)"
     )
 
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Send OpenAI translation and correction through the Batch API: half the cost, but results can take up to 24 hours. Overrides TRANSLATION_BATCH_API from config."
+    )
+
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_true",
+        help="With the Whisper API, transcribe the whole video before translating instead of translating finished time windows while later chunks are still being transcribed"
+    )
+
     parser.add_argument(
         "--force-transcribe",
         action="store_true",
@@ -677,8 +1232,15 @@ Examples:
     parser.add_argument(
         "--beam-size",
         type=int,
-        default=5,
-        help="Beam size for local Whisper decoding (default: 5). Higher values may improve accuracy but are slower. Only used with --local-whisper."
+        default=1,
+        help="Beam size for local Whisper decoding (default: 1 = greedy with temperature fallback). Values like 5 may improve accuracy slightly but are several times slower. Only used with --local-whisper."
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Number of 30s audio windows decoded together by local Whisper (default: 16 on CUDA, 4 on CPU; 1 = sequential). Values above 1 use faster-whisper's batched pipeline for much higher GPU throughput. Only used with --local-whisper."
     )
 
     parser.add_argument(
@@ -699,16 +1261,75 @@ Examples:
         help="Disable background prefetching of next video (reduces memory usage, slower processing)"
     )
 
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=2,
+        help="Number of videos to prepare (extract audio) ahead of the current one in folder mode (default: 2)"
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the Whisper model loaded and process paths sent with --client over a UNIX socket"
+    )
+
+    parser.add_argument(
+        "--client",
+        action="store_true",
+        help="Send input_path to a running --serve instance instead of processing it here"
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="UNIX socket path for --serve/--client (default: $XDG_RUNTIME_DIR/subscene.sock, else ~/.cache/subscene/subscene.sock)"
+    )
+
+    parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=0,
+        help="With --serve, exit after this many idle seconds (default: 0 = never)"
+    )
+
+    parser.add_argument(
+        "--extract-concurrency",
+        type=int,
+        default=2,
+        help="Maximum number of ffmpeg audio extractions running at once while prefetching in folder mode (default: 2)"
+    )
+
     # Parse arguments
     args = parser.parse_args()
 
+    if not args.serve and not args.input_path:
+        parser.error("input_path is required unless --serve is used")
+    if args.socket is None:
+        args.socket = default_socket_path()
+
+    # Client mode: hand the paths to the server, which already has the model loaded
+    if args.client:
+        try:
+            results = [send_to_server(args.socket, path) for path in args.input_path]
+            sys.exit(0 if all(results) else 1)
+        except OSError as e:
+            logger.error(f"Could not reach server at {args.socket}: {e}")
+            sys.exit(1)
+
     try:
         # Validate input path (can be file or directory)
         logger.info("=" * 60)
         logger.info("Whisper Subtitle Generator")
         logger.info("=" * 60)
 
-        input_path, is_directory = validate_input_path(args.input_path)
+        # Validate every input up front; folders and files are handled separately
+        folders, videos = [], []
+        for path in args.input_path:
+            input_path, is_directory = validate_input_path(path)
+            (folders if is_directory else videos).append(input_path)
+        is_directory = bool(folders)
 
         # Determine local whisper settings
         use_local_whisper = args.local_whisper
@@ -726,7 +1347,10 @@ Examples:
             sys.exit(1)
 
         if use_local_whisper:
-            logger.info(f"Using local Whisper: model={whisper_model}, device={whisper_device}, beam_size={args.beam_size}")
+            logger.info(f"Using local Whisper: model={whisper_model}, device={whisper_device}, beam_size={args.beam_size}, batch_size={args.batch_size or 'auto'}")
+            # Load the model while the first audio is being extracted
+            from src.transcribe_local import warm
+            warm(whisper_model, whisper_device)
 
         # Determine if correction should be enabled
         enable_correction = ENABLE_CORRECTION
@@ -735,6 +1359,8 @@ Examples:
         elif args.no_correction:
             enable_correction = False
 
+        args.batch_api = args.batch_api or TRANSLATION_BATCH_API
+
         # Direct whisper mode is incompatible with correction (already translated)
         if args.direct_whisper and enable_correction:
             logger.warning("--direct-whisper is incompatible with correction. Disabling correction.")
@@ -746,38 +1372,83 @@ Examples:
         # Determine fallback chain (CLI overrides config)
         fallback_chain = args.fallback_chain.split(',') if args.fallback_chain else FALLBACK_CHAIN
 
-        if is_directory:
-            # Process folder
-            logger.info(f"Input folder: {input_path}")
-            process_folder(
-                input_path,
+        # Resolve method names to translator functions once, up front
+        from src.transcribe import compile_fallback_chain
+        try:
+            fallback_chain = compile_fallback_chain(fallback_chain)
+        except ValueError as e:
+            parser.error(str(e))
+
+        # Steps per video are fixed for the whole invocation
+        total_steps = 2 if args.direct_whisper else (4 if enable_correction else 3)
+
+        if args.serve:
+            serve(
+                args.socket,
+                args.keepalive,
                 args,
                 use_local_whisper,
                 whisper_model,
                 whisper_device,
                 enable_correction,
                 bulk_translator,
-                fallback_chain
+                fallback_chain,
+                total_steps
             )
         else:
-            # Process single video
-            logger.info(f"Input video: {input_path}")
-            success = process_single_video(
-                input_path,
-                args,
-                use_local_whisper,
-                whisper_model,
-                whisper_device,
-                enable_correction,
-                bulk_translator,
-                fallback_chain
-            )
-            if not success:
+            failed = 0
+
+            for folder in folders:
+                # Process folder
+                logger.info(f"Input folder: {folder}")
+                process_folder(
+                    folder,
+                    args,
+                    use_local_whisper,
+                    whisper_model,
+                    whisper_device,
+                    enable_correction,
+                    bulk_translator,
+                    fallback_chain,
+                    total_steps
+                )
+
+            if len(videos) > 1:
+                # Process several videos, sharing the model and prefetching audio
+                failed = process_videos(
+                    videos,
+                    args,
+                    use_local_whisper,
+                    whisper_model,
+                    whisper_device,
+                    enable_correction,
+                    bulk_translator,
+                    fallback_chain,
+                    total_steps
+                )
+            elif videos:
+                # Process single video
+                logger.info(f"Input video: {videos[0]}")
+                if not process_single_video(
+                    videos[0],
+                    args,
+                    use_local_whisper,
+                    whisper_model,
+                    whisper_device,
+                    enable_correction,
+                    bulk_translator,
+                    fallback_chain,
+                    total_steps
+                ):
+                    failed = 1
+
+            if failed:
                 sys.exit(1)
 
-            logger.info("\n" + "=" * 60)
-            logger.info("Processing complete!")
-            logger.info("=" * 60)
+            if videos:
+                logger.info("\n" + "=" * 60)
+                logger.info("Processing complete!")
+                logger.info("=" * 60)
 
     except KeyboardInterrupt:
         logger.info("\n\nProcess interrupted by user")
@@ -1,77 +1,113 @@
 #!/usr/bin/env python3
 """
 TUI-enabled wrapper for main.py
-Runs processing in background thread while TUI runs in main thread.
+Runs processing in a child process while TUI runs in the main process.
 """
 
 import sys
-import threading
-import time
+import multiprocessing
 import os
 
-# Set environment variable to disable tqdm
+# Fast path: --no-tui runs main.py in this process, without importing the TUI
+# stack or starting the processing process
+if __name__ == "__main__" and "--no-tui" in sys.argv:
+    sys.argv.remove("--no-tui")
+    import main
+    main.main()
+    sys.exit(0)
+
+# Set environment variable to disable tqdm (inherited by the child process)
 os.environ['SUBSCENE_TUI_MODE'] = '1'
 
-# Import main processing
-import main
+# Upper bound on how long processing waits for the TUI to mount
+TUI_READY_TIMEOUT = 5
+
+
+def run_main_process(argv, event_queue, ready_event=None):
+    """
+    Run main.py in the processing child process.
 
-# Import TUI
-from tui.app import TUIManager
-from tui.event_bus import Events, event_bus
+    Events emitted here are forwarded to the TUI process through event_queue.
+
+    Args:
+        argv: Argument list for main.py
+        event_queue: multiprocessing.Queue bridged into the TUI's event bus
+        ready_event: Event set once the TUI has mounted; processing waits on it
+            so early events aren't emitted before anything is listening
+    """
+    from tui.event_bus import Events, event_bus
+    event_bus.set_forward_queue(event_queue)
 
-def run_main_in_thread(argv):
-    """Run main.py in a background thread."""
-    # Override sys.argv for main.py
-    old_argv = sys.argv
     sys.argv = argv
 
     try:
-        # Give TUI time to start
-        time.sleep(1)
+        # Import main processing in the child only
+        import main
+
+        # Wait for the TUI to come up (returns immediately once it has mounted)
+        if ready_event is not None:
+            ready_event.wait(timeout=TUI_READY_TIMEOUT)
         main.main()
     except KeyboardInterrupt:
         event_bus.emit(Events.PIPELINE_ERROR, {"error": "Interrupted"})
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            event_bus.emit(Events.PIPELINE_ERROR, {"error": f"Exited with status {e.code}"})
     except Exception as e:
         event_bus.emit(Events.PIPELINE_ERROR, {"error": str(e)})
         import traceback
         traceback.print_exc()
     finally:
-        sys.argv = old_argv
-        # Signal TUI that processing is done
-        time.sleep(2)
+        # Signal TUI that processing is done, then stop the bridge
+        event_bus.emit(Events.PROCESSING_DONE, {})
+        event_queue.put(None)
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python main_tui.py <video_file> [options]")
         print("Example: python main_tui.py test.mp4 --local-whisper --model tiny")
-        print("\nNote: Adds --no-tui is not supported in this mode.")
+        print("\nUse --no-tui to run without the TUI (e.g. on CI).")
         sys.exit(1)
 
     # Check TTY
     if not sys.stdout.isatty():
         print("Error: TUI requires an interactive terminal")
-        print("Run 'python main.py' instead for non-TTY mode")
+        print("Run 'python main.py' or pass --no-tui for non-TTY mode")
         sys.exit(1)
 
-    # Prepare argv for main.py (add --no-tui to disable conflicting tqdm)
+    # Import TUI (the processing child never needs it)
+    from tui.app import TUIManager
+    from tui.event_bus import start_queue_bridge
+
+    # Prepare argv for main.py
     main_argv = ["main.py"] + sys.argv[1:]
 
-    # Start processing thread
+    # spawn: the child starts clean, without inherited torch/CUDA or TUI state
+    mp_context = multiprocessing.get_context("spawn")
+    event_queue = mp_context.Queue()
+
+    # Create the TUI first so its handlers are subscribed before processing starts
+    tui_manager = TUIManager(ready_event=mp_context.Event())
+
+    # Start processing process
     print("Starting subtitle generator with TUI...")
-    processing_thread = threading.Thread(
-        target=run_main_in_thread,
-        args=(main_argv,),
+    processing = mp_context.Process(
+        target=run_main_process,
+        args=(main_argv, event_queue, tui_manager.ready_event),
         daemon=True
     )
-    processing_thread.start()
+    processing.start()
+    start_queue_bridge(event_queue, processing)
 
-    # Run TUI in main thread
+    # Run TUI in main process
     try:
-        tui_manager = TUIManager()
         tui_manager.run()
     except KeyboardInterrupt:
         print("\nTUI interrupted")
     finally:
-        # Wait a bit for processing thread
-        processing_thread.join(timeout=3)
+        # Wait a bit for the processing process, then stop it
+        processing.join(timeout=3)
+        if processing.is_alive():
+            processing.terminate()
         print("TUI closed")
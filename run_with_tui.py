@@ -1,29 +1,31 @@
 #!/usr/bin/env python3
 """
-Wrapper to run main.py processing in a background thread while TUI runs in main thread.
+Wrapper to run main.py processing in a child process while TUI runs in the main process.
 This is a temporary solution to test the TUI - the proper fix would be to refactor main.py.
 """
 
 import sys
-import threading
+import multiprocessing
 from pathlib import Path
 
-# Import the TUI
-from tui.app import TUIManager
+def run_processing(args, event_queue, ready_event=None):
+    """Run the main processing in a child process, forwarding events to the TUI."""
+    from tui.event_bus import Events, event_bus
+    event_bus.set_forward_queue(event_queue)
 
-def run_processing(args):
-    """Run the main processing in a background thread."""
-    # Import main after we're in the thread to avoid issues
+    # Import main in the child; the TUI process never needs it
     import main as main_module
 
-    # Temporarily replace sys.argv with our args
-    old_argv = sys.argv
     sys.argv = ['main.py'] + args
 
     try:
+        # Wait for the TUI to mount instead of guessing with a sleep
+        if ready_event is not None:
+            ready_event.wait(timeout=5)
         main_module.main()
     finally:
-        sys.argv = old_argv
+        event_bus.emit(Events.PROCESSING_DONE, {})
+        event_queue.put(None)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -33,28 +35,38 @@ if __name__ == "__main__":
 
     # Check if TUI should be disabled
     if "--no-tui" in sys.argv:
-        # Just run main.py directly
+        # Just run main.py directly (main.py doesn't know --no-tui)
+        sys.argv.remove("--no-tui")
         import main
         main.main()
     else:
-        # Start processing in background thread
+        # Import the TUI only when it is used
+        from tui.app import TUIManager
+        from tui.event_bus import start_queue_bridge
+
+        # spawn: the child starts clean, without inherited torch/CUDA or TUI state
+        mp_context = multiprocessing.get_context("spawn")
+        event_queue = mp_context.Queue()
+
+        # Create the TUI first so the processing process can wait for it to mount
+        tui_manager = TUIManager(ready_event=mp_context.Event())
+
+        # Start processing in a child process
         args = sys.argv[1:]
-        processing_thread = threading.Thread(
+        processing = mp_context.Process(
             target=run_processing,
-            args=(args,),
+            args=(args, event_queue, tui_manager.ready_event),
             daemon=True
         )
 
-        # Create and run TUI in main thread
         print("Starting TUI...")
-        import time
-        time.sleep(0.5)  # Give imports time
-
-        processing_thread.start()
+        processing.start()
+        start_queue_bridge(event_queue, processing)
 
         # Run TUI (this will block until quit)
-        tui_manager = TUIManager()
         tui_manager.run()
 
-        # Wait for processing to finish
-        processing_thread.join(timeout=5)
+        # Wait for processing to finish, then stop it
+        processing.join(timeout=5)
+        if processing.is_alive():
+            processing.terminate()
@@ -140,6 +140,8 @@ GPT_MODEL=gpt-4o-mini              # GPT model for translation/correction
 TRANSLATION_BATCH_MINUTES=5        # Group segments by time window
 MAX_SEGMENTS_PER_BATCH=60          # Max segments per translation batch
 GOOGLE_BUNDLE_SIZE=100             # Lines per Google API call
+GOOGLE_WORKERS=8                   # Google bundles sent concurrently per batch
+GOOGLE_REQUESTS_PER_SECOND=10      # Rate limit for all Google requests
 
 # Correction Settings
 ENABLE_CORRECTION=false            # Enable GPT-4 correction by default
@@ -0,0 +1,28 @@
+"""
+Processing modules for the subtitle generator.
+
+Submodules are loaded on first attribute access (PEP 562), so `import src`
+is free and e.g. `src.transcribe_local` only pulls in faster-whisper when a
+local run actually uses it.
+"""
+
+import importlib
+
+__all__ = [
+    "chunk_audio",
+    "extract_audio",
+    "merge_srt",
+    "transcribe",
+    "transcribe_local",
+    "translate_google",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(__all__)
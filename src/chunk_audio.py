@@ -3,16 +3,120 @@ Audio chunking module using ffmpeg.
 Splits audio files into chunks for parallel processing.
 """
 
+import io
+import os
+import math
+import wave
+import functools
+import tempfile
+import threading
 import subprocess
-from typing import List, Dict
-from tqdm import tqdm
-from utils import logger, ensure_directory
-from config import CHUNK_DURATION_MS
+from typing import List, Dict, Optional
+from utils import logger, ensure_directory, json_loads, json_dumps, write_bytes_atomic, make_cache_dir, AUDIO_CACHE_DIR
+from config import CHUNK_DURATION_MS, AUDIO_SETTINGS, FFMPEG_COMMAND, WHISPER_RPM, UPLOAD_FORMAT
+
+
+# Whisper API uploads are capped at 25 MB; 16kHz mono s16le is 32 kB/s (~13 min)
+MAX_CHUNK_DURATION_SEC = 600
+
+
+def chunk_duration_for(total_duration_sec: Optional[float]) -> float:
+    """
+    Pick the chunk length for a file of the given duration.
+
+    Short files keep CHUNK_DURATION_MS so chunks transcribe in parallel. Long
+    files get longer chunks so the whole file needs at most WHISPER_RPM
+    requests (one minute of rate limit) instead of queueing behind it; every
+    request carries a fixed round-trip cost, so fewer, larger uploads finish
+    sooner once the rate limit is the bottleneck.
+
+    Args:
+        total_duration_sec: Audio duration in seconds (None if unknown)
+
+    Returns:
+        Chunk duration in seconds
+    """
+    base = CHUNK_DURATION_MS / 1000.0
+    if not total_duration_sec:
+        return base
+    return min(MAX_CHUNK_DURATION_SEC, max(base, math.ceil(total_duration_sec / WHISPER_RPM)))
+
+
+def _wav_header_info(audio_path: str) -> Optional[Dict[str, any]]:
+    """
+    Read duration and format from a PCM WAV header, without spawning ffprobe.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Same dictionary as _audio_stream_info(), or None if the file isn't a
+        PCM WAV the wave module can read
+    """
+    with open(audio_path, "rb") as f:
+        if f.read(4) != b"RIFF":
+            return None
+
+    try:
+        with wave.open(audio_path, "rb") as w:
+            if w.getsampwidth() != 2:
+                return None
+            return {
+                "duration": w.getnframes() / float(w.getframerate()),
+                "codec_name": "pcm_s16le",
+                "sample_rate": w.getframerate(),
+                "channels": w.getnchannels(),
+            }
+    except (wave.Error, EOFError):
+        # e.g. WAVE_FORMAT_EXTENSIBLE or float samples
+        return None
+
+
+# ffprobe durations of non-WAV inputs, keyed by path, size and mtime
+DURATION_CACHE_PATH = AUDIO_CACHE_DIR / "durations.json"
+DURATION_CACHE_MAX_ENTRIES = 1000
+_durations_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_durations() -> Dict[str, float]:
+    """The duration cache, loaded from DURATION_CACHE_PATH on first use (empty if missing or unreadable)."""
+    try:
+        durations = json_loads(DURATION_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return durations if isinstance(durations, dict) else {}
+
+
+def _remember_duration(cache_key: str, duration: float) -> None:
+    """
+    Add a probed duration and write the cache back (best effort).
+
+    Entries for files that no longer exist are dropped, then the oldest
+    beyond DURATION_CACHE_MAX_ENTRIES, so the file stays small.
+    """
+    with _durations_lock:
+        durations = _load_durations()
+        durations[cache_key] = duration
+        for key in list(durations):
+            if not os.path.exists(key.rsplit("|", 2)[0]):
+                del durations[key]
+        # Dicts keep insertion order: drop the oldest entries beyond the limit
+        for key in list(durations)[:max(0, len(durations) - DURATION_CACHE_MAX_ENTRIES)]:
+            del durations[key]
+        try:
+            make_cache_dir(AUDIO_CACHE_DIR)
+            write_bytes_atomic(DURATION_CACHE_PATH, json_dumps(durations))
+        except OSError as e:
+            logger.debug(f"Could not write duration cache: {e}")
 
 
 def get_audio_duration(audio_path: str) -> float:
     """
-    Get the duration of an audio file in seconds using ffprobe.
+    Get the duration of an audio file in seconds.
+
+    Read from the header for PCM WAVs (what extract_audio() writes), otherwise
+    with ffprobe.
 
     Args:
         audio_path: Path to the audio file
@@ -20,6 +124,17 @@ def get_audio_duration(audio_path: str) -> float:
     Returns:
         Duration in seconds
     """
+    header = _wav_header_info(audio_path)
+    if header is not None:
+        return header["duration"]
+
+    # Probed before (same path, size and mtime): skip ffprobe
+    stat = os.stat(audio_path)
+    cache_key = f"{os.path.abspath(audio_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    cached = _load_durations().get(cache_key)
+    if cached is not None:
+        return cached
+
     command = [
         "ffprobe",
         "-v", "error",
@@ -29,88 +144,219 @@ def get_audio_duration(audio_path: str) -> float:
     ]
 
     result = subprocess.run(command, capture_output=True, text=True, check=True)
-    return float(result.stdout.strip())
+    duration = float(result.stdout.strip())
 
+    _remember_duration(cache_key, duration)
+    return duration
 
-def chunk_audio(audio_path: str) -> List[Dict[str, any]]:
+
+def _audio_stream_info(audio_path: str) -> Dict[str, any]:
+    """
+    Probe duration and audio stream format (WAV header, else one ffprobe call).
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Dictionary with duration (seconds), codec_name, sample_rate and channels
+    """
+    header = _wav_header_info(audio_path)
+    if header is not None:
+        return header
+
+    command = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "format=duration:stream=codec_name,sample_rate,channels",
+        "-of", "json",
+        audio_path
+    ]
+
+    result = subprocess.run(command, capture_output=True, check=True)
+    probe = json_loads(result.stdout)
+    stream = (probe.get("streams") or [{}])[0]
+    return {
+        "duration": float(probe["format"]["duration"]),
+        "codec_name": stream.get("codec_name"),
+        "sample_rate": int(stream.get("sample_rate") or 0),
+        "channels": stream.get("channels"),
+    }
+
+
+def _stream_segments(command: List[str], output_dir: str):
+    """
+    Run an ffmpeg segment-muxer command and yield each chunk as it is closed.
+
+    The command must write its segment list as CSV to stdout
+    (-segment_list pipe:1 -segment_list_type csv).
+
+    Args:
+        command: ffmpeg argument list
+        output_dir: Directory the segments are written to
+
+    Yields:
+        Dictionary with chunk_path and offset_seconds
+
+    Raises:
+        RuntimeError: If ffmpeg fails or reports corrupt audio
+    """
+    from src.extract_audio import CRITICAL_ERRORS, _ffmpeg_not_found, _priority_prefix
+
+    # stderr goes to a file, not a pipe: nothing reads it until stdout ends, and
+    # ffmpeg would block once a pipe buffer of warnings filled up
+    stderr_file = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen([*_priority_prefix(background=False), *command],
+                                   stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+    except FileNotFoundError:
+        stderr_file.close()
+        raise _ffmpeg_not_found()
+
+    try:
+        # One CSV line per finished segment: "chunk_00000.wav,0.000000,80.000000"
+        for line in process.stdout:
+            name, start, _ = line.strip().rsplit(",", 2)
+            yield {
+                "chunk_path": os.path.join(output_dir, name),
+                "offset_seconds": float(start)
+            }
+
+        returncode = process.wait()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode(errors="replace")
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.strip()}")
+        for error in CRITICAL_ERRORS:
+            if error in stderr:
+                raise RuntimeError(f"Corrupt audio stream: {error}")
+    finally:
+        # Consumer stopped early or ffmpeg errored: don't leave it running
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr_file.close()
+
+
+def _segment_args(chunk_duration_sec: float, output_dir: str) -> List[str]:
+    """
+    ffmpeg output arguments: convert to the upload format and cut with the
+    segment muxer, with the segment list on stdout.
+
+    UPLOAD_FORMAT=opus encodes 16 kb/s Ogg Opus chunks instead of PCM WAV,
+    which Whisper accepts at a fraction of the upload size.
+    """
+    if UPLOAD_FORMAT == "opus":
+        codec_args = ["-c:a", "libopus", "-b:a", "16k", "-application", "voip", "-vbr", "on"]
+        extension = "ogg"
+    else:
+        codec_args = ["-acodec", AUDIO_SETTINGS["codec"]]
+        extension = "wav"
+
+    return [
+        *codec_args,
+        "-ar", str(AUDIO_SETTINGS["sample_rate"]),
+        "-ac", str(AUDIO_SETTINGS["channels"]),
+        "-f", "segment",
+        "-segment_time", str(chunk_duration_sec),
+        "-segment_list", "pipe:1",
+        "-segment_list_type", "csv",
+        "-reset_timestamps", "1",
+        os.path.join(output_dir, f"chunk_%05d.{extension}"),
+        "-y"
+    ]
+
+
+def _slice_wav(audio_path: str, chunk_duration_sec: float):
+    """
+    Cut a PCM WAV into in-memory WAV chunks, without ffmpeg or chunk files.
+
+    Args:
+        audio_path: Path to the PCM WAV file
+        chunk_duration_sec: Chunk length in seconds
+
+    Yields:
+        Dictionary with audio_bytes (a complete WAV file) and offset_seconds
+    """
+    with wave.open(audio_path, "rb") as source:
+        params = source.getparams()
+        frames_per_chunk = int(chunk_duration_sec * params.framerate)
+        offset_frames = 0
+
+        while True:
+            frames = source.readframes(frames_per_chunk)
+            if not frames:
+                break
+
+            buf = io.BytesIO()
+            with wave.open(buf, "wb") as chunk:
+                chunk.setparams(params)
+                chunk.writeframes(frames)
+
+            yield {
+                "audio_bytes": buf.getvalue(),
+                "offset_seconds": offset_frames / params.framerate
+            }
+            offset_frames += len(frames) // (params.sampwidth * params.nchannels)
+
+
+def chunk_audio(audio_path: str, output_dir: str = "audio") -> List[Dict[str, any]]:
     """
     Split audio file into chunks of specified duration using ffmpeg.
     Returns generator that yields chunks as they are created.
 
+    Input that is already a 16kHz mono s16le WAV (as written by extract_audio())
+    is sliced in memory: each chunk is yielded as WAV bytes, so nothing is
+    written to and read back from disk. Anything else, or any input with
+    UPLOAD_FORMAT=opus, is converted and cut by a single ffmpeg segment-muxer
+    process into chunk files.
+
     Args:
         audio_path: Path to the WAV audio file
+        output_dir: Directory for the chunk files (default: ./audio)
 
     Yields:
-        Dictionary with chunk information:
+        Dictionary with chunk information, either
         {
-            "chunk_path": "audio/chunk_0.wav",
+            "audio_bytes": b"RIFF...",
+            "offset_seconds": 0.0
+        }
+        or
+        {
+            "chunk_path": "audio/chunk_00000.wav",
             "offset_seconds": 0.0
         }
     """
     logger.info(f"Loading audio file: {audio_path}")
 
-    # Get audio duration
-    total_duration_sec = get_audio_duration(audio_path)
+    # Get audio duration and format
+    info = _audio_stream_info(audio_path)
+    total_duration_sec = info["duration"]
     logger.info(f"Audio duration: {total_duration_sec:.2f} seconds")
 
-    # Ensure audio directory exists
-    ensure_directory("audio")
+    # Ensure output directory exists
+    ensure_directory(output_dir)
 
-    chunk_duration_sec = CHUNK_DURATION_MS / 1000.0
+    chunk_duration_sec = chunk_duration_for(total_duration_sec)
 
     # Calculate total number of chunks
     total_chunks = int((total_duration_sec + chunk_duration_sec - 1) // chunk_duration_sec)
-    logger.info(f"Will create {total_chunks} chunks (streaming to transcription as created)")
-
-    chunk_start_sec = 0.0
-
-    # Split audio into chunks using ffmpeg - yield each chunk immediately
-    while chunk_start_sec < total_duration_sec:
-        # Calculate chunk duration (or use remaining audio if less than chunk size)
-        current_chunk_duration = min(chunk_duration_sec, total_duration_sec - chunk_start_sec)
-
-        # Create chunk filename
-        chunk_path = f"audio/chunk_{int(chunk_start_sec * 1000)}.wav"
-
-        # Use ffmpeg to extract chunk with re-encoding to ensure compatibility
-        command = [
-            "ffmpeg",
-            "-i", audio_path,
-            "-ss", str(chunk_start_sec),
-            "-t", str(current_chunk_duration),
-            "-acodec", "pcm_s16le",
-            "-ar", "16000",
-            "-ac", "1",
-            chunk_path,
-            "-y"
-        ]
-
-        subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
-
-        # Yield chunk info immediately for transcription
-        yield {
-            "chunk_path": chunk_path,
-            "offset_seconds": chunk_start_sec
-        }
-
-        chunk_start_sec += chunk_duration_sec
+    logger.info(f"Will create {total_chunks} chunks of {chunk_duration_sec:.0f}s (streaming to transcription as created)")
 
+    # Already in the upload format: slice in memory; otherwise convert while cutting
+    if (UPLOAD_FORMAT != "opus"
+            and info["codec_name"] == AUDIO_SETTINGS["codec"]
+            and info["sample_rate"] == AUDIO_SETTINGS["sample_rate"]
+            and info["channels"] == AUDIO_SETTINGS["channels"]):
+        yield from _slice_wav(audio_path, chunk_duration_sec)
+        return
 
-def cleanup_chunks(chunks_info: List[Dict[str, any]]) -> None:
-    """
-    Delete all chunk files after processing.
-
-    Args:
-        chunks_info: List of chunk information dictionaries
-    """
-    from utils import cleanup_files
+    command = [
+        *FFMPEG_COMMAND,
+        "-i", audio_path,
+        "-vn",
+        *_segment_args(chunk_duration_sec, output_dir)
+    ]
 
-    chunk_paths = [chunk["chunk_path"] for chunk in chunks_info]
-    logger.info(f"Cleaning up {len(chunk_paths)} chunk files...")
-    cleanup_files(*chunk_paths)
-    logger.info("Chunk cleanup complete")
+    yield from _stream_segments(command, output_dir)
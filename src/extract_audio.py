@@ -3,34 +3,120 @@ Audio extraction module using ffmpeg.
 Extracts audio from video files and converts to the required format.
 """
 
+import os
+import shutil
+import asyncio
 import subprocess
+import functools
 from pathlib import Path
-from utils import logger, ensure_directory, get_basename
-from config import AUDIO_SETTINGS
+from typing import List, Optional
+from utils import (
+    logger, ensure_directory, get_basename,
+    video_fingerprint, restore_cached_audio, store_cached_audio,
+)
+from config import AUDIO_SETTINGS, FFMPEG_COMMAND
 
 
-def extract_audio(video_path: Path) -> str:
+# stderr messages that mean the audio is corrupt even when ffmpeg exits 0
+CRITICAL_ERRORS = (
+    "Conversion failed",
+    "Error while filtering",
+    "Failed to inject frame into filter network",
+    "Rematrix is needed between",
+)
+
+
+# Niceness for background (prefetch) extractions, so they yield CPU to the
+# video currently being transcribed/translated
+BACKGROUND_NICENESS = 10
+
+
+@functools.lru_cache(maxsize=1)
+def _background_prefix() -> tuple:
     """
-    Extract audio from video file using ffmpeg.
+    Command prefix for background processes: lower CPU priority (nice) and
+    the idle I/O class (ionice), with whichever of the two exist.
 
-    Args:
-        video_path: Path object of the video file
+    A command prefix rather than a preexec_fn, which isn't safe to use while
+    other threads are running.
+    """
+    prefix = ()
+    nice = shutil.which("nice")
+    if nice:
+        prefix += (nice, "-n", str(BACKGROUND_NICENESS))
+    ionice = shutil.which("ionice")
+    if ionice:
+        prefix += (ionice, "-c", "3")
+    return prefix
 
-    Returns:
-        Path to the extracted WAV audio file
 
-    Raises:
-        RuntimeError: If ffmpeg extraction fails
+# Linux hybrid CPUs (Intel P/E cores) list their performance cores here
+PERFORMANCE_CPUS_PATH = "/sys/devices/cpu_core/cpus"
+
+
+def _parse_cpu_list(cpu_list: str) -> set:
+    """Parse a kernel CPU list such as "0-7,16-19" into a set of CPU ids."""
+    cpus = set()
+    for part in cpu_list.strip().split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+
+@functools.lru_cache(maxsize=1)
+def _performance_cores() -> Optional[frozenset]:
     """
-    # Ensure audio directory exists
-    ensure_directory("audio")
+    Performance cores this process may run on, or None when not applicable.
 
-    # Create output path
-    basename = get_basename(video_path)
-    output_path = f"audio/{basename}.wav"
+    None on non-Linux systems, CPUs without a P/E split, or if the allowed
+    CPU set contains no performance cores.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return None
+    try:
+        with open(PERFORMANCE_CPUS_PATH) as f:
+            cores = _parse_cpu_list(f.read()) & os.sched_getaffinity(0)
+    except (OSError, ValueError):
+        return None
+    return frozenset(cores) or None
 
-    logger.info(f"Extracting audio from: {video_path.name}")
 
+def _priority_prefix(background: bool) -> tuple:
+    """
+    Command prefix setting an ffmpeg process's priority (empty where unsupported).
+
+    Background (prefetch) processes run at lower priority. Foreground ones,
+    which the current video waits on, are pinned to the performance cores on
+    hybrid CPUs with taskset, so decoding doesn't land on efficiency cores;
+    the Python process itself (API requests, mostly waiting) stays unpinned.
+    """
+    if background:
+        return _background_prefix()
+    cores = _performance_cores()
+    taskset = shutil.which("taskset")
+    if cores and taskset:
+        return (taskset, "-c", ",".join(str(core) for core in sorted(cores)))
+    return ()
+
+
+def _build_command(video_path: Path, output_path: str, threads: Optional[int] = None,
+                   background: bool = False) -> List[str]:
+    """
+    Build the ffmpeg extraction command.
+
+    Args:
+        video_path: Path object of the video file
+        output_path: Path of the WAV file to write
+        threads: Limit ffmpeg to this many threads (None = ffmpeg default)
+        background: Run ffmpeg at lower CPU and idle I/O priority (via nice and
+            ionice, where available) instead of pinning it (see _priority_prefix())
+
+    Returns:
+        ffmpeg argument list
+    """
     # Build ffmpeg command
     # -i: input file
     # -vn: no video
@@ -38,8 +124,10 @@ def extract_audio(video_path: Path) -> str:
     # -ar 16000: audio sample rate 16 kHz
     # -ac 1: mono audio (1 channel)
     # -y: overwrite output file if exists
-    command = [
-        "ffmpeg",
+    command = list(_priority_prefix(background)) + list(FFMPEG_COMMAND)
+    if threads:
+        command += ["-threads", str(threads)]
+    command += [
         "-i", str(video_path),
         "-vn",
         "-acodec", AUDIO_SETTINGS["codec"],
@@ -48,42 +136,200 @@ def extract_audio(video_path: Path) -> str:
         output_path,
         "-y"
     ]
+    return command
+
+
+def _check_stderr(stderr: bytes, output_path: str) -> None:
+    """
+    Check ffmpeg stderr for critical errors (ffmpeg may exit 0 despite corrupt audio).
+
+    Raises:
+        RuntimeError: If a critical error is found (partial output is removed)
+    """
+    stderr_output = stderr.decode() if stderr else ""
+    for error in CRITICAL_ERRORS:
+        if error in stderr_output:
+            logger.error(f"ffmpeg extraction failed (corrupt audio): {error}")
+            # Clean up partial output file
+            if Path(output_path).exists():
+                Path(output_path).unlink()
+            raise RuntimeError(f"Corrupt audio stream: {error}")
+
+
+def _check_result(returncode: int, stderr: bytes, output_path: str) -> None:
+    """
+    Check a finished ffmpeg extraction (shared by the sync and async paths).
+
+    Raises:
+        RuntimeError: If ffmpeg failed or reported corrupt audio
+    """
+    if returncode != 0:
+        error_msg = stderr.decode() if stderr else f"exit code {returncode}"
+        logger.error(f"ffmpeg extraction failed: {error_msg}")
+        raise RuntimeError(f"Failed to extract audio from video: {error_msg}")
+    _check_stderr(stderr, output_path)
+
+
+def _ffmpeg_not_found() -> RuntimeError:
+    """Error raised when the ffmpeg binary can't be started."""
+    return RuntimeError(
+        "ffmpeg not found. Please install ffmpeg: "
+        "https://ffmpeg.org/download.html"
+    )
+
+
+def _audio_cache_key(video_path: Path) -> Optional[str]:
+    """Audio cache key for a video, or None if it can't be read (ffmpeg reports why)."""
+    try:
+        return video_fingerprint(video_path)
+    except OSError:
+        return None
+
+
+def _output_path(video_path: Path, output_dir: Optional[str] = None) -> str:
+    """Return the WAV path for a video, creating the output directory if needed."""
+    output_dir = output_dir or "audio"
+    ensure_directory(output_dir)
+    return os.path.join(output_dir, f"{get_basename(video_path)}.wav")
+
+
+def extract_audio(video_path: Path, output_dir: Optional[str] = None,
+                  background: bool = False) -> str:
+    """
+    Extract audio from video file using ffmpeg.
+
+    Args:
+        video_path: Path object of the video file
+        output_dir: Directory for the WAV file (default: ./audio)
+        background: Prefetching ahead of the current video: run ffmpeg at
+            lower CPU and I/O priority so it doesn't slow the foreground work
+
+    Returns:
+        Path to the extracted WAV audio file
+
+    Raises:
+        RuntimeError: If ffmpeg extraction fails
+    """
+    output_path = _output_path(video_path, output_dir)
+
+    # Reuse the WAV from an earlier run on the same video
+    cache_key = _audio_cache_key(video_path)
+    if cache_key and restore_cached_audio(cache_key, output_path):
+        logger.info(f"Reusing cached audio for: {video_path.name}")
+        return output_path
+
+    logger.info(f"Extracting audio from: {video_path.name}")
 
     try:
         # Run ffmpeg command
         result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
+            _build_command(video_path, output_path, background=background),
+            stdout=subprocess.DEVNULL,  # ffmpeg writes the WAV to a file; stdout is unused
+            stderr=subprocess.PIPE
         )
+    except FileNotFoundError:
+        raise _ffmpeg_not_found()
+
+    _check_result(result.returncode, result.stderr, output_path)
+    if cache_key:
+        store_cached_audio(cache_key, output_path)
+
+    logger.info(f"Audio extracted successfully: {output_path}")
+    return output_path
+
+
+async def extract_audio_async(video_path: Path, threads: Optional[int] = None,
+                              output_dir: Optional[str] = None, background: bool = False) -> str:
+    """
+    Extract audio from video file using an asyncio subprocess.
+
+    Lets one event loop drive several ffmpeg processes at once instead of
+    blocking a thread per extraction.
+
+    Args:
+        video_path: Path object of the video file
+        threads: Limit ffmpeg to this many threads (use 1 when running several at once)
+        output_dir: Directory for the WAV file (default: ./audio)
+        background: Run ffmpeg at lower CPU and I/O priority (see extract_audio())
+
+    Returns:
+        Path to the extracted WAV audio file
+
+    Raises:
+        RuntimeError: If ffmpeg extraction fails
+    """
+    output_path = _output_path(video_path, output_dir)
 
-        # Check stderr for critical errors (ffmpeg may exit 0 despite corrupt audio)
-        stderr_output = result.stderr.decode() if result.stderr else ""
-        critical_errors = [
-            "Conversion failed",
-            "Error while filtering",
-            "Failed to inject frame into filter network",
-            "Rematrix is needed between",
-        ]
-        for error in critical_errors:
-            if error in stderr_output:
-                logger.error(f"ffmpeg extraction failed (corrupt audio): {error}")
-                # Clean up partial output file
-                if Path(output_path).exists():
-                    Path(output_path).unlink()
-                raise RuntimeError(f"Corrupt audio stream: {error}")
-
-        logger.info(f"Audio extracted successfully: {output_path}")
+    # Reuse the WAV from an earlier run on the same video
+    cache_key = await asyncio.to_thread(_audio_cache_key, video_path)
+    if cache_key and await asyncio.to_thread(restore_cached_audio, cache_key, output_path):
+        logger.info(f"Reusing cached audio for: {video_path.name}")
         return output_path
 
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr.decode() if e.stderr else str(e)
-        logger.error(f"ffmpeg extraction failed: {error_msg}")
-        raise RuntimeError(f"Failed to extract audio from video: {error_msg}")
+    logger.info(f"Extracting audio from: {video_path.name}")
 
-    except FileNotFoundError:
-        raise RuntimeError(
-            "ffmpeg not found. Please install ffmpeg: "
-            "https://ffmpeg.org/download.html"
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_build_command(video_path, output_path, threads, background),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
         )
+    except FileNotFoundError:
+        raise _ffmpeg_not_found()
+
+    try:
+        _, stderr = await process.communicate()
+    except BaseException:
+        # Cancelled (e.g. folder run stopped): don't leave ffmpeg running
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    _check_result(process.returncode, stderr, output_path)
+    if cache_key:
+        await asyncio.to_thread(store_cached_audio, cache_key, output_path)
+
+    logger.info(f"Audio extracted successfully: {output_path}")
+    return output_path
+
+
+def extract_and_chunk(video_path, output_dir: str = "audio"):
+    """
+    Extract audio from a video straight into chunk files with one ffmpeg process.
+
+    Uses ffmpeg's segment muxer instead of extract_audio() + chunk_audio(), so
+    the source is read once and no whole-file WAV is written. Segment names
+    are reported on stdout (segment_list pipe:1) as each chunk is closed, and
+    yielded immediately so transcription starts while extraction continues.
+
+    Args:
+        video_path: Path to the video file
+        output_dir: Directory for the chunk files (default: ./audio)
+
+    Yields:
+        Dictionary with chunk information (same format as chunk_audio())
+
+    Raises:
+        RuntimeError: If ffmpeg fails or reports corrupt audio
+    """
+    from src.chunk_audio import _segment_args, _stream_segments, chunk_duration_for, get_audio_duration
+
+    ensure_directory(output_dir)
+
+    # Size chunks from the container duration (one ffprobe); fall back to the default
+    try:
+        total_duration_sec = get_audio_duration(str(video_path))
+    except (subprocess.CalledProcessError, ValueError, OSError):
+        total_duration_sec = None
+    chunk_duration_sec = chunk_duration_for(total_duration_sec)
+
+    command = [
+        *FFMPEG_COMMAND,
+        "-i", str(video_path),
+        "-vn",
+        *_segment_args(chunk_duration_sec, output_dir)
+    ]
+
+    logger.info(f"Extracting and chunking audio in one pass ({chunk_duration_sec:.0f}s chunks)")
+
+    yield from _stream_segments(command, output_dir)
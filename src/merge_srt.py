@@ -3,9 +3,20 @@ SRT subtitle file generation module.
 Formats transcription segments into proper SRT format.
 """
 
-from typing import List, Dict
+import os
+import re
+import mmap
+import shutil
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Optional, Sequence
 from pathlib import Path
-from utils import logger, ensure_directory, format_timestamp_srt, get_basename
+from utils import logger, ensure_directory, format_timestamp_srt, get_basename, make_cache_dir, SUBTITLE_CACHE_DIR
+
+# SRT block header: sequence number line + "00:00:05,120 --> 00:00:07,900" line
+_SRT_HEADER_RE = re.compile(
+    rb"(?m)^(?:\xef\xbb\xbf)?\d+\r?\n(\d+):(\d+):(\d+),(\d+) --> (\d+):(\d+):(\d+),(\d+)[^\n]*\n"
+)
 
 
 def create_srt(segments: List[Dict[str, any]], output_path: str) -> None:
@@ -17,32 +28,26 @@ def create_srt(segments: List[Dict[str, any]], output_path: str) -> None:
         output_path: Path where the SRT file will be saved
     """
     # Sort segments by start time (should already be sorted, but ensure)
-    segments.sort(key=lambda x: x["start"])
+    segments.sort(key=itemgetter("start"))
 
     logger.info(f"Generating SRT file with {len(segments)} segments")
 
-    # Build SRT content
-    srt_content = []
-
-    for index, segment in enumerate(segments, start=1):
-        start_time = format_timestamp_srt(segment["start"])
-        end_time = format_timestamp_srt(segment["end"])
-        text = segment["text"]
-
-        # SRT format:
-        # 1
-        # 00:00:05,120 --> 00:00:07,900
-        # Translated text here
-        #
-        srt_block = f"{index}\n{start_time} --> {end_time}\n{text}\n"
-        srt_content.append(srt_block)
-
-    # Join all blocks with blank line separator
-    final_srt = "\n".join(srt_content)
-
-    # Write to file with UTF-8 encoding
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(final_srt)
+    # Stream SRT blocks straight into the buffered file, without building
+    # the whole file (or a list of all blocks) in memory first
+    # SRT format:
+    # 1
+    # 00:00:05,120 --> 00:00:07,900
+    # Translated text here
+    # (blank line)
+    fmt = format_timestamp_srt
+    srt_blocks = (
+        f"{index}\n{fmt(segment['start'])} --> {fmt(segment['end'])}\n{segment['text']}\n\n"
+        for index, segment in enumerate(segments, start=1)
+    )
+
+    # Write to file with UTF-8 encoding (newline="": same bytes on every platform)
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        f.writelines(srt_blocks)
 
     logger.info(f"SRT file created successfully: {output_path}")
 
@@ -71,13 +76,16 @@ def save_subtitles(segments: List[Dict[str, any]], video_path: Path) -> str:
     return str(output_path)
 
 
-def save_japanese_srt(segments: List[Dict[str, any]], video_path: Path) -> str:
+def save_japanese_srt(segments: List[Dict[str, any]], video_path: Path,
+                      cache_keys: Sequence[str] = ()) -> str:
     """
     Save Japanese transcription segments as .ja.srt file for caching.
 
     Args:
         segments: List of Japanese transcription segments
         video_path: Path object of the original video file
+        cache_keys: Content fingerprints to also store the file under in
+            SUBTITLE_CACHE_DIR (see utils.video_fingerprint/audio_fingerprint)
 
     Returns:
         Path to the created Japanese SRT file
@@ -93,71 +101,106 @@ def save_japanese_srt(segments: List[Dict[str, any]], video_path: Path) -> str:
     create_srt(segments, str(output_path))
 
     logger.info(f"Japanese subtitles cached: {output_path}")
+
+    # Copy into the content-addressed cache (best effort)
+    if cache_keys:
+        try:
+            make_cache_dir(SUBTITLE_CACHE_DIR)
+            for key in cache_keys:
+                shutil.copyfile(output_path, SUBTITLE_CACHE_DIR / f"{key}.srt")
+        except OSError as e:
+            logger.warning(f"Could not write subtitle cache: {e}")
+
     return str(output_path)
 
 
-def load_japanese_srt(video_path: Path) -> List[Dict[str, any]]:
+def _parse_srt(srt_path: Path) -> Optional[List[Dict[str, any]]]:
     """
-    Load cached Japanese subtitles from .ja.srt file.
+    Parse an SRT file into segment dictionaries.
 
     Args:
-        video_path: Path object of the original video file
+        srt_path: Path to the SRT file
 
     Returns:
-        List of segment dictionaries, or None if file doesn't exist
+        List of segment dictionaries, or None on error
     """
-    # Get the directory of the input video
-    video_directory = video_path.parent
-
-    # Check for .ja.srt file
-    basename = get_basename(video_path)
-    ja_srt_path = video_directory / f"{basename}.ja.srt"
-
-    if not ja_srt_path.exists():
-        return None
-
-    logger.info(f"Found cached Japanese subtitles: {ja_srt_path}")
-
-    # Parse SRT file
+    # Parse SRT file: scan the mapped bytes for block headers with one
+    # precompiled regex; the text of a block runs until the next header
     segments = []
     try:
-        with open(ja_srt_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Split by double newlines to get blocks
-        blocks = content.strip().split("\n\n")
-
-        for block in blocks:
-            lines = block.strip().split("\n")
-            if len(lines) >= 3:
-                # Line 0: sequence number (ignore)
-                # Line 1: timestamps
-                # Line 2+: text
-                timestamp_line = lines[1]
-                text = "\n".join(lines[2:])
-
-                # Parse timestamps: "00:00:05,120 --> 00:00:07,900"
-                if " --> " in timestamp_line:
-                    start_str, end_str = timestamp_line.split(" --> ")
-
-                    # Convert SRT timestamp to seconds
-                    def srt_to_seconds(srt_time):
-                        hours, minutes, rest = srt_time.split(":")
-                        seconds, milliseconds = rest.split(",")
-                        return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(milliseconds) / 1000.0
-
-                    start = srt_to_seconds(start_str)
-                    end = srt_to_seconds(end_str)
-
-                    segments.append({
-                        "start": start,
-                        "end": end,
-                        "text": text
-                    })
+        if srt_path.stat().st_size == 0:
+            return segments
+
+        fd = os.open(srt_path, os.O_RDONLY)
+        try:
+            buf = mmap.mmap(fd, 0, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+
+        with buf:
+            headers = list(_SRT_HEADER_RE.finditer(buf))
+            # Convert every timestamp field of the file in one map() call
+            fields = list(map(int, chain.from_iterable(match.groups() for match in headers)))
+            # Each block's text runs from its header to the next header
+            text_ends = [match.start() for match in headers[1:]] + [len(buf)]
+
+            for i, (match, text_end) in enumerate(zip(headers, text_ends)):
+                text = buf[match.end():text_end].decode("utf-8").strip().replace("\r\n", "\n")
+                if not text:
+                    continue
+
+                h1, m1, s1, ms1, h2, m2, s2, ms2 = fields[i * 8:i * 8 + 8]
+                segments.append({
+                    "start": h1 * 3600 + m1 * 60 + s1 + ms1 / 1000.0,
+                    "end": h2 * 3600 + m2 * 60 + s2 + ms2 / 1000.0,
+                    "text": text
+                })
 
-        logger.info(f"Loaded {len(segments)} segments from cached Japanese subtitles")
         return segments
 
     except Exception as e:
         logger.error(f"Failed to load Japanese SRT file: {e}")
         return None
+
+
+def find_japanese_srt(video_path: Path, cache_keys: Sequence[str] = ()) -> Optional[Path]:
+    """
+    Find cached Japanese subtitles for a video without loading them.
+
+    Args:
+        video_path: Path object of the original video file
+        cache_keys: Content fingerprints to look up in SUBTITLE_CACHE_DIR, in order
+
+    Returns:
+        Path of the .ja.srt next to the video or the first cached match, or None
+    """
+    candidates = [video_path.parent / f"{get_basename(video_path)}.ja.srt"]
+    candidates += [SUBTITLE_CACHE_DIR / f"{key}.srt" for key in cache_keys]
+    return next((path for path in candidates if path.exists()), None)
+
+
+def load_japanese_srt(video_path: Path, cache_keys: Sequence[str] = ()) -> List[Dict[str, any]]:
+    """
+    Load cached Japanese subtitles from .ja.srt file.
+
+    Falls back to the content-addressed cache when there is no .ja.srt next
+    to the video.
+
+    Args:
+        video_path: Path object of the original video file
+        cache_keys: Content fingerprints to look up in SUBTITLE_CACHE_DIR, in order
+
+    Returns:
+        List of segment dictionaries, or None if file doesn't exist
+    """
+    # Check for .ja.srt file, then the fingerprint cache
+    ja_srt_path = find_japanese_srt(video_path, cache_keys)
+    if ja_srt_path is None:
+        return None
+
+    logger.info(f"Found cached Japanese subtitles: {ja_srt_path}")
+
+    segments = _parse_srt(ja_srt_path)
+    if segments is not None:
+        logger.info(f"Loaded {len(segments)} segments from cached Japanese subtitles")
+    return segments
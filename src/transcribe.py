@@ -3,73 +3,169 @@ Parallel transcription module using OpenAI Whisper API.
 Handles concurrent API calls with retry logic and rate limit handling.
 """
 
+import os
+import re
+import json
+import math
+import random
 import time
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
-from utils import logger
-from config import client, WORKERS, TRANSLATION_WORKERS, GPT_MODEL, ENABLE_CORRECTION, TRANSLATION_BATCH_MINUTES, MAX_SEGMENTS_PER_BATCH
+import queue
+import asyncio
+import hashlib
+import functools
+import threading
+import unicodedata
+import statistics
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Dict, Tuple, Sequence, Optional, Union, Literal, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from tqdm_wrapper import tqdm
+from utils import logger, json_loads, json_dumps, write_bytes_atomic, make_cache_dir, CACHE_DIR
+from config import get_client, get_async_client, WORKERS, AUTO_WORKERS, WHISPER_RPM, TRANSLATION_WORKERS, GPT_MODEL, ENABLE_CORRECTION, AGREEMENT_THRESHOLD, TRANSLATION_BATCH_MINUTES, MAX_SEGMENTS_PER_BATCH, GOOGLE_BUNDLE_SIZE
+
+
+def _read_chunk(chunk_path: str) -> bytes:
+    """
+    Read a chunk file in one call, then delete it.
 
+    Retries reuse the returned bytes, so the file isn't needed afterwards;
+    deleting it right away keeps the work dir (often RAM-backed /dev/shm)
+    down to the chunks in flight instead of the whole file's worth.
+    """
+    with open(chunk_path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        data = f.read()
+        if hasattr(os, "posix_fadvise"):
+            # Drop the pages now, even if the file can't be deleted below
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    try:
+        os.unlink(chunk_path)
+    except OSError as e:
+        logger.debug(f"Could not delete {chunk_path}: {e}")
+    return data
+
+
+# Upper bound for the retry backoff of non-rate-limit errors
+MAX_RETRY_DELAY = 60.0
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (retry-after-ms / retry-after headers), if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # retry-after can also be an HTTP date; fall back to backoff
+    return None
+
+
+def _is_rate_limit(error: Optional[Exception]) -> bool:
+    """True for OpenAI 429 (rate limit) errors."""
+    from openai import RateLimitError
+    return isinstance(error, RateLimitError)
+
+
+def _retry_delay(attempt: int, error: Optional[Exception] = None) -> float:
+    """
+    Seconds to wait before retrying after failed attempt number `attempt` (0-based).
 
-def process_chunk(chunk_info: Dict[str, any]) -> List[Dict[str, any]]:
+    Rate limits with a Retry-After header wait that long plus up to a second;
+    without one they wait the exponential backoff times 1-2. Other failures
+    back off exponentially (1s, 2s, 4s, ... up to MAX_RETRY_DELAY). The jitter
+    keeps workers that failed together from retrying in lockstep.
+    """
+    backoff = min(MAX_RETRY_DELAY, 2 ** attempt)
+    if _is_rate_limit(error):
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1)
+        return backoff * (1 + random.random())
+    return backoff + random.random()
+
+
+# Content types for chunk uploads, so the SDK doesn't guess from the file name
+_UPLOAD_CONTENT_TYPES = {".wav": "audio/wav", ".ogg": "audio/ogg"}
+
+
+def _upload_file(name: str, data: bytes) -> Tuple[str, bytes, str]:
+    """(file name, bytes, content type) tuple for a Whisper upload."""
+    return name, data, _UPLOAD_CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream")
+
+
+async def process_chunk_async(client, chunk_info: Dict[str, any], translate: bool = False) -> List[Dict[str, any]]:
     """
     Process a single audio chunk with Whisper API.
     Includes retry logic with exponential backoff.
 
     Args:
-        chunk_info: Dictionary with chunk_path and offset_seconds
+        client: AsyncOpenAI client (from config.get_async_client)
+        chunk_info: Dictionary with chunk_path or audio_bytes, and offset_seconds
+        translate: Use Whisper's direct translation to English instead of transcription
 
     Returns:
         List of transcription segments with adjusted timestamps
     """
-    chunk_path = chunk_info["chunk_path"]
     offset_seconds = chunk_info["offset_seconds"]
 
     max_retries = 3
-    backoff_times = [1, 2, 4]  # Exponential backoff: 1s, 2s, 4s
+
+    if "audio_bytes" in chunk_info:
+        # Sliced in memory by chunk_audio(); drop it from chunk_info so the
+        # bytes are freed once this request finishes
+        audio = _upload_file(f"chunk_{offset_seconds:.0f}.wav", chunk_info.pop("audio_bytes"))
+    else:
+        # Read once (and delete), reuse across retries; off the event loop so
+        # a slow disk doesn't stall the other in-flight uploads
+        chunk_path = chunk_info["chunk_path"]
+        audio = _upload_file(os.path.basename(chunk_path), await asyncio.to_thread(_read_chunk, chunk_path))
 
     for attempt in range(max_retries):
         try:
-            # Open audio file and send to Whisper API for transcription (original language)
-            with open(chunk_path, "rb") as audio_file:
-                response = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="verbose_json"
-                )
+            # Send to Whisper API for transcription (original language) or direct translation to English
+            endpoint = client.audio.translations if translate else client.audio.transcriptions
+            # Raw response: parse the verbose_json body with json_loads (orjson when
+            # installed) instead of building SDK models for every segment
+            response = await endpoint.with_raw_response.create(
+                model="whisper-1",
+                file=audio,
+                response_format="verbose_json"
+            )
+            result = json_loads(response.content)
 
-            # Extract segments from response
+            # Extract segments, adjusting timestamps by the chunk offset
             segments = []
-            if hasattr(response, 'segments') and response.segments:
-                for seg in response.segments:
-                    # Adjust timestamps by chunk offset
-                    # Access attributes directly, not as dictionary
-                    segments.append({
-                        "start": seg.start + offset_seconds,
-                        "end": seg.end + offset_seconds,
-                        "text": seg.text.strip()
-                    })
+            for seg in result.get("segments") or ():
+                segments.append({
+                    "start": seg["start"] + offset_seconds,
+                    "end": seg["end"] + offset_seconds,
+                    "text": seg["text"].strip()
+                })
 
             return segments
 
         except Exception as e:
             error_message = str(e)
 
-            # Check if it's a rate limit error (429)
-            is_rate_limit = "429" in error_message or "rate_limit" in error_message.lower()
-
             if attempt < max_retries - 1:
-                # Calculate backoff time
-                backoff = backoff_times[attempt]
+                # Jittered backoff; rate limits honor Retry-After
+                backoff = _retry_delay(attempt, e)
 
-                if is_rate_limit:
-                    logger.warning(f"[Worker] Retry #{attempt + 1} after rate limit")
+                if _is_rate_limit(e):
+                    logger.warning(f"[Worker] Retry #{attempt + 1} after rate limit (waiting {backoff:.1f}s)")
                 else:
                     logger.warning(
                         f"[Worker] Retry #{attempt + 1} after error: {error_message}"
                     )
 
-                time.sleep(backoff)
+                await asyncio.sleep(backoff)
             else:
                 # Final failure after all retries
                 logger.error(
@@ -81,202 +177,334 @@ def process_chunk(chunk_info: Dict[str, any]) -> List[Dict[str, any]]:
     return []
 
 
-def process_chunk_translate(chunk_info: Dict[str, any]) -> List[Dict[str, any]]:
-    """
-    Process a single audio chunk with Whisper API using direct translation to English.
-    Includes retry logic with exponential backoff.
+# Automatic transcription concurrency (when neither -w nor WORKERS is set):
+# probe with a few requests, then run ceil(requests/sec * median latency)
+# workers so the account's request rate is used but not exceeded
+PROBE_CHUNKS = 3
+MAX_AUTO_WORKERS = 32
+LATENCY_CACHE_PATH = CACHE_DIR / "latency.json"
 
-    Args:
-        chunk_info: Dictionary with chunk_path and offset_seconds
 
-    Returns:
-        List of translated segments (in English) with adjusted timestamps
-    """
-    chunk_path = chunk_info["chunk_path"]
-    offset_seconds = chunk_info["offset_seconds"]
+def _cached_latency(endpoint: str) -> Optional[float]:
+    """Median per-chunk latency measured by an earlier run, or None."""
+    try:
+        return float(json_loads(LATENCY_CACHE_PATH.read_bytes())[endpoint])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
-    max_retries = 3
-    backoff_times = [1, 2, 4]  # Exponential backoff: 1s, 2s, 4s
 
-    for attempt in range(max_retries):
-        try:
-            # Open audio file and send to Whisper API for direct translation to English
-            with open(chunk_path, "rb") as audio_file:
-                response = client.audio.translations.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="verbose_json"
-                )
+def _save_latency(endpoint: str, latency: float) -> None:
+    """Remember the median per-chunk latency for the next run (best effort)."""
+    try:
+        cache = json_loads(LATENCY_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    cache[endpoint] = round(latency, 3)
+    try:
+        make_cache_dir(LATENCY_CACHE_PATH.parent)
+        write_bytes_atomic(LATENCY_CACHE_PATH, json_dumps(cache))
+    except (OSError, TypeError) as e:
+        logger.debug(f"Could not save latency cache: {e}")
 
-            # Extract segments from response
-            segments = []
-            if hasattr(response, 'segments') and response.segments:
-                for seg in response.segments:
-                    # Adjust timestamps by chunk offset
-                    segments.append({
-                        "start": seg.start + offset_seconds,
-                        "end": seg.end + offset_seconds,
-                        "text": seg.text.strip()
-                    })
 
-            return segments
+def _workers_for_latency(latency: float, total_chunks: int = None) -> int:
+    """Concurrency that keeps WHISPER_RPM requests/minute busy at the given latency."""
+    workers = math.ceil(WHISPER_RPM / 60 * latency)
+    if total_chunks:
+        workers = min(workers, total_chunks)
+    return max(1, min(workers, MAX_AUTO_WORKERS))
 
-        except Exception as e:
-            error_message = str(e)
 
-            # Check if it's a rate limit error (429)
-            is_rate_limit = "429" in error_message or "rate_limit" in error_message.lower()
+# Chunks read ahead of the requests in flight, as a multiple of the concurrency limit
+READ_AHEAD_FACTOR = 2
 
-            if attempt < max_retries - 1:
-                # Calculate backoff time
-                backoff = backoff_times[attempt]
 
-                if is_rate_limit:
-                    logger.warning(f"[Worker] Retry #{attempt + 1} after rate limit")
-                else:
-                    logger.warning(
-                        f"[Worker] Retry #{attempt + 1} after error: {error_message}"
-                    )
+class _ConcurrencyLimit:
+    """Async semaphore whose limit can be changed while requests are in flight."""
 
-                time.sleep(backoff)
-            else:
-                # Final failure after all retries
-                logger.error(
-                    f"[ERROR] Failed chunk at offset {offset_seconds:.2f}s "
-                    f"after {max_retries} attempts: {error_message}"
-                )
-                return []
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._condition = asyncio.Condition()
 
-    return []
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
 
 
-def transcribe_audio(chunks_generator, total_chunks: int = None, workers: int = None) -> List[Dict[str, any]]:
+async def transcribe_audio_async(chunks_generator, total_chunks: int = None, workers: int = None,
+                                 segment_queue: Union[asyncio.Queue, queue.Queue] = None,
+                                 translate: bool = False,
+                                 client=None) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
     """
-    Transcribe audio chunks in parallel using ThreadPoolExecutor.
+    Transcribe audio chunks concurrently on one event loop.
     Accepts chunks from a generator and starts transcription immediately.
 
+    Every request goes through one AsyncOpenAI client; at most `workers`
+    requests are in flight at once. Chunking blocks on ffmpeg, so the
+    generator is advanced in a worker thread.
+
+    If workers is None and WORKERS isn't configured, concurrency is tuned
+    from the median latency of the first PROBE_CHUNKS requests (or of the
+    previous run, cached in LATENCY_CACHE_PATH) and WHISPER_RPM.
+
     Args:
         chunks_generator: Generator that yields chunk information dictionaries
         total_chunks: Total number of chunks for progress tracking (optional)
-        workers: Number of parallel workers (overrides config if provided)
+        workers: Maximum concurrent requests (overrides config/auto-tuning if provided)
+        segment_queue: If given, each finished chunk is put on it as
+            (chunk_index, segments) as soon as it completes, followed by a
+            final None once all chunks are done
+        translate: Use Whisper's direct translation to English
+        client: AsyncOpenAI client to use (left open); by default one is
+            created for this call and closed at the end
 
     Returns:
-        List of all transcription segments sorted by start time
+        Tuple of (segments sorted by start time, chunk info list)
     """
+    endpoint = "whisper-1/" + ("translations" if translate else "transcriptions")
+    auto_tune = workers is None and AUTO_WORKERS
+
     # Determine worker count
     if workers is None:
         workers = WORKERS
+    if auto_tune:
+        cached = _cached_latency(endpoint)
+        if cached:
+            workers = _workers_for_latency(cached, total_chunks)
+            logger.info(f"Auto-tuned to {workers} concurrent requests (cached latency {cached:.1f}s/chunk, {WHISPER_RPM} RPM)")
+        else:
+            workers = PROBE_CHUNKS
 
-    logger.info(f"Starting concurrent chunking and transcription with {workers} workers")
-
-    all_segments = []
+    owns_client = client is None
+    if owns_client:
+        client = get_async_client(pool_size=MAX_AUTO_WORKERS if auto_tune else workers)
+    limit = _ConcurrencyLimit(workers)
+    latencies = []
     chunks_info = []  # Keep track of chunks for cleanup
+    results = {}  # chunk index -> segments, filled as requests finish
 
-    # Use ThreadPoolExecutor for parallel processing
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_chunk = {}
-
-        # Progress bar (update total as chunks arrive if not provided)
-        pbar = tqdm(desc="Transcribing", unit="chunk", total=total_chunks)
+    # Progress bar (update total as chunks arrive if not provided)
+    pbar = tqdm(desc="Translating" if translate else "Transcribing", unit="chunk", total=total_chunks)
 
-        # Submit chunks as they arrive from generator
-        for chunk in chunks_generator:
+    async def run_chunk(index, chunk):
+        async with limit:
+            started = time.monotonic()
+            try:
+                segments = await process_chunk_async(client, chunk, translate)
+            except Exception as e:
+                logger.error(f"Unexpected error processing chunk at {chunk['offset_seconds']:.0f}s: {e}")
+                segments = []
+            latencies.append(time.monotonic() - started)
+
+        # Probe done: size the pool from the measured latency
+        if auto_tune and len(latencies) == PROBE_CHUNKS:
+            median = statistics.median(latencies)
+            tuned = _workers_for_latency(median, total_chunks)
+            logger.info(f"Auto-tuned to {tuned} concurrent requests (measured {median:.1f}s/chunk, {WHISPER_RPM} RPM)")
+            await limit.set_limit(tuned)
+        # Hand results to the consumer while later chunks are still being cut
+        results[index] = segments
+        if segment_queue is not None:
+            segment_queue.put_nowait((index, segments))
+        pbar.update(1)
+
+    chunks = iter(chunks_generator)
+    # Only unfinished tasks are kept; finished ones have stored their results
+    in_flight = set()
+    try:
+        while True:
+            # Backpressure: read at most READ_AHEAD_FACTOR x the concurrency limit
+            # ahead, so in-memory chunks don't pile up while requests wait
+            while len(in_flight) >= READ_AHEAD_FACTOR * limit.limit:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            task = asyncio.create_task(run_chunk(len(chunks_info), chunk))
             chunks_info.append(chunk)
-            future = executor.submit(process_chunk, chunk)
-            future_to_chunk[future] = chunk
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
 
             # Update total if we didn't know it upfront
             if total_chunks is None:
                 pbar.total = len(chunks_info)
                 pbar.refresh()
 
-        # All chunks submitted, now collect results as they complete
-        for future in as_completed(future_to_chunk):
-            chunk = future_to_chunk[future]
-            try:
-                segments = future.result()
-                all_segments.extend(segments)
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error processing chunk "
-                    f"{chunk['chunk_path']}: {e}"
-                )
-            pbar.update(1)
-
+        await asyncio.gather(*list(in_flight))
+    except BaseException:
+        # Chunking failed: stop in-flight requests before closing the client
+        pending = list(in_flight)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+    finally:
         pbar.close()
+        if owns_client and client is not None:
+            await client.close()
+        if segment_queue is not None:
+            segment_queue.put_nowait(None)
 
-    # Sort all segments by start time
-    all_segments.sort(key=lambda x: x["start"])
+    if auto_tune and latencies:
+        _save_latency(endpoint, statistics.median(latencies))
 
-    logger.info(f"Transcription complete. Total segments: {len(all_segments)}")
+    # Sort all segments by start time
+    all_segments = [seg for index in range(len(chunks_info)) for seg in results.get(index, ())]
+    all_segments.sort(key=itemgetter("start"))
 
     return all_segments, chunks_info
 
 
-def transcribe_audio_translate(chunks_generator, total_chunks: int = None, workers: int = None) -> List[Dict[str, any]]:
+def transcribe_audio(chunks_generator, total_chunks: int = None, workers: int = None,
+                     segment_queue: queue.Queue = None,
+                     task: Literal["transcribe", "translate"] = "transcribe") -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
     """
-    Transcribe and translate audio chunks directly to English in parallel using ThreadPoolExecutor.
-    Uses Whisper's built-in translation feature instead of GPT-4.
+    Transcribe audio chunks concurrently with the Whisper API.
+
+    Sync entry point; runs transcribe_audio_async() on a fresh event loop.
 
     Args:
         chunks_generator: Generator that yields chunk information dictionaries
         total_chunks: Total number of chunks for progress tracking (optional)
-        workers: Number of parallel workers (overrides config if provided)
+        workers: Maximum concurrent requests (overrides config if provided)
+        segment_queue: If given, receives (chunk_index, segments) per finished
+            chunk and a final None (see transcribe_audio_async)
+        task: "transcribe" (source language) or "translate" (Whisper's direct
+            translation to English instead of GPT-4)
 
     Returns:
-        List of all translated segments (in English) sorted by start time
+        Tuple of (segments sorted by start time, chunk info list)
     """
-    # Determine worker count
-    if workers is None:
-        workers = WORKERS
+    translate = task == "translate"
+    concurrency = workers or ('auto' if AUTO_WORKERS else WORKERS)
+    if translate:
+        logger.info(f"Starting concurrent chunking and translation ({concurrency} concurrent requests, direct Whisper translation)")
+    else:
+        logger.info(f"Starting concurrent chunking and transcription ({concurrency} concurrent requests)")
 
-    logger.info(f"Starting concurrent chunking and translation with {workers} workers (direct Whisper translation)")
+    all_segments, chunks_info = asyncio.run(
+        transcribe_audio_async(chunks_generator, total_chunks, workers, segment_queue, translate=translate)
+    )
 
-    all_segments = []
-    chunks_info = []  # Keep track of chunks for cleanup
+    logger.info(f"{'Translation' if translate else 'Transcription'} complete. Total segments: {len(all_segments)}")
 
-    # Use ThreadPoolExecutor for parallel processing
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_chunk = {}
+    return all_segments, chunks_info
 
-        # Progress bar (update total as chunks arrive if not provided)
-        pbar = tqdm(desc="Translating", unit="chunk", total=total_chunks)
 
-        # Submit chunks as they arrive from generator
-        for chunk in chunks_generator:
-            chunks_info.append(chunk)
-            future = executor.submit(process_chunk_translate, chunk)
-            future_to_chunk[future] = chunk
+def _fallback_google(segment: Dict[str, any], line_num: int) -> Dict[str, any]:
+    """Fallback: translate one line with Google Translate."""
+    from src.translate_google import translate_single_line_google
+    return translate_single_line_google(segment, line_num)
 
-            # Update total if we didn't know it upfront
-            if total_chunks is None:
-                pbar.total = len(chunks_info)
-                pbar.refresh()
 
-        # All chunks submitted, now collect results as they complete
-        for future in as_completed(future_to_chunk):
-            chunk = future_to_chunk[future]
-            try:
-                segments = future.result()
-                all_segments.extend(segments)
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error processing chunk "
-                    f"{chunk['chunk_path']}: {e}"
-                )
-            pbar.update(1)
+# System prompts are built once; only the subtitle text varies between requests
+_LINE_SYSTEM_PROMPT = (
+    "You are a professional subtitle translator. Translate the Japanese subtitle line "
+    "in the user message to natural English and reply with the translation only. "
+    "Preserve conversational flow, tone, nuance, and emotion. "
+    "Do NOT censor or soften meaning - translate all content directly."
+)
 
-        pbar.close()
 
-    # Sort all segments by start time
-    all_segments.sort(key=lambda x: x["start"])
+def _fallback_openai(segment: Dict[str, any], line_num: int) -> Dict[str, any]:
+    """Fallback: translate one line with OpenAI GPT-4 (None on an empty response)."""
+    response = get_client().chat.completions.create(
+        model=GPT_MODEL,
+        messages=[
+            {"role": "system", "content": _LINE_SYSTEM_PROMPT},
+            # The system prompt carries the instructions; send only the line
+            {"role": "user", "content": segment["text"]}
+        ],
+        temperature=0.3,
+        max_tokens=200
+    )
 
-    logger.info(f"Translation complete. Total segments: {len(all_segments)}")
+    translated_text = response.choices[0].message.content.strip()
+
+    if not translated_text:
+        # Empty response, try next method
+        logger.warning(f"Line {line_num}: OpenAI returned empty response, trying next fallback")
+        return None
+
+    return {
+        "start": segment["start"],
+        "end": segment["end"],
+        "text": translated_text,
+        "original": segment["text"]
+    }
+
+
+def _fallback_untranslated(segment: Dict[str, any], line_num: int) -> Dict[str, any]:
+    """Fallback: keep the original Japanese text."""
+    logger.warning(f"Line {line_num}: Using untranslated Japanese text")
+    return {
+        "start": segment["start"],
+        "end": segment["end"],
+        "text": segment["text"],
+        "original": segment["text"]
+    }
+
+
+# Fallback method name -> per-line translator
+FALLBACK_DISPATCH = {
+    "google": _fallback_google,
+    "openai": _fallback_openai,
+    "untranslated": _fallback_untranslated,
+}
+_FALLBACK_NAMES = {fn: name for name, fn in FALLBACK_DISPATCH.items()}
+
+
+def compile_fallback_chain(fallback_chain) -> Tuple:
+    """
+    Resolve a fallback chain to a tuple of per-line translator functions.
+
+    Done once (at argument parsing) so the per-line loop is plain calls.
+    Already-resolved functions are passed through unchanged.
+
+    Args:
+        fallback_chain: Method names (e.g. ["google", "openai", "untranslated"]) or functions
+
+    Returns:
+        Tuple of callables taking (segment, line_num)
+
+    Raises:
+        ValueError: If a method name is unknown
+    """
+    chain = []
+    for method in fallback_chain:
+        if callable(method):
+            chain.append(method)
+            continue
+        name = method.strip().lower()
+        if name not in FALLBACK_DISPATCH:
+            raise ValueError(f"Unknown fallback method '{method}' (choose from: {', '.join(FALLBACK_DISPATCH)})")
+        chain.append(FALLBACK_DISPATCH[name])
+    return tuple(chain)
 
-    return all_segments, chunks_info
 
+def format_fallback_chain(fallback_chain) -> str:
+    """Human-readable form of a fallback chain for logging, e.g. 'google → openai'."""
+    return " → ".join(str(_FALLBACK_NAMES.get(method, getattr(method, "__name__", method)))
+                      for method in fallback_chain)
 
-def translate_single_line(segment: Dict[str, any], line_num: int, fallback_chain: List[str] = None) -> Dict[str, any]:
+
+_DEFAULT_FALLBACK_CHAIN = (_fallback_openai, _fallback_untranslated)
+
+
+def translate_single_line(segment: Dict[str, any], line_num: int, fallback_chain=None) -> Dict[str, any]:
     """
     Translate a single segment using the fallback chain.
     Tries each method in order until one succeeds.
@@ -284,68 +512,24 @@ def translate_single_line(segment: Dict[str, any], line_num: int, fallback_chain
     Args:
         segment: Single segment to translate
         line_num: Line number for logging
-        fallback_chain: List of translation methods to try in order (e.g., ["google", "openai", "untranslated"])
+        fallback_chain: Translator functions from compile_fallback_chain() (method
+            names such as ["google", "openai", "untranslated"] are also accepted)
 
     Returns:
         Translated segment or original if all translations fail
     """
     if fallback_chain is None:
-        fallback_chain = ["openai", "untranslated"]
+        fallback_chain = _DEFAULT_FALLBACK_CHAIN
+    elif fallback_chain and not callable(fallback_chain[0]):
+        fallback_chain = compile_fallback_chain(fallback_chain)
 
     for method in fallback_chain:
         try:
-            if method == "google":
-                # Try Google Translate
-                from src.translate_google import translate_single_line_google
-                return translate_single_line_google(segment, line_num)
-
-            elif method == "openai":
-                # Try OpenAI GPT-4
-                response = client.chat.completions.create(
-                    model=GPT_MODEL,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional subtitle translator. Translate Japanese subtitle lines to natural English. "
-                                       "Preserve conversational flow, tone, nuance, and emotion. "
-                                       "Do NOT censor or soften meaning - translate all content directly."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Translate this Japanese subtitle to English:\n\n{segment['text']}"
-                        }
-                    ],
-                    temperature=0.3,
-                    max_tokens=200
-                )
-
-                translated_text = response.choices[0].message.content.strip()
-
-                if translated_text:
-                    return {
-                        "start": segment["start"],
-                        "end": segment["end"],
-                        "text": translated_text,
-                        "original": segment["text"]
-                    }
-                else:
-                    # Empty response, try next method
-                    logger.warning(f"Line {line_num}: OpenAI returned empty response, trying next fallback")
-                    continue
-
-            elif method == "untranslated":
-                # Keep original Japanese text
-                logger.warning(f"Line {line_num}: Using untranslated Japanese text")
-                return {
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": segment["text"],
-                    "original": segment["text"]
-                }
-
+            result = method(segment, line_num)
+            if result:
+                return result
         except Exception as e:
-            logger.warning(f"Line {line_num}: {method} translation failed ({str(e)}), trying next fallback")
-            continue
+            logger.warning(f"Line {line_num}: {format_fallback_chain((method,))} translation failed ({str(e)}), trying next fallback")
 
     # If all methods fail, return original
     logger.error(f"Line {line_num}: All fallback methods failed, using original")
@@ -357,8 +541,389 @@ def translate_single_line(segment: Dict[str, any], line_num: int, fallback_chain
     }
 
 
+def _window_index(segment: Dict[str, any]) -> int:
+    """Index of the TRANSLATION_BATCH_MINUTES window a segment starts in."""
+    return int(segment["start"] // (TRANSLATION_BATCH_MINUTES * 60))
+
+
+def _time_windows(segments: Iterable[Dict[str, any]]) -> Iterator[List[Dict[str, any]]]:
+    """
+    Group segments into TRANSLATION_BATCH_MINUTES time windows for context.
+
+    Windows are fixed slices of the timeline (0-5 min, 5-10 min, ...), so a
+    single groupby pass splits them without tracking where each one started.
+
+    Args:
+        segments: Segments sorted by start time (any iterable)
+
+    Yields:
+        Lists of segments, one per non-empty window
+    """
+    for _, window in groupby(segments, key=_window_index):
+        yield list(window)
+
+
+# Output budget per translation request (max_tokens is 4000; leave headroom)
+TRANSLATION_REPLY_TOKENS = 3000
+# JSON wrapper per line: {"id": 12, "text": "..."},
+_JSON_LINE_OVERHEAD_TOKENS = 10
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoder():
+    """tiktoken encoder for GPT_MODEL, or None if tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(GPT_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _estimate_reply_tokens(texts: List[str]) -> List[int]:
+    """
+    Estimate the reply tokens needed to translate each source line.
+
+    Counts the sources with tiktoken when available (the English translation
+    is rarely longer), encoding the whole list in one call; otherwise assumes
+    one token per character, which is an upper bound for Japanese.
+    """
+    encoder = _token_encoder()
+    if encoder is not None:
+        counts = map(len, encoder.encode_ordinary_batch(texts))
+    else:
+        counts = map(len, texts)
+    return [count + _JSON_LINE_OVERHEAD_TOKENS for count in counts]
+
+
+def _split_window(window: List[Dict[str, any]]) -> List[List[Dict[str, any]]]:
+    """
+    Split a time window into request-sized batches.
+
+    Batches are packed up to the estimated size of the JSON reply, so it fits
+    in max_tokens; MAX_SEGMENTS_PER_BATCH (if not 0) also caps the line count.
+    """
+    max_segments = MAX_SEGMENTS_PER_BATCH or len(window)
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for seg, tokens in zip(window, _estimate_reply_tokens([seg["text"] for seg in window])):
+        if batch and (len(batch) >= max_segments or batch_tokens + tokens > TRANSLATION_REPLY_TOKENS):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(seg)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+# Text with nothing to translate: empty, or only punctuation and music/ellipsis marks
+_TRIVIAL_TEXT_RE = re.compile(r"[\s♪♫…。、，．！？!?.,\-ー・~〜～\[\]()（）「」『』]*")
+
+
+def _partition_trivial(segments: Iterable[Dict[str, any]]) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+    """
+    Split off segments with nothing to translate ("", "♪", "…", "!?", ...).
+
+    Whisper emits many of these on music and silence; they are passed
+    through unchanged instead of being billed as translation lines.
+
+    Returns:
+        Tuple of (segments to translate, passed-through segments in translated form)
+    """
+    translatable, passthrough = [], []
+    for seg in segments:
+        if _TRIVIAL_TEXT_RE.fullmatch(seg["text"]):
+            passthrough.append({"start": seg["start"], "end": seg["end"],
+                                "text": seg["text"], "original": seg["text"]})
+        else:
+            translatable.append(seg)
+    return translatable, passthrough
+
+
+# GPT translations of earlier lines, keyed by _translation_key() of the source
+# text; repeated lines ("はい", catchphrases) are translated once across runs
+TRANSLATION_CACHE_PATH = CACHE_DIR / "translations.json"
+TRANSLATION_CACHE_MAX_ENTRIES = 50000
+_translation_cache_lock = threading.Lock()
+_translation_cache_dirty = False
+
+
+def _translation_key(text: str) -> str:
+    """Cache key for a source line: SHA-1 of the model and the NFKC-normalized text."""
+    normalized = " ".join(unicodedata.normalize("NFKC", text).split())
+    return hashlib.sha1(f"{GPT_MODEL}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _translation_cache() -> Dict[str, str]:
+    """The translation cache, loaded from TRANSLATION_CACHE_PATH on first use."""
+    try:
+        cache = json_loads(TRANSLATION_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _remember_translations(segments: List[Dict[str, any]]) -> None:
+    """Add GPT translations to the cache (lines left as the source text are skipped)."""
+    global _translation_cache_dirty
+    cache = _translation_cache()
+    with _translation_cache_lock:
+        for seg in segments:
+            if seg["text"] and seg["text"] != seg["original"]:
+                cache[_translation_key(seg["original"])] = seg["text"]
+                _translation_cache_dirty = True
+
+
+def _save_translation_cache() -> None:
+    """Write the translation cache back to disk, keeping the newest entries (best effort)."""
+    global _translation_cache_dirty
+    with _translation_cache_lock:
+        if not _translation_cache_dirty:
+            return
+        cache = _translation_cache()
+        # Dicts keep insertion order: drop the oldest entries beyond the limit
+        for key in list(cache)[:max(0, len(cache) - TRANSLATION_CACHE_MAX_ENTRIES)]:
+            del cache[key]
+        try:
+            make_cache_dir(TRANSLATION_CACHE_PATH.parent)
+            write_bytes_atomic(TRANSLATION_CACHE_PATH, json_dumps(cache))
+            _translation_cache_dirty = False
+        except (OSError, TypeError) as e:
+            logger.debug(f"Could not save translation cache: {e}")
+
+
+def _partition_cached(segments: Iterable[Dict[str, any]]) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+    """
+    Split off segments whose source text was translated by GPT before.
+
+    Returns:
+        Tuple of (segments to translate, cached segments in translated form)
+    """
+    cache = _translation_cache()
+    to_translate, cached = [], []
+    for seg in segments:
+        text = cache.get(_translation_key(seg["text"]))
+        if text is None:
+            to_translate.append(seg)
+        else:
+            cached.append({"start": seg["start"], "end": seg["end"], "text": text, "original": seg["text"]})
+    return to_translate, cached
+
+
+def _batch_limit_description() -> str:
+    """How batches are capped, for log messages."""
+    if MAX_SEGMENTS_PER_BATCH:
+        return f"max {MAX_SEGMENTS_PER_BATCH} segments or ~{TRANSLATION_REPLY_TOKENS} reply tokens/batch"
+    return f"~{TRANSLATION_REPLY_TOKENS} reply tokens/batch"
+
+
+def _build_translation_batches(segments: List[Dict[str, any]]) -> List[List[Dict[str, any]]]:
+    """
+    Create time-window batches, splitting any that are too large for one request.
+
+    Args:
+        segments: List of segments sorted by start time
+
+    Returns:
+        List of batches (lists of segments)
+    """
+    return [batch for window in _time_windows(segments) for batch in _split_window(window)]
+
+
+_BATCH_SYSTEM_PROMPT = (
+    "You are a professional subtitle translator. Translate Japanese subtitle lines to natural English.\n\n"
+    "CRITICAL RULES:\n"
+    "1. Return a JSON object: {\"translations\": [{\"id\": 1, \"text\": \"...\"}, ...]}\n"
+    "2. Include EXACTLY one entry per input line, with the same id as the line number\n"
+    "3. Do NOT skip any ids\n"
+    "4. Do NOT add commentary or explanations\n"
+    "5. Preserve conversational flow, tone, nuance, and emotion\n"
+    "6. Do NOT censor or soften meaning - translate all sexual, vulgar, and explicit language directly\n"
+    "7. Do NOT use euphemisms - preserve crude/vulgar terms exactly as they appear in context\n\n"
+    "Example:\n"
+    "Input:\n"
+    "1. [00:05] こんにちは\n"
+    "2. [00:08] 元気ですか\n\n"
+    "Output:\n"
+    "{\"translations\": [{\"id\": 1, \"text\": \"Hello\"}, {\"id\": 2, \"text\": \"How are you\"}]}"
+)
+
+
+def _batch_translation_request(batch: List[Dict[str, any]]) -> Tuple[List[Dict[str, str]], str]:
+    """
+    Build the chat messages for translating a batch in numbered format.
+
+    Args:
+        batch: List of segments within a time window
+
+    Returns:
+        Tuple of (messages, batch_input) - batch_input is the numbered source text
+    """
+    # Format batch for GPT, with an [mm:ss] timestamp for context
+    timestamp = "[{:02d}:{:02d}]".format
+    batch_input = "\n".join([
+        f"{idx}. {timestamp(*map(int, divmod(seg['start'], 60)))} {seg['text']}"
+        for idx, seg in enumerate(batch, 1)
+    ])
+
+    messages = [
+        {
+            "role": "system",
+            "content": _BATCH_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Translate these {len(batch)} Japanese subtitles to English:\n\n{batch_input}"
+        }
+    ]
+    return messages, batch_input
+
+
+# "12. text" or "12) text" at the start of a line; captures the text
+_NUMBERED_LINE_RE = re.compile(r"(?m)^[ \t]*\d+[.)][ \t]+(.*?)[ \t]*\r?$")
+
+
+def _parse_json_translations(translated_text: str, batch: List[Dict[str, any]]) -> Optional[List[str]]:
+    """
+    Parse a {"translations": [{"id": n, "text": ...}]} reply into lines ordered by id.
+
+    A reply that skips any id is a count mismatch, like a short numbered reply.
+
+    Returns:
+        List with one line per batch segment, an empty list if ids are missing
+        (so the caller retries), or None if the reply isn't that JSON
+    """
+    try:
+        entries = json_loads(translated_text.encode("utf-8"))["translations"]
+        by_id = {int(entry["id"]): str(entry["text"]).strip() for entry in entries}
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    if not by_id:
+        return None
+    if any(idx not in by_id for idx in range(1, len(batch) + 1)):
+        return []
+    return [by_id[idx] for idx in range(1, len(batch) + 1)]
+
+
+def _parse_translated_lines(translated_text: str, batch: List[Dict[str, any]],
+                            batch_num: int, attempt: int) -> Tuple[List[str], bool]:
+    """
+    Extract translated lines from a numbered-format response.
+
+    Args:
+        translated_text: Raw model response
+        batch: Source segments (for the expected line count)
+        batch_num: Batch number for logging
+        attempt: Attempt index for logging
+
+    Returns:
+        Tuple of (translated lines, which may not match the batch length;
+        True if the JSON or numbered parse gave exactly one line per segment)
+    """
+    # Strategy 0: Structured JSON reply, one entry per id (preferred)
+    translated_lines = _parse_json_translations(translated_text, batch)
+    if translated_lines == []:
+        logger.warning(f"Batch {batch_num} attempt {attempt + 1}: JSON reply is missing ids. Treating as a count mismatch.")
+    if translated_lines is not None:
+        return translated_lines, bool(translated_lines)
+
+    # Strategy 1: Parse numbered format
+    translated_lines = [text.strip() for text in _NUMBERED_LINE_RE.findall(translated_text)]
+    exact = len(translated_lines) == len(batch)
+
+    # Strategy 2: If count mismatch, try aggressive line extraction
+    if not exact:
+        logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Expected {len(batch)} lines, got {len(translated_lines)}. Using fallback parsing.")
+        logger.debug(f"Batch {batch_num} raw response preview: {translated_text[:500]}...")
+
+        translated_lines = []
+        for line in translated_text.split("\n"):
+            line = line.strip()
+            # Skip empty lines, headers, and metadata
+            if not line or line.startswith("#") or line.lower().startswith("output") or line.lower().startswith("input"):
+                continue
+
+            # Remove timestamp markers like [00:05]
+            if "[" in line and "]" in line:
+                # Find last ] and take text after it
+                bracket_end = line.rfind("]")
+                if bracket_end != -1:
+                    line = line[bracket_end + 1:].strip()
+
+            # Remove any number prefix if exists
+            if ". " in line:
+                parts = line.split(". ", 1)
+                if parts[0].strip().isdigit():
+                    line = parts[1].strip()
+
+            if line:
+                translated_lines.append(line)
+
+    return translated_lines, exact
+
+
+def _apply_translated_lines(translated_lines: List[str], batch: List[Dict[str, any]],
+                            batch_num: int, cache: bool = False) -> List[Dict[str, any]]:
+    """
+    Pad or truncate translated lines to the batch length and map them onto segments.
+
+    Args:
+        translated_lines: Parsed translations
+        batch: Source segments
+        batch_num: Batch number for logging
+        cache: Add the result to the translation cache (only for exact parses,
+            so padded, truncated or fallback-parsed lines are never reused)
+
+    Returns:
+        List of translated segments
+    """
+    # Strategy 4: Truncate or pad if minor mismatch
+    if len(translated_lines) < len(batch):
+        logger.warning(f"Batch {batch_num}: Still short ({len(translated_lines)}/{len(batch)}). Padding with originals.")
+        # Pad with original text for missing lines
+        while len(translated_lines) < len(batch):
+            translated_lines.append(batch[len(translated_lines)]["text"])
+    elif len(translated_lines) > len(batch):
+        logger.warning(f"Batch {batch_num}: Too many lines ({len(translated_lines)}/{len(batch)}). Truncating.")
+        translated_lines = translated_lines[:len(batch)]
+
+    # Map translations back to segments
+    result = []
+    for idx, seg in enumerate(batch):
+        result.append({
+            "start": seg["start"],
+            "end": seg["end"],
+            "text": translated_lines[idx],
+            "original": seg["text"]
+        })
+
+    if cache:
+        _remember_translations(result)
+    return result
+
+
+def _translate_lines_individually(batch: List[Dict[str, any]], batch_num: int,
+                                  fallback_chain: Sequence) -> List[Dict[str, any]]:
+    """Translate each line of a failed batch on its own using the fallback chain."""
+    logger.info(f"Batch {batch_num}: Attempting line-by-line translation fallback for {len(batch)} segments...")
+
+    result = []
+    for idx, seg in enumerate(batch, 1):
+        translated_seg = translate_single_line(seg, idx, fallback_chain)
+        result.append(translated_seg)
+
+    logger.info(f"Batch {batch_num}: Line-by-line fallback complete")
+    return result
+
+
 def translate_batch(batch: List[Dict[str, any]], batch_num: int,
-                   bulk_translator: str = "openai", fallback_chain: List[str] = None) -> List[Dict[str, any]]:
+                   bulk_translator: str = "openai", fallback_chain: Sequence = None) -> List[Dict[str, any]]:
     """
     Translate a batch of segments using the specified translator.
 
@@ -371,8 +936,7 @@ def translate_batch(batch: List[Dict[str, any]], batch_num: int,
     Returns:
         List of translated segments
     """
-    if fallback_chain is None:
-        fallback_chain = ["openai", "untranslated"]
+    fallback_chain = compile_fallback_chain(fallback_chain or _DEFAULT_FALLBACK_CHAIN)
 
     # Route to appropriate translator
     if bulk_translator == "google":
@@ -381,50 +945,19 @@ def translate_batch(batch: List[Dict[str, any]], batch_num: int,
 
     # Default: OpenAI GPT-4 translation
     max_retries = 3
-    backoff_times = [1, 2, 4]
-
-    # Format batch for GPT
-    batch_text = []
-    for idx, seg in enumerate(batch, 1):
-        # Include timestamp for context
-        timestamp = f"[{int(seg['start']//60):02d}:{int(seg['start']%60):02d}]"
-        batch_text.append(f"{idx}. {timestamp} {seg['text']}")
 
-    batch_input = "\n".join(batch_text)
+    messages, batch_input = _batch_translation_request(batch)
 
     logger.debug(f"Batch {batch_num}: Translating {len(batch)} segments")
 
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
+            response = get_client().chat.completions.create(
                 model=GPT_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional subtitle translator. Translate Japanese subtitle lines to natural English.\n\n"
-                                   "CRITICAL RULES:\n"
-                                   "1. Return EXACTLY the same number of lines as the input\n"
-                                   "2. Use the EXACT same numbered format: '1. ', '2. ', '3. ', etc.\n"
-                                   "3. Do NOT skip any numbers\n"
-                                   "4. Do NOT add commentary or explanations\n"
-                                   "5. Preserve conversational flow, tone, nuance, and emotion\n"
-                                   "6. Do NOT censor or soften meaning - translate all sexual, vulgar, and explicit language directly\n"
-                                   "7. Do NOT use euphemisms - preserve crude/vulgar terms exactly as they appear in context\n\n"
-                                   "Example format:\n"
-                                   "Input:\n"
-                                   "1. [00:05] こんにちは\n"
-                                   "2. [00:08] 元気ですか\n\n"
-                                   "Output:\n"
-                                   "1. Hello\n"
-                                   "2. How are you"
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Translate these {len(batch)} Japanese subtitles to English:\n\n{batch_input}"
-                    }
-                ],
+                messages=messages,
                 temperature=0.3,
-                max_tokens=4000
+                max_tokens=4000,
+                response_format={"type": "json_object"}
             )
 
             translated_text = response.choices[0].message.content.strip()
@@ -438,118 +971,149 @@ def translate_batch(batch: List[Dict[str, any]], batch_num: int,
                 if attempt < max_retries - 1:
                     logger.warning(f"Batch {batch_num} attempt {attempt + 1}: GPT-4 returned empty/short response ({len(translated_text)} chars, expected >{min_expected_length:.0f}).")
                     logger.warning(f"Batch {batch_num} response preview: {response_preview}")
-                    time.sleep(backoff_times[attempt])
+                    time.sleep(_retry_delay(attempt))
                     continue
                 else:
                     logger.error(f"Batch {batch_num}: GPT-4 returned empty response after {max_retries} attempts.")
                     logger.error(f"Batch {batch_num} final response: {response_preview}")
-                    logger.info(f"Batch {batch_num}: Attempting line-by-line translation fallback for {len(batch)} segments...")
 
                     # Try translating each line individually using fallback chain
-                    result = []
-                    for idx, seg in enumerate(batch, 1):
-                        translated_seg = translate_single_line(seg, idx, fallback_chain)
-                        result.append(translated_seg)
-
-                    logger.info(f"Batch {batch_num}: Line-by-line fallback complete")
-                    return result
+                    return _translate_lines_individually(batch, batch_num, fallback_chain)
 
             # Multi-strategy parsing with fallbacks
-            translated_lines = []
-
-            # Strategy 1: Parse numbered format (preferred)
-            for line in translated_text.split("\n"):
-                line = line.strip()
-                if line and ". " in line:
-                    # Try to extract number and text
-                    parts = line.split(". ", 1)
-                    if len(parts) == 2 and parts[0].isdigit():
-                        translated_lines.append(parts[1].strip())
-
-            # Strategy 2: If count mismatch, try aggressive line extraction
-            if len(translated_lines) != len(batch):
-                logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Expected {len(batch)} lines, got {len(translated_lines)}. Using fallback parsing.")
-                logger.debug(f"Batch {batch_num} raw response preview: {translated_text[:500]}...")
-
-                translated_lines = []
-                for line in translated_text.split("\n"):
-                    line = line.strip()
-                    # Skip empty lines, headers, and metadata
-                    if not line or line.startswith("#") or line.lower().startswith("output") or line.lower().startswith("input"):
-                        continue
-
-                    # Remove timestamp markers like [00:05]
-                    if "[" in line and "]" in line:
-                        # Find last ] and take text after it
-                        bracket_end = line.rfind("]")
-                        if bracket_end != -1:
-                            line = line[bracket_end + 1:].strip()
-
-                    # Remove any number prefix if exists
-                    if ". " in line:
-                        parts = line.split(". ", 1)
-                        if parts[0].strip().isdigit():
-                            line = parts[1].strip()
-
-                    if line:
-                        translated_lines.append(line)
+            translated_lines, exact = _parse_translated_lines(translated_text, batch, batch_num, attempt)
 
             # Strategy 3: If still severely mismatched and we have retries left, retry
             if len(translated_lines) < len(batch) * 0.5 and attempt < max_retries - 1:
                 logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Only got {len(translated_lines)}/{len(batch)} lines (< 50%). Retrying...")
-                time.sleep(backoff_times[attempt])
+                time.sleep(_retry_delay(attempt))
                 continue
+            if not translated_lines:
+                return _translate_lines_individually(batch, batch_num, fallback_chain)
 
-            # Strategy 4: Truncate or pad if minor mismatch
-            if len(translated_lines) < len(batch):
-                logger.warning(f"Batch {batch_num}: Still short ({len(translated_lines)}/{len(batch)}). Padding with originals.")
-                # Pad with original text for missing lines
-                while len(translated_lines) < len(batch):
-                    translated_lines.append(batch[len(translated_lines)]["text"])
-            elif len(translated_lines) > len(batch):
-                logger.warning(f"Batch {batch_num}: Too many lines ({len(translated_lines)}/{len(batch)}). Truncating.")
-                translated_lines = translated_lines[:len(batch)]
-
-            # Map translations back to segments
-            result = []
-            for idx, seg in enumerate(batch):
-                result.append({
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": translated_lines[idx],
-                    "original": seg["text"]
-                })
-
-            return result
+            return _apply_translated_lines(translated_lines, batch, batch_num, cache=exact)
 
         except Exception as e:
             if attempt < max_retries - 1:
                 logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Exception occurred: {e}. Retrying...")
-                time.sleep(backoff_times[attempt])
+                time.sleep(_retry_delay(attempt, e))
             else:
                 logger.error(f"Batch {batch_num}: Translation failed after {max_retries} attempts: {e}")
-                logger.info(f"Batch {batch_num}: Attempting line-by-line translation fallback for {len(batch)} segments...")
 
                 # Try translating each line individually using fallback chain
-                result = []
-                for idx, seg in enumerate(batch, 1):
-                    translated_seg = translate_single_line(seg, idx, fallback_chain)
-                    result.append(translated_seg)
+                return _translate_lines_individually(batch, batch_num, fallback_chain)
 
-                logger.info(f"Batch {batch_num}: Line-by-line fallback complete")
-                return result
+    return batch
+
+
+async def translate_batch_async(client, batch: List[Dict[str, any]], batch_num: int,
+                                fallback_chain: Sequence = None) -> List[Dict[str, any]]:
+    """
+    Translate a batch of segments with an AsyncOpenAI client.
+
+    Same retry and parsing rules as translate_batch(); the line-by-line
+    fallback uses the sync client in a worker thread.
+
+    Args:
+        client: AsyncOpenAI client (from config.get_async_client)
+        batch: List of segments within a time window
+        batch_num: Batch number for logging
+        fallback_chain: Fallback chain for failed translations
+
+    Returns:
+        List of translated segments
+    """
+    fallback_chain = compile_fallback_chain(fallback_chain or _DEFAULT_FALLBACK_CHAIN)
+
+    max_retries = 3
+
+    messages, batch_input = _batch_translation_request(batch)
+
+    logger.debug(f"Batch {batch_num}: Translating {len(batch)} segments")
+
+    for attempt in range(max_retries):
+        try:
+            response = await client.chat.completions.create(
+                model=GPT_MODEL,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=4000,
+                response_format={"type": "json_object"}
+            )
+
+            translated_text = response.choices[0].message.content.strip()
+
+            # Empty or much shorter than the input means the request failed
+            min_expected_length = max(10, len(batch_input) * 0.3)
+            if not translated_text or len(translated_text) < min_expected_length:
+                response_preview = translated_text[:200] if translated_text else "(empty)"
+                if attempt < max_retries - 1:
+                    logger.warning(f"Batch {batch_num} attempt {attempt + 1}: GPT-4 returned empty/short response ({len(translated_text)} chars, expected >{min_expected_length:.0f}).")
+                    logger.warning(f"Batch {batch_num} response preview: {response_preview}")
+                    await asyncio.sleep(_retry_delay(attempt))
+                    continue
+                else:
+                    logger.error(f"Batch {batch_num}: GPT-4 returned empty response after {max_retries} attempts.")
+                    logger.error(f"Batch {batch_num} final response: {response_preview}")
+                    return await asyncio.to_thread(_translate_lines_individually, batch, batch_num, fallback_chain)
+
+            translated_lines, exact = _parse_translated_lines(translated_text, batch, batch_num, attempt)
+
+            if len(translated_lines) < len(batch) * 0.5 and attempt < max_retries - 1:
+                logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Only got {len(translated_lines)}/{len(batch)} lines (< 50%). Retrying...")
+                await asyncio.sleep(_retry_delay(attempt))
+                continue
+            if not translated_lines:
+                return await asyncio.to_thread(_translate_lines_individually, batch, batch_num, fallback_chain)
+
+            return _apply_translated_lines(translated_lines, batch, batch_num, cache=exact)
+
+        except Exception as e:
+            if attempt < max_retries - 1:
+                logger.warning(f"Batch {batch_num} attempt {attempt + 1}: Exception occurred: {e}. Retrying...")
+                await asyncio.sleep(_retry_delay(attempt, e))
+            else:
+                logger.error(f"Batch {batch_num}: Translation failed after {max_retries} attempts: {e}")
+                return await asyncio.to_thread(_translate_lines_individually, batch, batch_num, fallback_chain)
 
     return batch
 
 
-def translate_segments(segments: List[Dict[str, any]], workers: int = None,
-                      bulk_translator: str = "openai", fallback_chain: List[str] = None) -> List[Dict[str, any]]:
+async def _translate_batch_task(client, batch: List[Dict[str, any]], batch_num: int,
+                                bulk_translator: str, fallback_chain: Tuple) -> List[Dict[str, any]]:
     """
-    Translate all segments with time-based batching for better context.
+    Translate one batch on the event loop (Google in a worker thread), keeping originals on error.
+
+    Args:
+        client: AsyncOpenAI client, or None for Google
+        batch: Segments of one batch
+        batch_num: Batch number for logging
+        bulk_translator: Bulk translation method ("openai" or "google")
+        fallback_chain: Compiled fallback chain
+
+    Returns:
+        List of translated segments
+    """
+    try:
+        if bulk_translator == "google":
+            return await asyncio.to_thread(translate_batch, batch, batch_num, bulk_translator, fallback_chain)
+        return await translate_batch_async(client, batch, batch_num, fallback_chain)
+    except Exception as e:
+        logger.error(f"Unexpected error translating batch {batch_num}: {e}")
+        return batch  # Keep originals on error
+
+
+async def translate_segments_async(segments: List[Dict[str, any]], workers: int = None,
+                                   bulk_translator: str = "openai", fallback_chain: Sequence = None) -> List[Dict[str, any]]:
+    """
+    Translate all segments with time-based batching, running batches concurrently on one event loop.
+
+    OpenAI batches share one AsyncOpenAI client; at most `workers` requests are
+    in flight at once. Google batches run in worker threads (the library is sync).
 
     Args:
         segments: List of segments with original language text
-        workers: Number of parallel workers (overrides config if provided)
+        workers: Maximum concurrent batches (overrides config if provided)
         bulk_translator: Bulk translation method ("openai" or "google")
         fallback_chain: Fallback chain for failed translations (e.g., ["google", "openai", "untranslated"])
 
@@ -559,164 +1123,637 @@ def translate_segments(segments: List[Dict[str, any]], workers: int = None,
     if workers is None:
         workers = TRANSLATION_WORKERS
 
-    if fallback_chain is None:
-        fallback_chain = ["openai", "untranslated"]
+    fallback_chain = compile_fallback_chain(fallback_chain or _DEFAULT_FALLBACK_CHAIN)
 
-    # Create time-based batches
-    batch_window_seconds = TRANSLATION_BATCH_MINUTES * 60
-    batches = []
-    current_batch = []
-    batch_start_time = 0
-
-    for segment in segments:
-        # Check if we need to start a new batch
-        if segment["start"] >= batch_start_time + batch_window_seconds and current_batch:
-            batches.append(current_batch)
-            current_batch = [segment]
-            batch_start_time = segment["start"]
-        else:
-            if not current_batch:
-                batch_start_time = segment["start"]
-            current_batch.append(segment)
+    segments, passthrough = _partition_trivial(segments)
+    if bulk_translator == "openai":
+        segments, cached = _partition_cached(segments)
+        passthrough += cached
+        if cached:
+            logger.info(f"Reusing {len(cached)} cached translations")
+    batches = _build_translation_batches(segments)
 
-    # Add the last batch
-    if current_batch:
-        batches.append(current_batch)
-
-    # Split oversized batches (dialogue-heavy scenes)
-    final_batches = []
-    for batch in batches:
-        if len(batch) > MAX_SEGMENTS_PER_BATCH:
-            # Split into smaller batches
-            for i in range(0, len(batch), MAX_SEGMENTS_PER_BATCH):
-                final_batches.append(batch[i:i + MAX_SEGMENTS_PER_BATCH])
-        else:
-            final_batches.append(batch)
-
-    # For Google Translate, use sequential processing to avoid rate limits
-    # But batches can still run in parallel (workers parameter)
     if bulk_translator == "google":
         # Reduce workers for Google to avoid rate limiting
         workers = min(workers, 2)
         logger.info(f"Using Google Translate (rate-limited to {workers} parallel batches)")
+        client = None
     else:
         logger.info(f"Using model: {GPT_MODEL}")
+        client = get_async_client()
 
     logger.info(f"Starting parallel translation with {workers} workers")
-    logger.info(f"Batching: {len(final_batches)} batches ({TRANSLATION_BATCH_MINUTES}-minute windows, max {MAX_SEGMENTS_PER_BATCH} segments/batch)")
+    logger.info(f"Batching: {len(batches)} batches ({TRANSLATION_BATCH_MINUTES}-minute windows, {_batch_limit_description()})")
 
-    batches = final_batches
+    semaphore = asyncio.Semaphore(workers)
+    pbar = tqdm(total=len(batches), desc="Translating", unit="batch")
 
-    all_translated = []
+    async def run_batch(batch, batch_num):
+        async with semaphore:
+            try:
+                return await _translate_batch_task(client, batch, batch_num, bulk_translator, fallback_chain)
+            finally:
+                pbar.update(1)
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        # Submit all batches for translation
-        future_to_batch = {
-            executor.submit(translate_batch, batch, idx, bulk_translator, fallback_chain): (batch, idx)
-            for idx, batch in enumerate(batches, 1)
-        }
+    try:
+        results = await asyncio.gather(*(
+            run_batch(batch, idx) for idx, batch in enumerate(batches, 1)
+        ))
+    finally:
+        pbar.close()
+        if client is not None:
+            await client.close()
 
-        # Collect results with progress bar
-        with tqdm(total=len(batches), desc="Translating", unit="batch") as pbar:
-            for future in as_completed(future_to_batch):
-                try:
-                    translated_batch = future.result()
-                    all_translated.extend(translated_batch)
-                except Exception as e:
-                    batch, batch_num = future_to_batch[future]
-                    logger.error(f"Unexpected error translating batch {batch_num}: {e}")
-                    all_translated.extend(batch)  # Keep originals on error
-                pbar.update(1)
+    all_translated = passthrough + [seg for batch in results for seg in batch]
 
     # Sort by start time
-    all_translated.sort(key=lambda x: x["start"])
+    all_translated.sort(key=itemgetter("start"))
 
+    _save_translation_cache()
     logger.info(f"Translation complete. Total segments: {len(all_translated)}")
 
     return all_translated
 
 
-def correct_translations(segments: List[Dict[str, any]]) -> List[Dict[str, any]]:
+# OpenAI Batch API: requests cost half as much but complete asynchronously,
+# within BATCH_COMPLETION_WINDOW; status is polled with exponential backoff
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_SECONDS = 10.0
+BATCH_MAX_POLL_SECONDS = 300.0
+_BATCH_DONE_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def run_chat_batch(requests: Dict[str, List[Dict[str, str]]], response_format: Dict[str, str] = None) -> Dict[str, str]:
     """
-    Correct and improve translations using GPT-4 with time-based batching for context.
+    Run chat completions through the OpenAI Batch API and wait for the results.
+
+    All requests are uploaded as one JSONL file and answered in one output
+    file, so N batches cost three calls (upload, create, download) plus status
+    polls instead of N round trips. Ctrl+C cancels the remote batch.
 
     Args:
-        segments: List of translated segments
+        requests: custom_id -> chat messages
+        response_format: response_format for every request (optional)
 
     Returns:
-        List of corrected segments
+        custom_id -> reply text, for the requests that succeeded
+
+    Raises:
+        RuntimeError: If no API key is configured or the batch failed or expired
     """
-    # Use same batching strategy as translation (time-based windows)
-    batch_window_seconds = TRANSLATION_BATCH_MINUTES * 60
-    batches = []
-    current_batch = []
-    batch_start_time = 0
+    client = get_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+
+    lines = []
+    for custom_id, messages in requests.items():
+        body = {"model": GPT_MODEL, "messages": messages, "temperature": 0.3, "max_tokens": 4000}
+        if response_format:
+            body["response_format"] = response_format
+        lines.append(json.dumps({"custom_id": custom_id, "method": "POST",
+                                 "url": "/v1/chat/completions", "body": body}, ensure_ascii=False))
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+    input_file = client.files.create(file=("requests.jsonl", payload), purpose="batch")
+    try:
+        batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions",
+                                      completion_window=BATCH_COMPLETION_WINDOW)
+        logger.info(f"Submitted {len(requests)} requests as OpenAI batch {batch.id}, waiting for results...")
+
+        delay = BATCH_POLL_SECONDS
+        try:
+            while batch.status not in _BATCH_DONE_STATUSES:
+                time.sleep(delay)
+                delay = min(delay * 2, BATCH_MAX_POLL_SECONDS)
+                batch = client.batches.retrieve(batch.id)
+                logger.debug(f"OpenAI batch {batch.id}: {batch.status}")
+        except KeyboardInterrupt:
+            client.batches.cancel(batch.id)
+            raise
+    finally:
+        try:
+            client.files.delete(input_file.id)
+        except Exception as e:
+            logger.debug(f"Could not delete batch input file {input_file.id}: {e}")
+
+    if batch.status != "completed":
+        raise RuntimeError(f"OpenAI batch {batch.id} {batch.status}")
+
+    replies = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).content.splitlines():
+            if not line.strip():
+                continue
+            record = json_loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                replies[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+
+    if len(replies) < len(requests):
+        logger.warning(f"OpenAI batch {batch.id}: {len(requests) - len(replies)}/{len(requests)} requests failed")
+    return replies
 
-    for segment in segments:
-        if segment["start"] >= batch_start_time + batch_window_seconds and current_batch:
-            batches.append(current_batch)
-            current_batch = [segment]
-            batch_start_time = segment["start"]
+
+def translate_segments_batch(segments: List[Dict[str, any]], fallback_chain: Sequence = None) -> List[Dict[str, any]]:
+    """
+    Translate all segments with OpenAI in one Batch API job (see run_chat_batch()).
+
+    Batches are built and parsed exactly as in translate_segments_async();
+    batches that failed or came back mostly empty are translated line by
+    line with the fallback chain.
+
+    Args:
+        segments: List of segments with original language text
+        fallback_chain: Fallback chain for failed translations
+
+    Returns:
+        List of segments with translated English text
+
+    Raises:
+        RuntimeError: If the batch job could not be run
+    """
+    fallback_chain = compile_fallback_chain(fallback_chain or _DEFAULT_FALLBACK_CHAIN)
+
+    segments, passthrough = _partition_trivial(segments)
+    segments, cached = _partition_cached(segments)
+    passthrough += cached
+    if cached:
+        logger.info(f"Reusing {len(cached)} cached translations")
+    batches = _build_translation_batches(segments)
+    logger.info(f"Using model: {GPT_MODEL} (Batch API)")
+    logger.info(f"Batching: {len(batches)} batches ({TRANSLATION_BATCH_MINUTES}-minute windows, {_batch_limit_description()})")
+
+    replies = run_chat_batch(
+        {f"b{batch_num}": _batch_translation_request(batch)[0] for batch_num, batch in enumerate(batches, 1)},
+        response_format={"type": "json_object"}
+    )
+
+    all_translated = passthrough
+    for batch_num, batch in enumerate(batches, 1):
+        translated_text = replies.get(f"b{batch_num}")
+        translated_lines, exact = _parse_translated_lines(translated_text, batch, batch_num, 0) if translated_text else ([], False)
+        if len(translated_lines) < len(batch) * 0.5:
+            all_translated.extend(_translate_lines_individually(batch, batch_num, fallback_chain))
         else:
-            if not current_batch:
-                batch_start_time = segment["start"]
+            all_translated.extend(_apply_translated_lines(translated_lines, batch, batch_num, cache=exact))
+
+    all_translated.sort(key=itemgetter("start"))
+
+    _save_translation_cache()
+    logger.info(f"Translation complete. Total segments: {len(all_translated)}")
+
+    return all_translated
+
+
+def translate_segments(segments: List[Dict[str, any]], workers: int = None,
+                      bulk_translator: str = "openai", fallback_chain: Sequence = None,
+                      use_batch_api: bool = False) -> List[Dict[str, any]]:
+    """
+    Translate all segments with time-based batching for better context.
+
+    Sync entry point; runs translate_segments_async() on a fresh event loop.
+
+    Args:
+        segments: List of segments with original language text
+        workers: Number of parallel workers (overrides config if provided)
+        bulk_translator: Bulk translation method ("openai" or "google")
+        fallback_chain: Fallback chain for failed translations (e.g., ["google", "openai", "untranslated"])
+        use_batch_api: Submit OpenAI translation as one Batch API job (half price,
+            may take hours); falls back to direct requests if the job fails
+
+    Returns:
+        List of segments with translated English text
+    """
+    if use_batch_api and bulk_translator == "openai":
+        try:
+            return translate_segments_batch(segments, fallback_chain)
+        except Exception as e:
+            logger.warning(f"Batch API translation failed, translating directly: {e}")
+    return asyncio.run(translate_segments_async(segments, workers, bulk_translator, fallback_chain))
+
+
+async def translate_segments_streaming_async(segment_queue: asyncio.Queue, workers: int = None,
+                                            bulk_translator: str = "openai",
+                                            fallback_chain: Sequence = None,
+                                            client=None) -> List[Dict[str, any]]:
+    """
+    Translate segments as transcription produces them.
+
+    Consumes (chunk_index, segments) items from segment_queue until None.
+    Chunks can finish out of order, so only the contiguous run of completed
+    chunks from index 0 is windowed; every segment in it starts before any
+    segment of a later chunk. A time window is submitted as soon as the next
+    segment closes it, giving the same batches as translate_segments().
+
+    Args:
+        segment_queue: Queue fed by transcribe_audio_async(segment_queue=...)
+        workers: Maximum concurrent batches (overrides config if provided)
+        bulk_translator: Bulk translation method ("openai" or "google")
+        fallback_chain: Fallback chain for failed translations
+        client: AsyncOpenAI client to use (left open); by default one is
+            created for this call and closed at the end
+
+    Returns:
+        List of segments with translated English text
+    """
+    if workers is None:
+        workers = TRANSLATION_WORKERS
+
+    fallback_chain = compile_fallback_chain(fallback_chain or _DEFAULT_FALLBACK_CHAIN)
+
+    owns_client = client is None and bulk_translator != "google"
+    if bulk_translator == "google":
+        # Reduce workers for Google to avoid rate limiting
+        workers = min(workers, 2)
+    elif owns_client:
+        client = get_async_client()
+
+    logger.info(f"Starting streaming translation with {workers} workers")
+
+    completed = {}  # chunk_index -> segments, waiting for earlier chunks
+    next_index = 0
+    current_batch = []
+    current_window = None
+    tasks = []
+    passthrough = []  # trivial segments, not sent for translation
+
+    semaphore = asyncio.Semaphore(workers)
+    pbar = tqdm(desc="Translating", unit="batch", total=0)
+
+    async def run_batch(batch, batch_num):
+        async with semaphore:
+            try:
+                return await _translate_batch_task(client, batch, batch_num, bulk_translator, fallback_chain)
+            finally:
+                pbar.update(1)
+
+    def submit(window):
+        window, skipped = _partition_trivial(window)
+        passthrough.extend(skipped)
+        if bulk_translator == "openai":
+            window, cached = _partition_cached(window)
+            passthrough.extend(cached)
+        for batch in _split_window(window):
+            tasks.append(asyncio.create_task(run_batch(batch, len(tasks) + 1)))
+            pbar.total += 1
+            pbar.refresh()
+
+    def add_ready(segments):
+        # Same windowing rule as _time_windows(), applied incrementally
+        nonlocal current_batch, current_window
+        for segment in sorted(segments, key=itemgetter("start")):
+            window = _window_index(segment)
+            if window != current_window and current_batch:
+                submit(current_batch)
+                current_batch = []
+            current_window = window
             current_batch.append(segment)
 
-    if current_batch:
-        batches.append(current_batch)
+    try:
+        while True:
+            item = await segment_queue.get()
+            if item is None:
+                break
+
+            index, segments = item
+            completed[index] = segments
+
+            # Advance over the contiguous prefix of finished chunks
+            ready = []
+            while next_index in completed:
+                ready.extend(completed.pop(next_index))
+                next_index += 1
+            add_ready(ready)
+
+        # Transcription finished: flush anything left (including chunks after a gap)
+        add_ready([seg for idx in sorted(completed) for seg in completed[idx]])
+        if current_batch:
+            submit(current_batch)
+
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        pbar.close()
+        if owns_client:
+            await client.close()
 
-    logger.info(f"Starting translation correction ({len(batches)} batches, {TRANSLATION_BATCH_MINUTES}-minute windows)")
+    all_translated = passthrough + [seg for batch in results for seg in batch]
 
-    corrected_segments = []
+    # Sort by start time
+    all_translated.sort(key=itemgetter("start"))
+
+    _save_translation_cache()
+    logger.info(f"Translation complete. Total segments: {len(all_translated)}")
+
+    return all_translated
+
+
+async def run_pipelined_async(chunks_generator, workers: int = None, translation_workers: int = None,
+                              bulk_translator: str = "openai",
+                              fallback_chain: Sequence = None) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+    """
+    Transcribe and translate with the two stages overlapped on one event loop.
 
-    # Process batches sequentially with progress bar
-    for batch_num, batch in enumerate(tqdm(batches, desc="Correcting", unit="batch"), 1):
-        # Create batch text
-        batch_text = "\n".join([f"{idx+1}. {seg['text']}" for idx, seg in enumerate(batch)])
+    Transcription feeds finished chunks through an asyncio.Queue to
+    translate_segments_streaming_async(); both share the loop, so all Whisper
+    and GPT requests are coroutines rather than threads. They also share one
+    client, whose pool is sized for both stages at full concurrency, so
+    Whisper uploads and GPT calls reuse the same connections.
 
+    Args:
+        chunks_generator: Generator that yields chunk information dictionaries
+        workers: Transcription workers (overrides config/auto-tuning if provided)
+        translation_workers: Translation workers (overrides config if provided)
+        bulk_translator: Bulk translation method ("openai" or "google")
+        fallback_chain: Fallback chain for failed translations
+
+    Returns:
+        Tuple of (source_segments, translated_segments), both sorted by start time
+    """
+    if workers is not None:
+        transcription_pool = workers
+    else:
+        transcription_pool = MAX_AUTO_WORKERS if AUTO_WORKERS else WORKERS
+    client = get_async_client(pool_size=transcription_pool + (translation_workers or TRANSLATION_WORKERS))
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+
+    segment_queue = asyncio.Queue()
+    try:
+        translation = asyncio.create_task(translate_segments_streaming_async(
+            segment_queue, translation_workers, bulk_translator, fallback_chain, client=client
+        ))
         try:
-            response = client.chat.completions.create(
-                model=GPT_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional subtitle editor. Clean up the following English subtitle lines "
-                                   "so they are natural, accurate, and preserve the emotional meaning of the original Japanese. "
-                                   "Fix mistranslations, unnatural phrasing, and missing nuance. "
-                                   "Maintain conversational flow and context between lines. "
-                                   "Do NOT censor content - preserve all sexual, vulgar, and explicit language exactly. "
-                                   "Do NOT soften crude or vulgar terms - maintain them as-is. "
-                                   "Return ONLY the corrected lines in the same numbered format."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Clean up these subtitle lines:\n\n{batch_text}"
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=4000
-            )
+            # Transcription always ends the queue with None, even when it fails
+            segments, _ = await transcribe_audio_async(chunks_generator, workers=workers,
+                                                       segment_queue=segment_queue, client=client)
+        except BaseException:
+            translation.cancel()
+            await asyncio.gather(translation, return_exceptions=True)
+            raise
+
+        return segments, await translation
+    finally:
+        await client.close()
+
+
+def run_pipelined(chunks_generator, workers: int = None, translation_workers: int = None,
+                  bulk_translator: str = "openai",
+                  fallback_chain: Sequence = None) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+    """
+    Transcribe and translate with the two stages overlapped.
+
+    Sync entry point; runs run_pipelined_async() on a fresh event loop.
+
+    Args:
+        chunks_generator: Generator that yields chunk information dictionaries
+        workers: Transcription workers (overrides config if provided)
+        translation_workers: Translation workers (overrides config if provided)
+        bulk_translator: Bulk translation method ("openai" or "google")
+        fallback_chain: Fallback chain for failed translations
+
+    Returns:
+        Tuple of (source_segments, translated_segments), both sorted by start time
+    """
+    return asyncio.run(run_pipelined_async(chunks_generator, workers, translation_workers,
+                                           bulk_translator, fallback_chain))
+
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _jaccard(a: str, b: str) -> float:
+    """Word-set Jaccard similarity of two English lines (case-insensitive)."""
+    words_a = set(_WORD_RE.findall(a.lower()))
+    words_b = set(_WORD_RE.findall(b.lower()))
+    if not words_a and not words_b:
+        return 1.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
 
-            corrected_text = response.choices[0].message.content.strip()
-
-            # Parse corrected lines
-            corrected_lines = []
-            for line in corrected_text.split("\n"):
-                line = line.strip()
-                if line and ". " in line:
-                    # Remove number prefix
-                    text = line.split(". ", 1)[1] if ". " in line else line
-                    corrected_lines.append(text)
-
-            # Update segments with corrected text
-            for idx, seg in enumerate(batch):
-                if idx < len(corrected_lines):
-                    seg["text"] = corrected_lines[idx]
+def flag_segments_for_correction(segments: List[Dict[str, any]], threshold: float = None,
+                                 workers: int = 2) -> int:
+    """
+    Cross-check translations with Google Translate and flag the lines that disagree.
+
+    Sets seg["needs_correction"] on every segment: False when the existing
+    translation and Google's translation of seg["original"] have word-set
+    Jaccard similarity >= threshold, True otherwise (or if Google fails).
+    Lines with nothing to translate (see _partition_trivial) are never
+    flagged. correct_translations() then only sends flagged lines to GPT-4.
+
+    Args:
+        segments: Translated segments with 'original' source text
+        threshold: Similarity needed to skip correction (default: AGREEMENT_THRESHOLD)
+        workers: Parallel Google batches (kept low to avoid rate limiting)
+
+    Returns:
+        Number of segments flagged for correction
+    """
+    from src.translate_google import translate_batch_google
+
+    if threshold is None:
+        threshold = AGREEMENT_THRESHOLD
+
+    # Punctuation-only lines ("♪", "…") would never agree word-wise; skip them
+    for seg in segments:
+        seg["needs_correction"] = False
+    sources, _ = _partition_trivial(
+        {"start": seg["start"], "end": seg["end"], "text": seg.get("original") or seg["text"], "segment": seg}
+        for seg in segments
+    )
+    size = MAX_SEGMENTS_PER_BATCH or GOOGLE_BUNDLE_SIZE
+    batches = [sources[i:i + size] for i in range(0, len(sources), size)]
+
+    logger.info(f"Cross-checking {len(sources)} translations with Google Translate")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda args: translate_batch_google(*args),
+            ((batch, batch_num) for batch_num, batch in enumerate(batches, 1))
+        ))
+    checks = [seg for batch in results for seg in batch]
+
+    flagged = 0
+    for source, check in zip(sources, checks):
+        seg = source["segment"]
+        # Google keeps the source text when it fails; that is no agreement
+        agrees = check["text"] != check["original"] and _jaccard(seg["text"], check["text"]) >= threshold
+        seg["needs_correction"] = not agrees
+        flagged += not agrees
+
+    logger.info(f"{flagged}/{len(segments)} lines disagree and will be corrected")
+    return flagged
+
+
+_CORRECTION_SYSTEM_PROMPT = (
+    "You are a professional subtitle editor. Clean up the following English subtitle lines "
+    "so they are natural, accurate, and preserve the emotional meaning of the original Japanese. "
+    "Fix mistranslations, unnatural phrasing, and missing nuance. "
+    "Maintain conversational flow and context between lines. "
+    "Lines marked [context] are surrounding dialogue for reference only: do not return them. "
+    "Do NOT censor content - preserve all sexual, vulgar, and explicit language exactly. "
+    "Do NOT soften crude or vulgar terms - maintain them as-is. "
+    "Return ONLY the corrected lines in the same numbered format, keeping their numbers."
+)
+
+# Unflagged lines sent on each side of a flagged line as read-only context
+CORRECTION_CONTEXT_LINES = 2
+
+# "12. text" or "12) text" at the start of a line; captures the number and the text
+_NUMBERED_ID_LINE_RE = re.compile(r"(?m)^[ \t]*(\d+)[.)][ \t]+(.*?)[ \t]*\r?$")
+
+
+def _correction_messages(batch: List[Dict[str, any]]) -> List[Dict[str, str]]:
+    """Build the chat messages for correcting a batch (context lines are marked read-only)."""
+    batch_text = "\n".join([
+        f"{idx+1}. {'' if seg.get('needs_correction', True) else '[context] '}{seg['text']}"
+        for idx, seg in enumerate(batch)
+    ])
+    return [
+        {
+            "role": "system",
+            "content": _CORRECTION_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"Clean up these subtitle lines:\n\n{batch_text}"
+        }
+    ]
+
+
+def _apply_corrections(corrected_text: str, batch: List[Dict[str, any]]) -> None:
+    """
+    Update flagged batch segments in place from a numbered correction reply.
+
+    Lines are matched by number; context lines and missing lines are kept.
+    """
+    for number, line in _NUMBERED_ID_LINE_RE.findall(corrected_text):
+        idx = int(number) - 1
+        if 0 <= idx < len(batch) and batch[idx].get("needs_correction", True) and line.strip():
+            batch[idx]["text"] = line.strip()
+
+
+async def correct_batch_async(client, batch: List[Dict[str, any]], batch_num: int) -> List[Dict[str, any]]:
+    """
+    Correct one batch with an AsyncOpenAI client.
+
+    Args:
+        client: AsyncOpenAI client (from config.get_async_client)
+        batch: Translated segments of one window (updated in place)
+        batch_num: Batch number for logging
+
+    Returns:
+        The batch, with uncorrected lines kept if the request failed
+    """
+    try:
+        response = await client.chat.completions.create(
+            model=GPT_MODEL,
+            messages=_correction_messages(batch),
+            temperature=0.3,
+            max_tokens=4000
+        )
+        _apply_corrections(response.choices[0].message.content.strip(), batch)
+    except Exception as e:
+        logger.warning(f"Correction failed for batch {batch_num}, using uncorrected: {e}")
+    return batch
+
+
+async def _correct_batches_async(batches: List[List[Dict[str, any]]], workers: int) -> None:
+    """Correct batches concurrently on one event loop, at most `workers` requests in flight."""
+    client = get_async_client()
+    semaphore = asyncio.Semaphore(workers)
+    pbar = tqdm(total=len(batches), desc="Correcting", unit="batch")
+
+    async def run_batch(batch, batch_num):
+        async with semaphore:
+            try:
+                return await correct_batch_async(client, batch, batch_num)
+            finally:
+                pbar.update(1)
+
+    try:
+        await asyncio.gather(*(
+            run_batch(batch, idx) for idx, batch in enumerate(batches, 1)
+        ))
+    finally:
+        pbar.close()
+        if client is not None:
+            await client.close()
+
+
+def correct_translations(segments: List[Dict[str, any]], use_batch_api: bool = False,
+                         workers: int = None) -> List[Dict[str, any]]:
+    """
+    Correct and improve translations using GPT-4 with time-based batching for context.
+
+    Segments marked needs_correction=False (see flag_segments_for_correction)
+    are kept as they are; up to CORRECTION_CONTEXT_LINES of them on each side
+    of a flagged line are sent as read-only context. Batches are corrected
+    concurrently, like translate_segments_async().
+
+    Args:
+        segments: List of translated segments
+        use_batch_api: Submit all batches as one Batch API job (half price,
+            may take hours); falls back to direct requests if the job fails
+        workers: Maximum concurrent batches (default: TRANSLATION_WORKERS)
+
+    Returns:
+        List of corrected segments
+    """
+    # Use same batching strategy as translation (time-based windows)
+    windows = list(_time_windows(segments))
+
+    logger.info(f"Starting translation correction ({len(windows)} batches, {TRANSLATION_BATCH_MINUTES}-minute windows)")
+
+    corrected_segments = []
+    batches = []
+
+    for window in windows:
+        # Lines flagged by flag_segments_for_correction() (all lines if not
+        # flagged), each with its unflagged neighbours as context
+        flagged = [idx for idx, seg in enumerate(window) if seg.get("needs_correction", True)]
+        sent = set()
+        for idx in flagged:
+            sent.update(range(max(0, idx - CORRECTION_CONTEXT_LINES),
+                              min(len(window), idx + CORRECTION_CONTEXT_LINES + 1)))
+        batch = []
+        for idx, seg in enumerate(window):
+            if idx in sent:
+                batch.append(seg)
+            else:
                 corrected_segments.append(seg)
+        if flagged:
+            batches.append(batch)
 
+    replies = None
+    if use_batch_api and batches:
+        try:
+            replies = run_chat_batch({f"b{batch_num}": _correction_messages(batch)
+                                      for batch_num, batch in enumerate(batches, 1)})
         except Exception as e:
-            logger.warning(f"Correction failed for batch {batch_num}, using uncorrected: {e}")
-            corrected_segments.extend(batch)
+            logger.warning(f"Batch API correction failed, correcting directly: {e}")
+
+    if replies is not None:
+        for batch_num, batch in enumerate(batches, 1):
+            if f"b{batch_num}" in replies:
+                _apply_corrections(replies[f"b{batch_num}"], batch)
+            else:
+                logger.warning(f"Correction failed for batch {batch_num}, using uncorrected")
+    elif batches:
+        asyncio.run(_correct_batches_async(batches, workers or TRANSLATION_WORKERS))
+
+    # Segments were corrected in place
+    corrected_segments.extend(seg for batch in batches for seg in batch)
+    for seg in corrected_segments:
+        seg.pop("needs_correction", None)
+
+    # Skipped lines were added ahead of their window's corrected lines
+    corrected_segments.sort(key=itemgetter("start"))
 
     logger.info("Correction complete")
 
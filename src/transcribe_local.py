@@ -3,16 +3,60 @@ Local transcription module using faster-whisper.
 Provides offline transcription without API costs.
 """
 
-from typing import List, Dict, Tuple, Optional
+import os
+import struct
+import threading
+from typing import List, Dict, Tuple, Optional, Union, TYPE_CHECKING
 from pathlib import Path
-from tqdm import tqdm
-from faster_whisper.vad import VadOptions
-from faster_whisper.audio import decode_audio
+from tqdm_wrapper import tqdm
 from utils import logger
 
+# numpy and faster-whisper (ctranslate2, PyAV, onnxruntime) are imported inside
+# the functions that need them, so importing this module stays cheap
+if TYPE_CHECKING:
+    import numpy as np
+    from faster_whisper.vad import VadOptions
+
 
 # Global model cache to avoid reloading
 _model_cache = {}
+# Held while a model loads, so a warm() thread and the first real caller
+# don't both load the same multi-GB model
+_model_lock = threading.Lock()
+
+# BatchedInferencePipeline per cached model, keyed by id(model) (see _transcribe)
+_pipeline_cache = {}
+
+# Default windows per forward pass for local transcription, by device
+DEFAULT_BATCH_SIZE = {"cuda": 16, "cpu": 4}
+
+# Temperatures tried in turn when a window's decode looks wrong (repetitive
+# or low-confidence); greedy decoding with this fallback is about as accurate
+# as beam search for medium/large models at a fraction of the cost
+DEFAULT_TEMPERATURE = (0.0, 0.2, 0.4)
+
+# Decoding options shared by both local tasks. Not conditioning on the
+# previous window's text stops Whisper looping on silence and music.
+DECODE_OPTIONS = {
+    "condition_on_previous_text": False,
+    "no_speech_threshold": 0.6,
+    "compression_ratio_threshold": 2.4,
+}
+
+# CPU compute types in order of preference. Half-precision activations only
+# show up in CTranslate2's supported list when the CPU handles them natively
+# (AVX512-BF16/AMX for bfloat16, ARM for float16); plain int8 keeps float32
+# activations and works everywhere.
+CPU_COMPUTE_TYPES = ("int8_bfloat16", "int8_float16", "int8")
+
+# Language detection looks for speech in this much audio from the start
+# first; running VAD over a whole film costs far more than the few encoder
+# windows detection actually needs
+DETECTION_SCAN_SECONDS = 600
+
+# CTranslate2 threads per model worker on CPU. Past ~16 threads the GEMMs
+# stop scaling and cross-socket memory traffic makes things slower.
+MAX_CPU_THREADS = 16
 
 
 class LanguageDetectionError(Exception):
@@ -20,6 +64,41 @@ class LanguageDetectionError(Exception):
     pass
 
 
+def resolve_device(device: str = "auto") -> str:
+    """Return "cuda" or "cpu" for a device setting ("auto" picks CUDA when available)."""
+    if device == "auto":
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    return device
+
+
+def _cpu_compute_type() -> str:
+    """Best int8 compute type this CPU supports (see CPU_COMPUTE_TYPES)."""
+    import ctranslate2
+    supported = ctranslate2.get_supported_compute_types("cpu")
+    return next((t for t in CPU_COMPUTE_TYPES if t in supported), "int8")
+
+
+def _physical_cores() -> int:
+    """
+    Physical cores this process may run on.
+
+    Counts distinct SMT sibling groups among the allowed CPUs on Linux;
+    elsewhere assumes two hardware threads per core.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        allowed = os.sched_getaffinity(0)
+        cores = set()
+        try:
+            for cpu in allowed:
+                with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                    cores.add(f.read().strip())
+            return len(cores)
+        except OSError:
+            return max(1, len(allowed) // 2)
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
 def get_model(model_size: str = "medium", device: str = "auto", compute_type: str = "auto"):
     """
     Get or create a cached Whisper model instance.
@@ -27,42 +106,150 @@ def get_model(model_size: str = "medium", device: str = "auto", compute_type: st
     Args:
         model_size: Model size (tiny, base, small, medium, large-v3)
         device: Device to use (auto, cuda, cpu)
-        compute_type: Compute type (auto, float16, int8, etc.)
+        compute_type: Compute type (auto = int8_float16 on Ampere+ GPUs, float16
+            on older GPUs, the best int8 variant the CPU supports)
 
     Returns:
         WhisperModel instance
     """
+    cpu_threads = min(_physical_cores(), MAX_CPU_THREADS)
+    # OpenMP runtimes loaded with faster-whisper would otherwise start one
+    # thread per logical CPU (hyperthreads included)
+    os.environ.setdefault("OMP_NUM_THREADS", str(cpu_threads))
     from faster_whisper import WhisperModel
 
     cache_key = f"{model_size}_{device}_{compute_type}"
 
-    if cache_key not in _model_cache:
-        # Auto-detect device if not specified
-        if device == "auto":
-            import torch
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(f"Auto-detected device: {device}")
+    with _model_lock:
+        if cache_key not in _model_cache:
+            # Auto-detect device if not specified
+            if device == "auto":
+                device = resolve_device(device)
+                logger.info(f"Auto-detected device: {device}")
 
-        # Auto-detect compute type based on device
-        if compute_type == "auto":
+            options = {}
             if device == "cuda":
-                compute_type = "float16"
+                import torch
+                # Ampere (compute capability 8.x) and newer have int8 tensor cores
+                # and support flash attention
+                ampere = torch.cuda.get_device_capability()[0] >= 8
+                if compute_type == "auto":
+                    compute_type = "int8_float16" if ampere else "float16"
+                # Flash attention needs half-precision activations
+                if ampere and compute_type.endswith(("float16", "bfloat16")):
+                    options["flash_attention"] = True
             else:
-                compute_type = "int8"
+                if compute_type == "auto":
+                    compute_type = _cpu_compute_type()
+                # One intra-op thread per physical core, two inter-op workers
+                options["cpu_threads"] = cpu_threads
+                options["num_workers"] = 2
+
+            logger.info(f"Loading Whisper model: {model_size} (device={device}, compute_type={compute_type})")
+            _model_cache[cache_key] = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                **options
+            )
+            logger.info("Model loaded successfully")
 
-        logger.info(f"Loading Whisper model: {model_size} (device={device}, compute_type={compute_type})")
-        _model_cache[cache_key] = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type
-        )
-        logger.info("Model loaded successfully")
+        return _model_cache[cache_key]
+
+
+def warm(model_size: str = "medium", device: str = "auto") -> None:
+    """
+    Start loading a model in a background thread.
+
+    Call as soon as the model settings are known, so loading (CUDA/cuDNN
+    initialization, or minutes on CPU) overlaps with audio extraction; the
+    first get_model() call then waits for this load instead of starting its own.
+    """
+    def load():
+        try:
+            get_model(model_size, device)
+        except Exception as e:
+            # get_model() raises again on first real use
+            logger.debug(f"Background model load failed: {e}")
+
+    threading.Thread(target=load, name="whisper-warm", daemon=True).start()
+
+
+def _wav_data_range(audio_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the sample data of a 16kHz mono 16-bit PCM WAV file.
 
-    return _model_cache[cache_key]
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Tuple of (byte offset, sample count), or None if the file isn't in
+        exactly that format (then it has to be decoded instead)
+    """
+    file_size = Path(audio_path).stat().st_size
+    with open(audio_path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            return None
+
+        pcm_mono_16k = False
+        # Walk the RIFF chunks: fmt, optional LIST (ffmpeg metadata), data
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                format_tag, channels, sample_rate = struct.unpack("<HHI", fmt[:8])
+                bits_per_sample = struct.unpack("<H", fmt[14:16])[0]
+                pcm_mono_16k = (format_tag == 1 and channels == 1
+                                and sample_rate == 16000 and bits_per_sample == 16)
+                f.seek(chunk_size % 2, 1)
+            elif chunk_id == b"data":
+                if not pcm_mono_16k:
+                    return None
+                offset = f.tell()
+                # Streamed WAVs may carry a placeholder size; trust the file size
+                data_size = min(chunk_size, file_size - offset)
+                return offset, data_size // 2
+            else:
+                f.seek(chunk_size + chunk_size % 2, 1)
+
+
+def load_audio(audio_path: str) -> "np.ndarray":
+    """
+    Load audio as a 16kHz mono float32 array.
+
+    WAVs written by extract_audio() (16kHz mono s16le) are memory-mapped and
+    converted in a single pass, so the samples are read from the OS page cache
+    instead of being decoded and resampled through PyAV. Anything else goes
+    through faster-whisper's decoder.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        float32 array of samples in [-1, 1)
+    """
+    import numpy as np
+
+    data_range = _wav_data_range(audio_path)
+    if data_range is None:
+        from faster_whisper.audio import decode_audio
+        return decode_audio(audio_path, sampling_rate=16000)
+
+    offset, num_samples = data_range
+    if num_samples == 0:
+        return np.zeros(0, dtype=np.float32)
+    samples = np.memmap(audio_path, dtype="<i2", mode="r", offset=offset, shape=(num_samples,))
+    audio = np.divide(samples, 32768.0, dtype=np.float32)
+    del samples  # Unmap; the float32 copy is all faster-whisper needs
+    return audio
 
 
 def detect_language(
-    audio_path: str,
+    audio: Union[str, "np.ndarray"],
     model_size: str = "medium",
     device: str = "auto",
     min_confidence: float = 0.7,
@@ -71,7 +258,7 @@ def detect_language(
     Detect the language of an audio file using VAD to find speech segments.
 
     Args:
-        audio_path: Path to the audio file
+        audio: Path to the audio file, or samples already loaded with load_audio()
         model_size: Model size (tiny, base, small, medium, large-v3)
         device: Device to use (auto, cuda, cpu)
         min_confidence: Minimum confidence threshold for detection
@@ -84,10 +271,13 @@ def detect_language(
     """
     model = get_model(model_size, device)
 
+    from faster_whisper.vad import VadOptions
+
     logger.info("Detecting language using VAD-based speech detection...")
 
     # Load audio as numpy array (16kHz mono)
-    audio = decode_audio(audio_path, sampling_rate=16000)
+    if isinstance(audio, (str, Path)):
+        audio = load_audio(str(audio))
 
     # Use VAD filter and multiple segments for robust detection
     # language_detection_segments=4 samples from different parts of the audio
@@ -95,13 +285,20 @@ def detect_language(
         threshold=0.5,
         min_silence_duration_ms=500,
     )
-    language, probability, all_probs = model.detect_language(
-        audio,
-        vad_filter=True,
-        vad_parameters=vad_options,
-        language_detection_segments=4,  # Sample from multiple segments
-        language_detection_threshold=0.5,
-    )
+    def detect(samples):
+        return model.detect_language(
+            samples,
+            vad_filter=True,
+            vad_parameters=vad_options,
+            language_detection_segments=4,  # Sample from multiple segments
+            language_detection_threshold=0.5,
+        )
+
+    scan_samples = DETECTION_SCAN_SECONDS * 16000
+    language, probability, all_probs = detect(audio[:scan_samples])
+    if probability <= 0.5 and len(audio) > scan_samples:
+        # No window near the start was decisive: look at the whole file
+        language, probability, all_probs = detect(audio)
 
     # Check if we got a valid detection
     if probability < 0.1:
@@ -119,14 +316,183 @@ def detect_language(
     return language, probability
 
 
+def _detection_windows(model, audio_path: str, num_segments: int, vad_options: "VadOptions") -> "np.ndarray":
+    """
+    Build the padded 30s mel windows used for language detection of one file.
+
+    Args:
+        model: WhisperModel instance (for its feature extractor)
+        audio_path: Path to an audio or video file (decoded with PyAV)
+        num_segments: Maximum number of 30s speech windows to keep
+        vad_options: VAD options used to drop non-speech audio
+
+    Returns:
+        Array of shape (windows, n_mels, nb_max_frames)
+
+    Raises:
+        LanguageDetectionError: If no speech is detected in the audio
+    """
+    import numpy as np
+    from faster_whisper.audio import decode_audio, pad_or_trim
+    from faster_whisper.vad import get_speech_timestamps
+
+    extractor = model.feature_extractor
+    audio = decode_audio(audio_path, sampling_rate=16000)
+
+    # Keep only speech, then the first num_segments * 30s of it. VAD scans
+    # the start of the file first and only the rest if that's too little speech.
+    scan_samples = DETECTION_SCAN_SECONDS * 16000
+    speech_chunks = get_speech_timestamps(audio[:scan_samples], vad_options)
+    if (len(audio) > scan_samples and
+            sum(chunk["end"] - chunk["start"] for chunk in speech_chunks) < num_segments * extractor.n_samples):
+        speech_chunks = get_speech_timestamps(audio, vad_options)
+    if not speech_chunks:
+        raise LanguageDetectionError(
+            "Could not detect language - no speech found in audio. "
+            "The audio may contain only music, silence, or sound effects."
+        )
+    audio = np.concatenate([audio[chunk["start"]:chunk["end"]] for chunk in speech_chunks])
+    audio = audio[:num_segments * extractor.n_samples]
+
+    features = extractor(audio)[..., :num_segments * extractor.nb_max_frames]
+    return np.stack([
+        pad_or_trim(features[..., i:i + extractor.nb_max_frames])
+        for i in range(0, features.shape[-1], extractor.nb_max_frames)
+    ])
+
+
+def detect_languages_batch(
+    audio_paths: List[str],
+    model_size: str = "medium",
+    device: str = "auto",
+    batch_size: int = 8,
+    language_detection_segments: int = 4,
+    language_detection_threshold: float = 0.5,
+) -> List[Union[Tuple[str, float], Exception]]:
+    """
+    Detect the language of several files with one batched encoder call per group.
+
+    Uses the same VAD + multi-segment rule as detect_language(), but stacks the
+    mel windows of up to batch_size files into a single encoder forward pass
+    instead of running one pass per file. Files are decoded with PyAV, so video
+    files can be passed directly without extracting their audio first.
+
+    Args:
+        audio_paths: Paths to the audio or video files
+        model_size: Model size (tiny, base, small, medium, large-v3)
+        device: Device to use (auto, cuda, cpu)
+        batch_size: Number of files per encoder call
+        language_detection_segments: Number of 30s speech windows per file
+        language_detection_threshold: Probability at which a window decides the language
+
+    Returns:
+        List aligned with audio_paths. Each entry is a (language_code, probability)
+        tuple, or the exception raised for that file (e.g. LanguageDetectionError
+        if no speech was found).
+    """
+    import numpy as np
+    from faster_whisper.vad import VadOptions
+
+    model = get_model(model_size, device)
+    vad_options = VadOptions(
+        threshold=0.5,
+        min_silence_duration_ms=500,
+    )
+    results = []
+
+    for start in range(0, len(audio_paths), batch_size):
+        group = audio_paths[start:start + batch_size]
+
+        # Decode and build windows per file; a bad file only fails itself
+        group_windows = []
+        for audio_path in group:
+            try:
+                group_windows.append(
+                    _detection_windows(model, str(audio_path), language_detection_segments, vad_options)
+                )
+            except Exception as e:
+                group_windows.append(e)
+
+        valid = [w for w in group_windows if not isinstance(w, Exception)]
+        if not valid:
+            results.extend(group_windows)
+            continue
+
+        # One encoder forward + language head for every window in the group
+        logger.info(f"Detecting language for {len(valid)} file(s) in one batch...")
+        encoder_output = model.encode(np.concatenate(valid))
+        window_probs = model.model.detect_language(encoder_output)
+
+        offset = 0
+        for audio_path, windows in zip(group, group_windows):
+            if isinstance(windows, Exception):
+                results.append(windows)
+                continue
+
+            # Same decision rule as WhisperModel.detect_language: the first confident
+            # window wins, otherwise majority vote across windows
+            votes = {}
+            for probs in window_probs[offset:offset + len(windows)]:
+                language, probability = probs[0][0][2:-2], probs[0][1]
+                if probability > language_detection_threshold:
+                    break
+                votes.setdefault(language, []).append(probability)
+            else:
+                language = max(votes, key=lambda lang: len(votes[lang]))
+                probability = max(votes[language])
+            offset += len(windows)
+
+            if probability < 0.1:
+                results.append(LanguageDetectionError(
+                    "Could not detect language - no speech found in audio. "
+                    "The audio may contain only music, silence, or sound effects."
+                ))
+                continue
+
+            logger.info(f"Detected language: {language} (confidence: {probability:.1%}) - {Path(audio_path).name}")
+            results.append((language, probability))
+
+    return results
+
+
+def _transcribe(model, audio: "np.ndarray", batch_size: int = 1, **options):
+    """
+    Run faster-whisper on loaded audio, batched when batch_size > 1.
+
+    With batch_size > 1, BatchedInferencePipeline splits the audio into
+    VAD-bounded windows and runs batch_size of them through the model per
+    forward pass. The pipeline is created once per model and reused.
+
+    Args:
+        model: WhisperModel instance
+        audio: 16kHz float32 samples from load_audio()
+        batch_size: Number of 30s windows decoded together (1 = sequential)
+        **options: Passed to transcribe() (language, task, beam_size, vad options, ...)
+
+    Returns:
+        Tuple of (segments iterator, TranscriptionInfo)
+    """
+    if batch_size > 1:
+        pipeline = _pipeline_cache.get(id(model))
+        if pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            pipeline = _pipeline_cache[id(model)] = BatchedInferencePipeline(model=model)
+        return pipeline.transcribe(audio, batch_size=batch_size, **options)
+
+    return model.transcribe(audio, **options)
+
+
 def transcribe_audio_local(
     audio_path: str,
     model_size: str = "medium",
     device: str = "auto",
     language: str = "ja",
-    beam_size: int = 5,
+    beam_size: int = 1,
+    best_of: int = 1,
+    temperature: Tuple[float, ...] = DEFAULT_TEMPERATURE,
     skip_language_check: bool = False,
     min_language_confidence: float = 0.7,
+    batch_size: Optional[int] = None,
 ) -> Tuple[List[Dict[str, any]], None]:
     """
     Transcribe audio using local faster-whisper model.
@@ -136,9 +502,14 @@ def transcribe_audio_local(
         model_size: Model size (tiny, base, small, medium, large-v3)
         device: Device to use (auto, cuda, cpu)
         language: Source language code (default: ja for Japanese)
-        beam_size: Beam size for decoding
+        beam_size: Beam size for decoding (1 = greedy, the fastest; 5 is slightly
+            more accurate but several times slower on long files)
+        best_of: Candidates sampled at non-zero temperatures
+        temperature: Temperature fallback sequence (see DEFAULT_TEMPERATURE)
         skip_language_check: Skip language detection check before transcription
         min_language_confidence: Minimum confidence for language detection
+        batch_size: Number of 30s windows per forward pass (1 = sequential decoding,
+            default: DEFAULT_BATCH_SIZE for the device)
 
     Returns:
         Tuple of (list of transcription segments, None for compatibility)
@@ -147,11 +518,16 @@ def transcribe_audio_local(
         LanguageDetectionError: If detected language doesn't match expected language
     """
     model = get_model(model_size, device)
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE[resolve_device(device)]
+
+    # Load the samples once; language detection and transcription share them
+    audio = load_audio(audio_path)
 
     # Check language before transcribing (unless skipped)
     if not skip_language_check:
         detected_lang, confidence = detect_language(
-            audio_path, model_size, device, min_language_confidence
+            audio, model_size, device, min_language_confidence
         )
 
         if detected_lang != language:
@@ -166,10 +542,15 @@ def transcribe_audio_local(
     logger.info(f"Transcribing with local Whisper ({model_size} model)...")
 
     # Transcribe with faster-whisper
-    segments_iter, info = model.transcribe(
-        audio_path,
+    segments_iter, info = _transcribe(
+        model,
+        audio,
+        batch_size=batch_size,
         language=language,
         beam_size=beam_size,
+        best_of=best_of,
+        temperature=temperature,
+        **DECODE_OPTIONS,
         vad_filter=True,  # Filter out silence
         vad_parameters=dict(
             min_silence_duration_ms=500,
@@ -185,7 +566,8 @@ def transcribe_audio_local(
     total_duration = info.duration
     bar_format = '{desc}: {percentage:3.0f}%|{bar}| {n:.0f}/{total:.0f}s [{elapsed}<{remaining}]'
 
-    with tqdm(total=total_duration, desc="Transcribing", unit="s", bar_format=bar_format) as pbar:
+    with tqdm(total=total_duration, desc="Transcribing", unit="s", bar_format=bar_format,
+              mininterval=0.5) as pbar:
         last_end = 0.0
         for segment in segments_iter:
             all_segments.append({
@@ -212,10 +594,13 @@ def transcribe_audio_local_translate(
     audio_path: str,
     model_size: str = "medium",
     device: str = "auto",
-    beam_size: int = 5,
+    beam_size: int = 1,
+    best_of: int = 1,
+    temperature: Tuple[float, ...] = DEFAULT_TEMPERATURE,
     skip_language_check: bool = False,
     min_language_confidence: float = 0.7,
     expected_language: str = "ja",
+    batch_size: Optional[int] = None,
 ) -> Tuple[List[Dict[str, any]], None]:
     """
     Transcribe and translate audio to English using local faster-whisper model.
@@ -224,10 +609,15 @@ def transcribe_audio_local_translate(
         audio_path: Path to the audio file (WAV)
         model_size: Model size (tiny, base, small, medium, large-v3)
         device: Device to use (auto, cuda, cpu)
-        beam_size: Beam size for decoding
+        beam_size: Beam size for decoding (1 = greedy, the fastest; 5 is slightly
+            more accurate but several times slower on long files)
+        best_of: Candidates sampled at non-zero temperatures
+        temperature: Temperature fallback sequence (see DEFAULT_TEMPERATURE)
         skip_language_check: Skip language detection check before transcription
         min_language_confidence: Minimum confidence for language detection
         expected_language: Expected source language (default: ja for Japanese)
+        batch_size: Number of 30s windows per forward pass (1 = sequential decoding,
+            default: DEFAULT_BATCH_SIZE for the device)
 
     Returns:
         Tuple of (list of translated segments in English, None for compatibility)
@@ -236,11 +626,16 @@ def transcribe_audio_local_translate(
         LanguageDetectionError: If detected language doesn't match expected language
     """
     model = get_model(model_size, device)
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE[resolve_device(device)]
+
+    # Load the samples once; language detection and transcription share them
+    audio = load_audio(audio_path)
 
     # Check language before transcribing (unless skipped)
     if not skip_language_check:
         detected_lang, confidence = detect_language(
-            audio_path, model_size, device, min_language_confidence
+            audio, model_size, device, min_language_confidence
         )
 
         if detected_lang != expected_language:
@@ -255,10 +650,15 @@ def transcribe_audio_local_translate(
     logger.info(f"Transcribing and translating with local Whisper ({model_size} model)...")
 
     # Transcribe with translation task
-    segments_iter, info = model.transcribe(
-        audio_path,
+    segments_iter, info = _transcribe(
+        model,
+        audio,
+        batch_size=batch_size,
         task="translate",  # Translate to English
         beam_size=beam_size,
+        best_of=best_of,
+        temperature=temperature,
+        **DECODE_OPTIONS,
         vad_filter=True,
         vad_parameters=dict(
             min_silence_duration_ms=500,
@@ -274,7 +674,8 @@ def transcribe_audio_local_translate(
     total_duration = info.duration
     bar_format = '{desc}: {percentage:3.0f}%|{bar}| {n:.0f}/{total:.0f}s [{elapsed}<{remaining}]'
 
-    with tqdm(total=total_duration, desc="Translating", unit="s", bar_format=bar_format) as pbar:
+    with tqdm(total=total_duration, desc="Translating", unit="s", bar_format=bar_format,
+              mininterval=0.5) as pbar:
         last_end = 0.0
         for segment in segments_iter:
             all_segments.append({
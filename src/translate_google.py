@@ -3,103 +3,300 @@ Google Translate module for subtitle translation.
 Uses deep-translator library for free translation with better compatibility.
 """
 
+import re
 import time
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+from typing import List, Dict, Optional, Tuple
 from deep_translator import GoogleTranslator
 from utils import logger
-from config import GOOGLE_BUNDLE_SIZE
+from config import GOOGLE_BUNDLE_SIZE, GOOGLE_WORKERS, GOOGLE_REQUESTS_PER_SECOND
 
 
-def translate_batch_google(batch: List[Dict[str, any]], batch_num: int) -> List[Dict[str, any]]:
+# Google rejects requests over 5000 characters
+GOOGLE_MAX_CHARS = 5000
+# The text goes in the GET query string, percent-encoded (about 9 bytes per
+# Japanese character); keep it well under the URL length Google's servers accept
+GOOGLE_MAX_QUERY_BYTES = 8000
+
+# Joins the lines of a bundle. Google merges and reflows newlines between short
+# lines; a run of asterisms (U+2042) is left alone as punctuation.
+BUNDLE_DELIMITER = " \u2042\u2042\u2042 "
+# Splits the translation back up (spacing around the asterisms may change)
+_DELIMITER_RE = re.compile(r"\s*\u2042+\s*")
+_ENCODED_DELIMITER_BYTES = len(quote_plus(BUNDLE_DELIMITER))
+
+# Adaptive bundle sizing (AIMD): after BUNDLE_WINS_TO_GROW full bundles in a
+# row come back intact at under TARGET_SECONDS_PER_LINE per line, grow by
+# BUNDLE_GROWTH lines; halve after a bundle comes back with lines merged or
+# lost. No bundle can hold more than MAX_BUNDLE_SIZE lines (one-character
+# lines) under GOOGLE_MAX_QUERY_BYTES, so growing past that gains nothing.
+TARGET_SECONDS_PER_LINE = 0.02
+MAX_BUNDLE_SIZE = GOOGLE_MAX_QUERY_BYTES // (_ENCODED_DELIMITER_BYTES + 1)
+BUNDLE_WINS_TO_GROW = 5
+BUNDLE_GROWTH = max(1, GOOGLE_BUNDLE_SIZE // 4)
+# Tries per bundle request before falling back to line-by-line
+BUNDLE_ATTEMPTS = 3
+
+# Bundle size learned from earlier batches, shared by concurrent batches
+_bundle_state = {"bundle_size": min(GOOGLE_BUNDLE_SIZE, MAX_BUNDLE_SIZE), "wins": 0}
+_bundle_state_lock = threading.Lock()
+
+
+class _RateLimiter:
+    """Token bucket shared by all threads: `rate` requests per second, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Every Google request in the process (all batches and threads) goes through this
+_rate_limiter = _RateLimiter(GOOGLE_REQUESTS_PER_SECOND, burst=GOOGLE_WORKERS)
+
+# GoogleTranslator.translate() stores the text on the instance, so each thread
+# keeps its own, one per (source, target) pair
+_local = threading.local()
+
+# Bundle workers shared by all batches (threads, and their translators, outlive a batch)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _translator(source: str = 'ja', target: str = 'en') -> GoogleTranslator:
+    """GoogleTranslator for the current thread, created on first use."""
+    cache = getattr(_local, "translators", None)
+    if cache is None:
+        cache = _local.translators = {}
+    translator = cache.get((source, target))
+    if translator is None:
+        translator = cache[(source, target)] = GoogleTranslator(source=source, target=target)
+    return translator
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool for bundle requests, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=GOOGLE_WORKERS, thread_name_prefix="google")
+        return _executor
+
+
+def _take_bundle(batch: List[Dict[str, any]], start: int, bundle_size: int) -> List[Dict[str, any]]:
     """
-    Translate a batch of segments using Google Translate with bundling strategy.
-    Bundles lines together to reduce API calls while avoiding rate limits.
+    Take up to bundle_size segments starting at start, staying under
+    GOOGLE_MAX_CHARS characters and GOOGLE_MAX_QUERY_BYTES once URL-encoded.
+
+    Always returns at least one segment so an over-long line still gets tried on its own.
+    """
+    bundle = []
+    chars = 0
+    query_bytes = 0
+    for seg in batch[start:start + bundle_size]:
+        chars += len(seg["text"]) + len(BUNDLE_DELIMITER)
+        query_bytes += len(quote_plus(seg["text"])) + _ENCODED_DELIMITER_BYTES
+        if bundle and (chars >= GOOGLE_MAX_CHARS or query_bytes > GOOGLE_MAX_QUERY_BYTES):
+            break
+        bundle.append(seg)
+    return bundle
+
+
+def _translate_lines(translator, bundle: List[Dict[str, any]], batch_num: int) -> List[Dict[str, any]]:
+    """
+    Translate segments one request at a time (fallback when a bundle fails).
 
     Args:
-        batch: List of segments with 'start', 'end', 'text' keys
+        translator: GoogleTranslator instance
+        bundle: Segments to translate
         batch_num: Batch number for logging
 
     Returns:
-        List of translated segments with 'original' field added
+        List of translated segments (original text kept on error)
     """
-    translator = GoogleTranslator(source='ja', target='en')
     translated_segments = []
-    bundle_size = GOOGLE_BUNDLE_SIZE
+    for seg in bundle:
+        try:
+            _rate_limiter.acquire()
+            result = translator.translate(seg["text"])
+            translated_segments.append({
+                "start": seg["start"],
+                "end": seg["end"],
+                "text": result,
+                "original": seg["text"]
+            })
+        except Exception as e:
+            logger.error(f"  Batch {batch_num}: Error translating line: {e}")
+            # Keep original Japanese text on error
+            translated_segments.append({
+                "start": seg["start"],
+                "end": seg["end"],
+                "text": seg["text"],
+                "original": seg["text"]
+            })
+    return translated_segments
+
+
+def _translate_bundle(bundle: List[Dict[str, any]],
+                      batch_num: int) -> Tuple[List[Dict[str, any]], Optional[float], bool]:
+    """
+    Translate a bundle of lines in one request (runs in a worker thread).
+
+    Args:
+        bundle: Segments to translate together
+        batch_num: Batch number for logging
 
-    logger.info(f"  Batch {batch_num}: Translating {len(batch)} segments (bundling {bundle_size} lines per API call)")
+    A bundle whose translation comes back with the wrong number of lines
+    (Google merged or reflowed some) is split in half and each half retried
+    as a bundle, so a mismatch costs a few extra requests rather than one
+    per line. A request that fails outright (network error, rate limit) is
+    retried as the same bundle, then line by line.
 
-    # Process batch in bundles
-    for i in range(0, len(batch), bundle_size):
-        bundle = batch[i:i + bundle_size]
+    Returns:
+        Tuple of (translated segments, seconds per line or None if the bundle
+        was split or sent line by line, True if the line count came back wrong)
+    """
+    translator = _translator()
 
-        # Bundle lines with newline separator
-        bundled_text = "\n".join([seg["text"] for seg in bundle])
+    # Bundle lines with the delimiter between them
+    bundled_text = BUNDLE_DELIMITER.join([seg["text"] for seg in bundle])
 
+    for attempt in range(BUNDLE_ATTEMPTS):
         try:
             # Translate bundled text
+            _rate_limiter.acquire()
+            started = time.monotonic()
             result = translator.translate(bundled_text)
-            translations = result.split('\n')
-
-            # Verify we got the right number of translations
-            if len(translations) != len(bundle):
-                logger.warning(f"  Batch {batch_num}: Bundle translation line count mismatch "
-                             f"(expected {len(bundle)}, got {len(translations)}). Falling back to line-by-line.")
-
-                # Fallback to line-by-line for this bundle
-                for seg in bundle:
-                    try:
-                        result = translator.translate(seg["text"])
-                        translated_segments.append({
-                            "start": seg["start"],
-                            "end": seg["end"],
-                            "text": result,
-                            "original": seg["text"]
-                        })
-                    except Exception as e:
-                        logger.error(f"  Batch {batch_num}: Error translating line: {e}")
-                        # Keep original Japanese text on error
-                        translated_segments.append({
-                            "start": seg["start"],
-                            "end": seg["end"],
-                            "text": seg["text"],
-                            "original": seg["text"]
-                        })
-            else:
-                # Successful bundle translation
-                for seg, translation in zip(bundle, translations):
-                    translated_segments.append({
-                        "start": seg["start"],
-                        "end": seg["end"],
-                        "text": translation.strip(),
-                        "original": seg["text"]
-                    })
-
-            # Small delay to avoid rate limiting
-            time.sleep(0.2)
-
+            elapsed = time.monotonic() - started
+            break
         except Exception as e:
-            logger.error(f"  Batch {batch_num}: Error in bundle translation: {e}")
-
-            # Fallback to line-by-line for this bundle
-            for seg in bundle:
-                try:
-                    result = translator.translate(seg["text"])
-                    translated_segments.append({
-                        "start": seg["start"],
-                        "end": seg["end"],
-                        "text": result,
-                        "original": seg["text"]
-                    })
-                    time.sleep(0.2)
-                except Exception as line_error:
-                    logger.error(f"  Batch {batch_num}: Error translating line: {line_error}")
-                    # Keep original Japanese text on error
-                    translated_segments.append({
-                        "start": seg["start"],
-                        "end": seg["end"],
-                        "text": seg["text"],
-                        "original": seg["text"]
-                    })
+            logger.error(f"  Batch {batch_num}: Error in bundle translation (attempt {attempt + 1}): {e}")
+            if attempt < BUNDLE_ATTEMPTS - 1:
+                time.sleep(2 ** attempt)
+    else:
+        # Fallback to line-by-line for this bundle
+        return _translate_lines(translator, bundle, batch_num), None, False
+
+    # A single line is its own translation, whatever Google did to it
+    translations = _DELIMITER_RE.split(result) if len(bundle) > 1 else [result]
+    translations = [translation.replace('\n', ' ') for translation in translations]
+
+    # Verify we got the right number of translations
+    if len(translations) != len(bundle):
+        logger.warning(f"  Batch {batch_num}: Bundle translation line count mismatch "
+                     f"(expected {len(bundle)}, got {len(translations)}). Splitting bundle in half.")
+        half = len(bundle) // 2
+        first, _, _ = _translate_bundle(bundle[:half], batch_num)
+        second, _, _ = _translate_bundle(bundle[half:], batch_num)
+        return first + second, None, True
+
+    # Successful bundle translation
+    translated_segments = []
+    for seg, translation in zip(bundle, translations):
+        translated_segments.append({
+            "start": seg["start"],
+            "end": seg["end"],
+            "text": translation.strip(),
+            "original": seg["text"]
+        })
+    return translated_segments, elapsed / len(bundle), False
+
+
+def _record_bundles(bundle_size: int, outcomes: List[Tuple[bool, Optional[float], bool]], batch_num: int) -> None:
+    """
+    Adapt the shared bundle size to how a batch's bundles went.
+
+    Only a line-count mismatch shrinks the bundle; a failed request says
+    nothing about the size, so it neither shrinks nor counts as a win.
+
+    Args:
+        bundle_size: Bundle size the batch was cut with
+        outcomes: (bundle was full, seconds per line or None, line count
+            mismatched) per bundle, as returned by _translate_bundle
+        batch_num: Batch number for logging
+    """
+    with _bundle_state_lock:
+        # Another batch has already moved the size on; its outcome is newer
+        if _bundle_state["bundle_size"] != bundle_size:
+            return
+        new_size = bundle_size
+        for full, per_line, mismatched in outcomes:
+            if mismatched:
+                # Smaller bundles are less likely to merge lines
+                new_size = max(1, bundle_size // 2)
+                _bundle_state["wins"] = 0
+                break
+            if full and per_line is not None and per_line < TARGET_SECONDS_PER_LINE:
+                _bundle_state["wins"] += 1
+        else:
+            if _bundle_state["wins"] >= BUNDLE_WINS_TO_GROW:
+                # Cheap round-trip per line: send more lines per request
+                new_size = min(bundle_size + BUNDLE_GROWTH, MAX_BUNDLE_SIZE)
+                _bundle_state["wins"] = 0
+        if new_size != bundle_size:
+            _bundle_state["bundle_size"] = new_size
+            logger.info(f"  Batch {batch_num}: Google bundle size {bundle_size} -> {new_size} lines")
+
+
+def translate_batch_google(batch: List[Dict[str, any]], batch_num: int) -> List[Dict[str, any]]:
+    """
+    Translate a batch of segments using Google Translate with bundling strategy.
+    Bundles lines together (joined by BUNDLE_DELIMITER) to reduce API calls
+    while avoiding rate limits.
+
+    The batch is cut into bundles of the current bundle size (never over
+    GOOGLE_MAX_CHARS or GOOGLE_MAX_QUERY_BYTES), which are sent by up to GOOGLE_WORKERS threads at
+    once; all requests share a GOOGLE_REQUESTS_PER_SECOND rate limit. The
+    bundle size starts at GOOGLE_BUNDLE_SIZE and adapts for later batches
+    (see _record_bundles).
+
+    Args:
+        batch: List of segments with 'start', 'end', 'text' keys
+        batch_num: Batch number for logging
+
+    Returns:
+        List of translated segments with 'original' field added
+    """
+    with _bundle_state_lock:
+        bundle_size = _bundle_state["bundle_size"]
+
+    logger.info(f"  Batch {batch_num}: Translating {len(batch)} segments (bundling up to {bundle_size} lines per API call)")
+
+    bundles = []
+    i = 0
+    while i < len(batch):
+        bundle = _take_bundle(batch, i, bundle_size)
+        bundles.append(bundle)
+        i += len(bundle)
+
+    if len(bundles) > 1 and GOOGLE_WORKERS > 1:
+        results = list(_get_executor().map(_translate_bundle, bundles, [batch_num] * len(bundles)))
+    else:
+        results = [_translate_bundle(bundle, batch_num) for bundle in bundles]
+
+    _record_bundles(bundle_size, [
+        (len(bundle) == bundle_size, per_line, mismatched)
+        for bundle, (_, per_line, mismatched) in zip(bundles, results)
+    ], batch_num)
+
+    translated_segments = [seg for segments, _, _ in results for seg in segments]
 
     logger.info(f"  Batch {batch_num}: Translated {len(translated_segments)} segments successfully")
     return translated_segments
@@ -117,10 +314,9 @@ def translate_single_line_google(segment: Dict[str, any], line_num: int) -> Dict
     Returns:
         Translated segment with 'original' field added
     """
-    translator = GoogleTranslator(source='ja', target='en')
-
     try:
-        result = translator.translate(segment["text"])
+        _rate_limiter.acquire()
+        result = _translator().translate(segment["text"])
         return {
             "start": segment["start"],
             "end": segment["end"],
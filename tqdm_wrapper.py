@@ -8,61 +8,29 @@ import os
 # Check if TUI mode is active via environment variable
 TUI_ACTIVE = os.getenv('SUBSCENE_TUI_MODE') == '1'
 
+
+def _noop(self, *args, **kwargs):
+    pass
+
+
 class tqdm_or_dummy:
-    """Wrapper that returns dummy tqdm when TUI is active"""
+    """Do-nothing stand-in for tqdm, used when TUI is active"""
 
-    def __init__(self, *args, **kwargs):
-        if TUI_ACTIVE:
-            # Return dummy that does nothing
-            self._pbar = None
-            self._iterable = args[0] if args else None
-        else:
-            self._pbar = original_tqdm(*args, **kwargs)
-            self._iterable = None
+    def __init__(self, iterable=None, *args, **kwargs):
+        self._iterable = iterable
+        self.total = kwargs.get('total', 0)
 
     def __enter__(self):
-        if self._pbar:
-            return self._pbar.__enter__()
         return self
 
     def __exit__(self, *args):
-        if self._pbar:
-            return self._pbar.__exit__(*args)
+        pass
 
     def __iter__(self):
-        if self._pbar:
-            return iter(self._pbar)
-        elif self._iterable:
-            return iter(self._iterable)
-        return iter([])
-
-    def update(self, n=1):
-        if self._pbar:
-            self._pbar.update(n)
-
-    def close(self):
-        if self._pbar:
-            self._pbar.close()
-
-    def set_description(self, desc):
-        if self._pbar:
-            self._pbar.set_description(desc)
-
-    def refresh(self):
-        if self._pbar:
-            self._pbar.refresh()
-
-    @property
-    def total(self):
-        if self._pbar:
-            return self._pbar.total
-        return 0
+        return iter(self._iterable if self._iterable is not None else [])
 
-    @total.setter
-    def total(self, value):
-        if self._pbar:
-            self._pbar.total = value
+    update = close = set_description = refresh = _noop
 
 
-# Export as tqdm
-tqdm = tqdm_or_dummy
+# Export as tqdm (chosen once, so real progress bars aren't wrapped at all)
+tqdm = tqdm_or_dummy if TUI_ACTIVE else original_tqdm
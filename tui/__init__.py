@@ -3,7 +3,15 @@ Terminal UI module for Subscene Generator.
 Provides a beautiful, interactive terminal interface using Textual.
 """
 
-from .app import SubsceneApp
 from .event_bus import EventBus
 
 __all__ = ['SubsceneApp', 'EventBus']
+
+
+def __getattr__(name):
+    # Textual is only imported when the app itself is used, so processing
+    # code (and the processing child process) can use the event bus without it
+    if name == 'SubsceneApp':
+        from .app import SubsceneApp
+        return SubsceneApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,7 @@ from textual.widgets import Header, Footer
 from textual import work
 from typing import Optional
 import asyncio
+import threading
 
 from .widgets import (
     HeaderWidget,
@@ -33,9 +34,11 @@ class SubsceneApp(App):
         ("l", "toggle_log_level", "Toggle Log Level"),
     ]
 
-    def __init__(self, progress_tracker: ProgressTracker, **kwargs):
+    def __init__(self, progress_tracker: ProgressTracker,
+                 ready_event: Optional[threading.Event] = None, **kwargs):
         super().__init__(**kwargs)
         self.tracker = progress_tracker
+        self.ready_event = ready_event
         self.update_interval = 0.5  # Update every 500ms
 
         # Widgets (will be populated in compose)
@@ -73,6 +76,10 @@ class SubsceneApp(App):
         """Called when app is mounted."""
         self.run_worker(self.update_ui_loop(), exclusive=True)
 
+        # Screen is live: let the processing thread start emitting events
+        if self.ready_event is not None:
+            self.ready_event.set()
+
     @work(exclusive=True)
     async def update_ui_loop(self) -> None:
         """Continuously update the UI from tracker state."""
@@ -172,9 +179,14 @@ class SubsceneApp(App):
 class TUIManager:
     """Manager for running the TUI app in a separate thread."""
 
-    def __init__(self):
+    def __init__(self, ready_event=None):
         self.tracker = ProgressTracker()
         self.app: Optional[SubsceneApp] = None
+        # Set once the app has mounted (processing waits on this instead of sleeping).
+        # Pass a multiprocessing.Event when processing runs in a child process.
+        self.ready_event = ready_event if ready_event is not None else threading.Event()
+        # Set when the processing thread has finished, successfully or not
+        self.processing_done = threading.Event()
         self._setup_event_handlers()
 
     def _setup_event_handlers(self):
@@ -182,6 +194,7 @@ class TUIManager:
         # Pipeline events
         event_bus.subscribe(Events.PIPELINE_START, self._handle_pipeline_start)
         event_bus.subscribe(Events.PIPELINE_COMPLETE, self._handle_pipeline_complete)
+        event_bus.subscribe(Events.PROCESSING_DONE, self._handle_processing_done)
         event_bus.subscribe(Events.STEP_START, self._handle_step_start)
         event_bus.subscribe(Events.STEP_COMPLETE, self._handle_step_complete)
         event_bus.subscribe(Events.STEP_PROGRESS, self._handle_step_progress)
@@ -211,6 +224,11 @@ class TUIManager:
         """Handle pipeline complete event."""
         self.tracker.complete_pipeline()
 
+    def _handle_processing_done(self, event_type: str, data: dict):
+        """Handle processing thread exit."""
+        self.processing_done.set()
+        self.tracker.add_log("INFO", "Processing finished - press 'q' to quit")
+
     def _handle_step_start(self, event_type: str, data: dict):
         """Handle step start event."""
         self.tracker.start_step(data["step_index"])
@@ -269,8 +287,12 @@ class TUIManager:
 
     def run(self):
         """Run the TUI app."""
-        self.app = SubsceneApp(self.tracker)
-        self.app.run()
+        self.app = SubsceneApp(self.tracker, ready_event=self.ready_event)
+        try:
+            self.app.run()
+        finally:
+            # Never leave the processing thread waiting on a TUI that failed to start
+            self.ready_event.set()
 
     def is_paused(self) -> bool:
         """Check if user requested pause."""
@@ -1,8 +1,14 @@
 """
 Event Bus for communication between processing functions and TUI.
 Thread-safe pub/sub system for real-time progress updates.
+
+When processing runs in a child process, the child's bus forwards every event
+through a multiprocessing queue (set_forward_queue) and start_queue_bridge()
+re-emits them on the TUI process's bus.
 """
 
+import queue
+import threading
 from threading import Lock
 from typing import Callable, Dict, List, Any
 from collections import defaultdict
@@ -28,8 +34,13 @@ class EventBus:
 
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
         self._lock = Lock()
+        self._forward_queue = None
         self._initialized = True
 
+    def set_forward_queue(self, event_queue) -> None:
+        """Also send every emitted event to event_queue (e.g. a multiprocessing.Queue)."""
+        self._forward_queue = event_queue
+
     def subscribe(self, event_type: str, callback: Callable) -> None:
         """Subscribe to an event type."""
         with self._lock:
@@ -43,6 +54,9 @@ class EventBus:
 
     def emit(self, event_type: str, data: Any = None) -> None:
         """Emit an event to all subscribers."""
+        if self._forward_queue is not None:
+            self._forward_queue.put((event_type, data))
+
         with self._lock:
             callbacks = self._subscribers.get(event_type, []).copy()
 
@@ -76,6 +90,7 @@ class Events:
     PIPELINE_START = "pipeline_start"
     PIPELINE_COMPLETE = "pipeline_complete"
     PIPELINE_ERROR = "pipeline_error"
+    PROCESSING_DONE = "processing_done"
     STEP_START = "step_start"
     STEP_COMPLETE = "step_complete"
     STEP_PROGRESS = "step_progress"
@@ -134,3 +149,40 @@ class Events:
     USER_RESUME = "user_resume"
     USER_SKIP_CORRECTION = "user_skip_correction"
     USER_QUIT = "user_quit"
+
+
+def start_queue_bridge(event_queue, process=None, poll_interval: float = 0.5) -> threading.Thread:
+    """
+    Re-emit events from a child process on this process's event bus.
+
+    Runs a daemon thread that pumps (event_type, data) tuples from event_queue
+    into event_bus until a None sentinel arrives. If process is given and
+    exits without sending the sentinel (crash, kill), a PIPELINE_ERROR and
+    PROCESSING_DONE are emitted so the TUI doesn't wait forever.
+
+    Args:
+        event_queue: multiprocessing.Queue the child forwards events to
+        process: The child multiprocessing.Process (optional)
+        poll_interval: Seconds between liveness checks while the queue is idle
+
+    Returns:
+        The started bridge thread
+    """
+    def pump():
+        while True:
+            try:
+                item = event_queue.get(timeout=poll_interval)
+            except queue.Empty:
+                if process is not None and not process.is_alive():
+                    event_bus.emit(Events.PIPELINE_ERROR,
+                                   {"error": f"Processing exited unexpectedly (exit code {process.exitcode})"})
+                    event_bus.emit(Events.PROCESSING_DONE, {})
+                    return
+                continue
+            if item is None:
+                return
+            event_bus.emit(*item)
+
+    thread = threading.Thread(target=pump, name="event-bridge", daemon=True)
+    thread.start()
+    return thread
@@ -4,9 +4,14 @@ Utility functions for the Whisper Subtitle Generator.
 
 import os
 import json
+import mmap
+import hashlib
+import functools
+import shutil
 import logging
+import tempfile
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterator
 from datetime import datetime
 
 # Supported video file extensions
@@ -24,26 +29,59 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: a C JSON codec working directly on bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def validate_video_path(video_path: str) -> Path:
-    """
-    Validate that the video file exists and is accessible.
+# zstandard is optional: faster, smaller stage checkpoints than gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-    Args:
-        video_path: Path to the video file (absolute or relative)
 
-    Returns:
-        Path object of the validated video file
+def json_loads(data: bytes) -> Any:
+    """Parse JSON from bytes (orjson if installed, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    Raises:
-        FileNotFoundError: If video file doesn't exist
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes (orjson if installed, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
     """
-    path = Path(video_path).resolve()
-    if not path.exists():
-        raise FileNotFoundError(f"Video file not found: {video_path}")
-    if not path.is_file():
-        raise ValueError(f"Path is not a file: {video_path}")
-    return path
+    Write a file atomically: write a temp file in the same directory, then rename.
+
+    Readers never see a truncated file, even if the process dies mid-write.
+
+    Args:
+        path: Destination path
+        data: File contents
+    """
+    tmp_path = path.parent / f".{path.name}.{os.urandom(6).hex()}.tmp"
+    # Created 0666 minus the umask, as a plain open() would; O_EXCL so an
+    # existing file (or symlink) is never written through
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # Keep the permissions of the file being replaced
+            try:
+                os.fchmod(f.fileno(), os.stat(path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def validate_input_path(input_path: str) -> Tuple[Path, bool]:
@@ -78,29 +116,33 @@ def is_video_file(path: Path) -> bool:
     return path.suffix.lower() in VIDEO_EXTENSIONS
 
 
-def find_video_files(directory: Path, recursive: bool = True) -> List[Path]:
+def _iter_files(directory: Path, recursive: bool = True) -> Iterator[os.DirEntry]:
     """
-    Find all video files in a directory.
+    Walk a directory with os.scandir and yield an entry for every regular file.
+
+    File/directory checks use the type readdir already returned, so no extra
+    stat() call is made per entry (unlike Path.rglob + is_file). Symlinked
+    directories are not followed, matching rglob.
 
     Args:
         directory: Directory to search
         recursive: If True, search subdirectories recursively
 
-    Returns:
-        Sorted list of video file paths
+    Yields:
+        os.DirEntry for each file
     """
-    video_files = []
-    if recursive:
-        # Single pass through all files, filter by extension in Python
-        for path in directory.rglob("*"):
-            if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS:
-                video_files.append(path)
-    else:
-        for path in directory.iterdir():
-            if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS:
-                video_files.append(path)
-
-    return sorted(video_files)
+    pending = [str(directory)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Cannot read directory: {e}")
 
 
 def scan_video_folder(directory: Path, recursive: bool = True) -> dict:
@@ -117,53 +159,55 @@ def scan_video_folder(directory: Path, recursive: bool = True) -> dict:
     Returns:
         Dict with:
         - videos: List of video file paths
-        - srt_set: Set of video stems that have .srt files
+        - srt_set: Set of video paths that have .srt files
         - metadata: Dict mapping video path -> loaded metadata (or None)
+        - sizes: Dict mapping video path -> file size in bytes
     """
     video_files = []
-    srt_stems = set()  # Store stems of files that have SRTs
-    metadata_files = {}  # Map video base name -> metadata file path
+    sizes = {}
+    srt_keys = set()  # (directory, stem) of every SRT file found
+    metadata_files = {}  # Map (directory, video file name) -> metadata file path
 
     # Single pass through all files
-    iterator = directory.rglob("*") if recursive else directory.iterdir()
+    for entry in _iter_files(directory, recursive):
+        name = entry.name
+        stem, suffix = os.path.splitext(name)
+        suffix_lower = suffix.lower()
 
-    for path in iterator:
-        if not path.is_file():
-            continue
-
-        suffix_lower = path.suffix.lower()
-
-        # Collect video files
+        # Collect video files (size comes from the entry's cached stat)
         if suffix_lower in VIDEO_EXTENSIONS:
+            path = Path(entry.path)
             video_files.append(path)
-        # Track SRT files by their stem (filename without extension)
+            sizes[path] = entry.stat().st_size
+        # Track SRT files by directory + stem (filename without extension)
         elif suffix_lower == '.srt':
-            srt_stems.add(path.stem)
+            srt_keys.add((os.path.dirname(entry.path), stem))
         # Track metadata files
-        elif path.name.endswith(METADATA_SUFFIX):
+        elif name.endswith(METADATA_SUFFIX):
             # Extract the video filename this metadata belongs to
             # e.g., "video.mp4.subscene.json" -> "video.mp4"
-            video_name = path.name[:-len(METADATA_SUFFIX)]
-            metadata_files[video_name] = path
+            video_name = name[:-len(METADATA_SUFFIX)]
+            metadata_files[(os.path.dirname(entry.path), video_name)] = entry.path
 
     # Sort videos
     video_files = sorted(video_files)
 
     # Build set of video paths that have SRTs (for fast lookup)
-    # A video "foo.mp4" has an SRT if "foo" is in srt_stems
-    srt_set = set()
-    for video_path in video_files:
-        if video_path.stem in srt_stems:
-            srt_set.add(video_path)
+    # A video "dir/foo.mp4" has an SRT only if "dir/foo.srt" exists - a "foo.srt"
+    # in another subfolder belongs to a different video
+    srt_set = {
+        video_path for video_path in video_files
+        if (str(video_path.parent), video_path.stem) in srt_keys
+    }
 
     # Load metadata for each video (reading files is unavoidable, but we know which exist)
     metadata = {}
     for video_path in video_files:
-        meta_path = metadata_files.get(video_path.name)
+        meta_path = metadata_files.get((str(video_path.parent), video_path.name))
         if meta_path:
             try:
-                with open(meta_path, 'r', encoding='utf-8') as f:
-                    metadata[video_path] = json.load(f)
+                with open(meta_path, 'rb') as f:
+                    metadata[video_path] = json_loads(f.read())
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Failed to load metadata for {video_path.name}: {e}")
                 metadata[video_path] = None
@@ -173,7 +217,8 @@ def scan_video_folder(directory: Path, recursive: bool = True) -> dict:
     return {
         'videos': video_files,
         'srt_set': srt_set,
-        'metadata': metadata
+        'metadata': metadata,
+        'sizes': sizes
     }
 
 
@@ -229,29 +274,265 @@ def format_timestamp_srt(seconds: float) -> str:
     Returns:
         Formatted timestamp string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    # Round to whole milliseconds first: truncating the float (1.2 -> 1.199)
+    # drifted by 1 ms on every SRT load/save round trip
+    return _format_millis_srt(round(seconds * 1000))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _format_millis_srt(total_millis: int) -> str:
+    """Format whole milliseconds as HH:MM:SS,mmm (cached: timestamps repeat across segments)."""
+    hours, rest = divmod(total_millis, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    secs, millis = divmod(rest, 1000)
 
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
-def cleanup_files(*file_paths: str) -> None:
+# Minimum free space for putting transient audio on the RAM-backed /dev/shm
+SCRATCH_MIN_FREE_BYTES = 2 * 1024 ** 3
+
+
+def get_scratch_dir() -> Optional[str]:
+    """
+    Pick the parent directory for per-video temporary audio directories.
+
+    Uses /dev/shm (RAM-backed, no disk writeback) when it is writable and has
+    enough free space, otherwise the system default temp directory.
+
+    Returns:
+        "/dev/shm", or None to let tempfile choose
+    """
+    shm = "/dev/shm"
+    try:
+        if os.access(shm, os.W_OK) and shutil.disk_usage(shm).free >= SCRATCH_MIN_FREE_BYTES:
+            return shm
+    except OSError:
+        pass
+    return None
+
+
+def make_work_dir() -> str:
+    """
+    Create a temporary directory for one video's extracted audio and chunks.
+
+    The caller removes it with remove_work_dir() once the video is done.
+
+    Returns:
+        Path to the new directory
+    """
+    return tempfile.mkdtemp(prefix="subscene-", dir=get_scratch_dir())
+
+
+def remove_work_dir(work_dir: str) -> None:
+    """Delete a work directory and everything in it."""
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Per-user cache directory (translation memory, subtitles, checkpoints, ...)
+CACHE_DIR = Path.home() / ".cache" / "subscene"
+
+
+def make_cache_dir(path: Path) -> None:
+    """Create a directory under CACHE_DIR (and CACHE_DIR itself) readable only by the current user."""
+    for directory in (CACHE_DIR, path):
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+
+# Content-addressed cache of source-language subtitles, so renamed, moved or
+# re-muxed copies of a video reuse an earlier transcription
+SUBTITLE_CACHE_DIR = CACHE_DIR / "subtitles"
+
+# Bytes hashed from each end of a video for the quick fingerprint
+FINGERPRINT_EDGE_BYTES = 1024 * 1024
+
+
+def video_fingerprint(video_path: Path) -> str:
+    """
+    Cheap fingerprint of a video file: BLAKE2b over its size and first/last 1 MiB.
+
+    Reads at most 2 MiB regardless of file size, so it can run before audio
+    extraction. Identical copies match; re-encodes do not (see audio_fingerprint).
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        16-character hex digest
+    """
+    size = os.path.getsize(video_path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=8)
+    with open(video_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_EDGE_BYTES))
+        if size > 2 * FINGERPRINT_EDGE_BYTES:
+            f.seek(-FINGERPRINT_EDGE_BYTES, os.SEEK_END)
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def audio_fingerprint(audio_path: str) -> str:
     """
-    Delete files if they exist.
+    SHA-256 of the extracted audio file (hashlib/OpenSSL over a memory map).
+
+    The decoded PCM is the same for any container or video re-encode of a
+    source, so this still matches when video_fingerprint() does not.
+
+    Args:
+        audio_path: Path to the extracted WAV file
+
+    Returns:
+        16-character hex digest
+    """
+    with open(audio_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()[:16]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return hashlib.sha256(buf).hexdigest()[:16]
+
+
+# Stage output checkpoints, so a rerun after a failure skips finished stages
+CHECKPOINT_DIR = CACHE_DIR / "checkpoints"
+
+
+def checkpoint_key(stage: str, inputs: Any, *settings: str) -> str:
+    """
+    Content key for a stage checkpoint: the stage name, its settings and its input.
+
+    Args:
+        stage: Stage name
+        inputs: JSON-serializable stage input (e.g. source segments)
+        *settings: Anything else that changes the output (translator, model, ...)
+
+    Returns:
+        16-character hex digest
+    """
+    digest = hashlib.sha256("\0".join((stage,) + settings).encode())
+    digest.update(json_dumps(inputs))
+    return digest.hexdigest()[:16]
+
+
+def _checkpoint_path(key: str) -> Path:
+    return CHECKPOINT_DIR / (f"{key}.json.zst" if zstandard is not None else f"{key}.json.gz")
+
+
+def save_checkpoint(key: str, data: Any) -> None:
+    """
+    Write a compressed JSON checkpoint (zstd if installed, gzip otherwise). Best effort.
+
+    Args:
+        key: Key from checkpoint_key()
+        data: JSON-serializable stage output
+    """
+    import gzip
+
+    raw = json_dumps(data)
+    try:
+        make_cache_dir(CHECKPOINT_DIR)
+        if zstandard is not None:
+            payload = zstandard.ZstdCompressor().compress(raw)
+        else:
+            payload = gzip.compress(raw, compresslevel=6)
+        write_bytes_atomic(_checkpoint_path(key), payload)
+    except OSError as e:
+        logger.warning(f"Could not write checkpoint: {e}")
+
+
+def load_checkpoint(key: str) -> Optional[Any]:
+    """
+    Load a checkpoint written by save_checkpoint().
+
+    Args:
+        key: Key from checkpoint_key()
+
+    Returns:
+        The stored data, or None if there is no usable checkpoint
+    """
+    import gzip
+
+    path = _checkpoint_path(key)
+    try:
+        payload = path.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        if zstandard is not None:
+            raw = zstandard.ZstdDecompressor().decompress(payload)
+        else:
+            raw = gzip.decompress(payload)
+        return json_loads(raw)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path.name}: {e}")
+        return None
+
+
+# Recently extracted WAVs, so a rerun (e.g. after a failed transcription)
+# skips decoding the video again; bounded, a 2h film is ~230 MB of PCM.
+# Entries are hard links, so the cache only fills when the work dir is on
+# the same filesystem (never from RAM-backed /dev/shm)
+AUDIO_CACHE_DIR = CACHE_DIR / "audio"
+AUDIO_CACHE_MAX_ENTRIES = 3
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst (free on the same filesystem), copying otherwise."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def restore_cached_audio(key: str, output_path: str) -> bool:
+    """
+    Put the cached WAV for key at output_path, if there is one.
 
     Args:
-        *file_paths: Variable number of file paths to delete
+        key: Source fingerprint (see video_fingerprint)
+        output_path: Where the caller expects the extracted WAV
+
+    Returns:
+        True if output_path now holds the cached audio
     """
-    for file_path in file_paths:
+    cached = AUDIO_CACHE_DIR / f"{key}.wav"
+    if not cached.exists():
+        return False
+    try:
+        if Path(output_path).exists():
+            os.unlink(output_path)
+        _link_or_copy(cached, Path(output_path))
+        os.utime(cached)  # Mark as recently used
+        return True
+    except OSError:
+        return False
+
+
+def store_cached_audio(key: str, audio_path: str) -> None:
+    """
+    Keep an extracted WAV in AUDIO_CACHE_DIR, evicting the least recently used. Best effort.
+
+    Only hard-links the file: extraction is on the foreground path, and copying
+    a whole WAV across filesystems costs more than most cache hits save.
+
+    Args:
+        key: Source fingerprint (see video_fingerprint)
+        audio_path: The extracted WAV
+    """
+    try:
+        make_cache_dir(AUDIO_CACHE_DIR)
+        tmp_path = AUDIO_CACHE_DIR / f"{key}.wav.tmp"
+        tmp_path.unlink(missing_ok=True)
         try:
-            path = Path(file_path)
-            if path.exists():
-                path.unlink()
-                logger.debug(f"Deleted: {file_path}")
-        except Exception as e:
-            logger.warning(f"Failed to delete {file_path}: {e}")
+            os.link(audio_path, tmp_path)
+        except OSError:
+            logger.debug("Audio cache is on another filesystem than the work dir; not caching")
+            return
+        os.replace(tmp_path, AUDIO_CACHE_DIR / f"{key}.wav")
+
+        entries = sorted(AUDIO_CACHE_DIR.glob("*.wav"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[AUDIO_CACHE_MAX_ENTRIES:]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not write audio cache: {e}")
 
 
 def get_metadata_path(video_path: Path) -> Path:
@@ -282,8 +563,8 @@ def load_metadata(video_path: Path) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(metadata_path, 'rb') as f:
+            return json_loads(f.read())
     except (json.JSONDecodeError, IOError) as e:
         logger.warning(f"Failed to load metadata for {video_path.name}: {e}")
         return None
@@ -299,9 +580,9 @@ def save_metadata(video_path: Path, metadata: Dict[str, Any]) -> None:
     """
     metadata_path = get_metadata_path(video_path)
     try:
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-    except IOError as e:
+        # Atomic replace so an interrupted run never leaves a half-written sidecar
+        write_bytes_atomic(metadata_path, json_dumps(metadata))
+    except (IOError, TypeError) as e:
         logger.warning(f"Failed to save metadata for {video_path.name}: {e}")
 
 